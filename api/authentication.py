@@ -0,0 +1,129 @@
+"""Authentication chains chosen per route and cached Basic authentication.
+
+``RouteAuthentication`` runs the authentication classes of the first
+``AUTHENTICATION_CHAINS`` entry whose URL name patterns match the view, so
+API routes can skip session authentication and the session lookup it costs
+while other routes keep it. Views setting ``authentication_classes``
+themselves are unaffected.
+
+``CachedBasicAuthentication`` verifies Basic credentials with the password
+hasher once and then remembers the verification for
+``BASIC_AUTH_CACHE_TIMEOUT`` seconds, so machine clients sending their
+credentials with every request don't pay a PBKDF2 verification each time.
+"""
+
+from fnmatch import fnmatchcase
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import Resolver404, resolve
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, BasicAuthentication
+
+# Authentication classes by view name, filled on first use.
+_chains = {}
+
+
+@receiver(setting_changed)
+def _reset_chains(setting, **kwargs):
+    if setting == "AUTHENTICATION_CHAINS":
+        _chains.clear()
+
+
+def _view_name(request):
+    match = request.resolver_match
+    if match is None:
+        # Authenticated from a middleware, before URL resolution.
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return ""
+    return match.view_name
+
+
+def chain(view_name):
+    """Return the authentication classes of a view name."""
+    classes = _chains.get(view_name)
+    if classes is None:
+        classes = next(
+            (
+                [import_string(path) for path in options["classes"]]
+                for options in settings.AUTHENTICATION_CHAINS.values()
+                if any(fnmatchcase(view_name, route) for route in options["routes"])
+            ),
+            [],
+        )
+        _chains[view_name] = classes
+    return classes
+
+
+class RouteAuthentication(BaseAuthentication):
+    """Authenticate with the chain configured for the requested route."""
+
+    def authenticators(self, request):
+        return [authentication() for authentication in chain(_view_name(request))]
+
+    def authenticate(self, request):
+        for authenticator in self.authenticators(request):
+            user_auth_tuple = authenticator.authenticate(request)
+            if user_auth_tuple is not None:
+                return user_auth_tuple
+        return None
+
+    def authenticate_header(self, request):
+        authenticators = self.authenticators(request)
+        if authenticators:
+            return authenticators[0].authenticate_header(request)
+        return None
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """HTTP Basic authentication remembering verified credentials.
+
+    Entries are keyed by an HMAC of the credentials under ``SECRET_KEY``, so
+    the cache holds neither passwords nor their hashes. They store an HMAC
+    of the user's password hash too and are ignored once it changes, which
+    makes a password change take effect at once. Failed attempts are never
+    cached.
+    """
+
+    key_salt = "api.authentication.CachedBasicAuthentication"
+
+    def _digest(self, *values):
+        return salted_hmac(self.key_salt, "\0".join(values)).hexdigest()
+
+    def cache_key(self, userid, password):
+        return f"basic-auth:{self._digest(userid, password)}"
+
+    def cached_user(self, key):
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        user_pk, fingerprint = entry
+        user = get_user_model()._default_manager.filter(pk=user_pk).first()
+        if user is None or not constant_time_compare(
+            fingerprint,
+            self._digest(user.password),
+        ):
+            cache.delete(key)
+            return None
+        return user
+
+    def authenticate_credentials(self, userid, password, request=None):
+        timeout = settings.BASIC_AUTH_CACHE_TIMEOUT
+        if not timeout:
+            return super().authenticate_credentials(userid, password, request)
+        key = self.cache_key(userid, password)
+        user = self.cached_user(key)
+        if user is None:
+            user = super().authenticate_credentials(userid, password, request)[0]
+            cache.set(key, (user.pk, self._digest(user.password)), timeout)
+        elif not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return user, None
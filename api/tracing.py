@@ -0,0 +1,68 @@
+from django.db.models import prefetch_related_objects
+
+from it_specialist import tracing
+
+
+class TracedViewMixin:
+    """Record the phases of a generic view as spans of the active trace.
+
+    Authentication, filtering, queryset evaluation, prefetching and
+    serialization each get their own span. Prefetching normally runs inside
+    queryset evaluation, so while tracing it is split off and run on the
+    fetched objects.
+    """
+
+    _deferred_prefetch = None
+
+    def perform_authentication(self, request):
+        with tracing.span("auth"):
+            super().perform_authentication(request)
+
+    def filter_queryset(self, queryset):
+        with tracing.span("filter"):
+            return super().filter_queryset(queryset)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self._deferred_prefetch is not None:
+            self._deferred_prefetch = queryset._prefetch_related_lookups
+            queryset = queryset.prefetch_related(None)
+        return queryset
+
+    def _prefetch(self, objects):
+        lookups, self._deferred_prefetch = self._deferred_prefetch, None
+        if lookups and objects:
+            with tracing.span("prefetch"):
+                prefetch_related_objects(objects, *lookups)
+
+    def paginate_queryset(self, queryset):
+        if not tracing.active():
+            return super().paginate_queryset(queryset)
+        lookups = queryset._prefetch_related_lookups
+        with tracing.span("queryset"):
+            page = super().paginate_queryset(queryset.prefetch_related(None))
+        if page is not None:
+            self._deferred_prefetch = lookups
+            self._prefetch(page)
+        return page
+
+    def get_object(self):
+        if not tracing.active():
+            return super().get_object()
+        self._deferred_prefetch = ()
+        with tracing.span("queryset"):
+            obj = super().get_object()
+        self._prefetch([obj])
+        return obj
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if tracing.active():
+            to_representation = serializer.to_representation
+
+            def traced(instance):
+                with tracing.span("serializer"):
+                    return to_representation(instance)
+
+            serializer.to_representation = traced
+        return serializer
@@ -1,23 +1,38 @@
 from .base import (
     EmploymentTypeSerializer,
     SpecialistLevelSerializer,
+    TechnologyCatalogSerializer,
     TechnologySerializer,
 )
 from .contacts import ContactInfoSerializer, SocialNetworkSerializer
-from .profiles import ProfileDetailSerializer, ProfileListSerializer
+from .profiles import (
+    ProfileDetailSerializer,
+    ProfileListSerializer,
+    SimilarProfileSerializer,
+)
 from .projects import ProjectDetailSerializer, ProjectListSerializer
-from .reviews import ReviewDetailSerializer, ReviewListSerializer
+from .public import PublicContactInfoSerializer, PublicProfileDetailSerializer
+from .reviews import (
+    ReviewDetailSerializer,
+    ReviewImportSerializer,
+    ReviewListSerializer,
+)
 
 __all__ = [
     "TechnologySerializer",
+    "TechnologyCatalogSerializer",
     "EmploymentTypeSerializer",
     "SpecialistLevelSerializer",
     "SocialNetworkSerializer",
     "ContactInfoSerializer",
     "ReviewListSerializer",
     "ReviewDetailSerializer",
+    "ReviewImportSerializer",
     "ProjectListSerializer",
     "ProjectDetailSerializer",
     "ProfileListSerializer",
     "ProfileDetailSerializer",
+    "SimilarProfileSerializer",
+    "PublicContactInfoSerializer",
+    "PublicProfileDetailSerializer",
 ]
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from apps.profiles import catalog, reviews
 from apps.profiles.models import EmploymentType, SpecialistLevel, Technology
 
 
@@ -9,6 +10,17 @@ class TechnologySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "code"]
 
 
+class TechnologyCatalogSerializer(serializers.ModelSerializer):
+    """Технология со счётчиками профилей и проектов для каталога."""
+
+    profiles = serializers.IntegerField(source="profile_count", read_only=True)
+    projects = serializers.IntegerField(source="project_count", read_only=True)
+
+    class Meta:
+        model = Technology
+        fields = ["id", "name", "code", "profiles", "projects"]
+
+
 class EmploymentTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = EmploymentType
@@ -19,3 +31,58 @@ class SpecialistLevelSerializer(serializers.ModelSerializer):
     class Meta:
         model = SpecialistLevel
         fields = ["id", "name", "code"]
+
+
+class CatalogCodeField(serializers.Field):
+    """Принимает код справочника (или список кодов), отдаёт вложенный объект.
+
+    Коды разрешаются через кэш справочников одним обращением к кэшу или к базе.
+    """
+
+    default_error_messages = {
+        "unknown": "Неизвестные коды: {codes}.",
+        "not_a_list": "Ожидается список кодов.",
+        "not_a_code": "Ожидается код.",
+    }
+
+    def __init__(self, model, serializer_class, many=False, **kwargs):
+        self.model = model
+        self.serializer_class = serializer_class
+        self.many = many
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if self.many:
+            return self.serializer_class(value.all(), many=True).data
+        return self.serializer_class(value).data
+
+    def to_internal_value(self, data):
+        if self.many:
+            if not isinstance(data, list) or not all(
+                isinstance(code, str) for code in data
+            ):
+                self.fail("not_a_list")
+            codes = list(dict.fromkeys(data))
+        elif isinstance(data, str):
+            codes = [data]
+        else:
+            self.fail("not_a_code")
+
+        instances, unknown = catalog.resolve(self.model, codes)
+        if unknown:
+            self.fail("unknown", codes=", ".join(unknown))
+        return instances if self.many else instances[0]
+
+
+class RatingHistogramField(serializers.Field):
+    """Отдаёт число отзывов профиля по каждой оценке без обращения к отзывам."""
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return {
+            str(rating): count for rating, count in reviews.histogram(value).items()
+        }
@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
-from apps.profiles.models import Profile
+from apps.profiles.models import EmploymentType, Profile, SpecialistLevel, Technology
 
 from .base import (
+    CatalogCodeField,
     EmploymentTypeSerializer,
+    RatingHistogramField,
     SpecialistLevelSerializer,
     TechnologySerializer,
 )
@@ -13,11 +15,15 @@ from .reviews import ReviewDetailSerializer
 
 
 class ProfileListSerializer(serializers.ModelSerializer):
-    """Сериализатор для списка профилей с основной информацией."""
+    """Сериализатор для списка профилей с основной информацией.
 
-    technologies = TechnologySerializer(many=True)
-    employment = EmploymentTypeSerializer()
-    level = SpecialistLevelSerializer()
+    Технологии, тип занятости и уровень записываются кодами.
+    """
+
+    technologies = CatalogCodeField(Technology, TechnologySerializer, many=True)
+    employment = CatalogCodeField(EmploymentType, EmploymentTypeSerializer)
+    level = CatalogCodeField(SpecialistLevel, SpecialistLevelSerializer)
+    rating_histogram = RatingHistogramField()
 
     class Meta:
         model = Profile
@@ -32,21 +38,36 @@ class ProfileListSerializer(serializers.ModelSerializer):
             "level",
             "experience",
             "rating",
+            "rating_histogram",
             "review_count",
             "project_count",
         ]
+        read_only_fields = ["rating", "review_count", "project_count"]
+
+
+class SimilarProfileSerializer(ProfileListSerializer):
+    """Сериализатор для похожих профилей с оценкой сходства."""
+
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta(ProfileListSerializer.Meta):
+        fields = [*ProfileListSerializer.Meta.fields, "similarity"]
 
 
 class ProfileDetailSerializer(serializers.ModelSerializer):
-    """Сериализатор для детальной информации о профиле."""
+    """Сериализатор для детальной информации о профиле.
+
+    Технологии, тип занятости и уровень записываются кодами.
+    """
 
-    technologies = TechnologySerializer(many=True)
-    employment = EmploymentTypeSerializer()
-    level = SpecialistLevelSerializer()
-    social_networks = SocialNetworkSerializer(many=True)
-    contacts = ContactInfoSerializer(many=True)
-    projects = ProjectDetailSerializer(many=True)
-    reviews = ReviewDetailSerializer(many=True)
+    technologies = CatalogCodeField(Technology, TechnologySerializer, many=True)
+    employment = CatalogCodeField(EmploymentType, EmploymentTypeSerializer)
+    level = CatalogCodeField(SpecialistLevel, SpecialistLevelSerializer)
+    rating_histogram = RatingHistogramField()
+    social_networks = SocialNetworkSerializer(many=True, read_only=True)
+    contacts = ContactInfoSerializer(many=True, read_only=True)
+    projects = ProjectDetailSerializer(many=True, read_only=True)
+    reviews = ReviewDetailSerializer(many=True, read_only=True)
 
     class Meta:
         model = Profile
@@ -61,6 +82,7 @@ class ProfileDetailSerializer(serializers.ModelSerializer):
             "experience",
             "level",
             "rating",
+            "rating_histogram",
             "review_count",
             "project_count",
             "social_networks",
@@ -70,3 +92,4 @@ class ProfileDetailSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        read_only_fields = ["rating", "review_count", "project_count"]
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from apps.profiles.models import ContactInfo
+
+from .profiles import ProfileDetailSerializer
+
+
+class PublicContactInfoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ContactInfo
+        fields = ["id", "contact_type", "value", "is_primary", "label"]
+
+
+class PublicProfileDetailSerializer(ProfileDetailSerializer):
+    """Публичная проекция профиля только с публичными контактами.
+
+    Контакты берутся из ``public_contacts``, заранее отфильтрованных запросом.
+    """
+
+    contacts = PublicContactInfoSerializer(
+        source="public_contacts",
+        many=True,
+        read_only=True,
+    )
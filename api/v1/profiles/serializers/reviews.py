@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from apps.profiles.models import Review
+from apps.profiles import reviews
+from apps.profiles.models import Profile, Project, Review
 
 
 class ReviewListSerializer(serializers.ModelSerializer):
@@ -22,3 +23,63 @@ class ReviewDetailSerializer(serializers.ModelSerializer):
             "is_verified",
             "created_at",
         ]
+
+
+class ReviewImportListSerializer(serializers.ListSerializer):
+    """Проверяет ссылки всего пакета отзывов двумя запросами и сохраняет его."""
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        profile_ids = {item["profile_id"] for item in attrs}
+        existing = set(
+            Profile.objects.filter(pk__in=profile_ids).values_list("pk", flat=True),
+        )
+        project_owners = dict(
+            Project.objects.filter(
+                pk__in={item["project_id"] for item in attrs if item.get("project_id")},
+            ).values_list("pk", "profile_id"),
+        )
+        errors = []
+        for item in attrs:
+            error = {}
+            if item["profile_id"] not in existing:
+                error["profile"] = ["Профиль не найден."]
+            project_id = item.get("project_id")
+            if project_id and project_owners.get(project_id) != item["profile_id"]:
+                error["project"] = ["Проект не найден у этого профиля."]
+            errors.append(error)
+        if any(errors):
+            # Raised from here rather than validate() to keep errors per row.
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        instances = [Review(**item) for item in validated_data]
+        reviews.ingest(instances)
+        return instances
+
+
+class ReviewImportSerializer(serializers.ModelSerializer):
+    """Сериализатор для массовой загрузки отзывов."""
+
+    profile = serializers.IntegerField(source="profile_id")
+    project = serializers.IntegerField(
+        source="project_id",
+        required=False,
+        allow_null=True,
+    )
+
+    class Meta:
+        model = Review
+        list_serializer_class = ReviewImportListSerializer
+        fields = [
+            "profile",
+            "project",
+            "rating",
+            "text",
+            "reviewer_name",
+            "reviewer_position",
+            "reviewer_company",
+            "is_verified",
+            "verified_at",
+        ]
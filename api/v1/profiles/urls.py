@@ -1,10 +1,43 @@
 from django.urls import path
 
-from .views import ProfileDetailView, ProfileListView
+from .views import (
+    LeaderboardView,
+    ProfileBatchView,
+    ProfileChangesView,
+    ProfileDeletionView,
+    ProfileDetailView,
+    ProfileListView,
+    ProfileSimilarView,
+    PublicProfileDetailView,
+    PublicProfileListView,
+    ReviewImportView,
+    TechnologyListView,
+)
 
 app_name = "profiles"
 
 urlpatterns = [
     path("", ProfileListView.as_view(), name="profile-list"),
     path("<int:pk>/", ProfileDetailView.as_view(), name="profile-detail"),
+    path("batch/", ProfileBatchView.as_view(), name="profile-batch"),
+    path("changes/", ProfileChangesView.as_view(), name="profile-changes"),
+    path("public/", PublicProfileListView.as_view(), name="public-profile-list"),
+    path(
+        "public/<int:pk>/",
+        PublicProfileDetailView.as_view(),
+        name="public-profile-detail",
+    ),
+    path(
+        "<int:pk>/deletion/",
+        ProfileDeletionView.as_view(),
+        name="profile-deletion",
+    ),
+    path("<int:pk>/similar/", ProfileSimilarView.as_view(), name="profile-similar"),
+    path(
+        "leaderboards/<str:kind>/<str:code>/",
+        LeaderboardView.as_view(),
+        name="profile-leaderboard",
+    ),
+    path("technologies/", TechnologyListView.as_view(), name="technology-list"),
+    path("reviews/import/", ReviewImportView.as_view(), name="review-import"),
 ]
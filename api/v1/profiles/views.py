@@ -1,10 +1,80 @@
+import math
+
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.http import Http404
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_datetime
 from django_filters import rest_framework as filters
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from api.tracing import TracedViewMixin
+from apps.profiles import (
+    autocomplete,
+    changes,
+    deletion,
+    edge,
+    experience,
+    leaderboards,
+    list_cache,
+    similarity,
+    technology_sets,
+)
+from apps.profiles.models import (
+    ContactInfo,
+    EmploymentType,
+    Profile,
+    SpecialistLevel,
+    Technology,
+)
+
+from .serializers import (
+    ProfileDetailSerializer,
+    ProfileListSerializer,
+    PublicProfileDetailSerializer,
+    ReviewImportSerializer,
+    SimilarProfileSerializer,
+    TechnologyCatalogSerializer,
+)
+
 
-from apps.profiles.models import EmploymentType, Profile, SpecialistLevel, Technology
+class ProfileFilterForm(forms.Form):
+    def clean(self):
+        cleaned_data = super().clean()
+        if self.has_error("experience_technology") or self.has_error(
+            "min_experience_years",
+        ):
+            return cleaned_data
+        technology = cleaned_data.get("experience_technology")
+        years = cleaned_data.get("min_experience_years")
+        if technology is None and years is not None:
+            self.add_error(
+                "experience_technology",
+                "Required with min_experience_years.",
+            )
+        elif (
+            technology is not None and years is None and not self.orders_by_experience()
+        ):
+            # The technology alone only picks the experience to order by.
+            self.add_error(
+                "min_experience_years",
+                "Required with experience_technology unless ordering by "
+                "experience_days.",
+            )
+        return cleaned_data
 
-from .serializers import ProfileDetailSerializer, ProfileListSerializer
+    def orders_by_experience(self):
+        ordering = self.data.get(api_settings.ORDERING_PARAM) or ""
+        return "experience_days" in {
+            field.strip().lstrip("-") for field in ordering.split(",")
+        }
 
 
 class ProfileFilter(filters.FilterSet):
@@ -12,26 +82,85 @@ class ProfileFilter(filters.FilterSet):
         field_name="technologies__code",
         to_field_name="code",
         queryset=Technology.objects.all(),
+        method="filter_technology",
+    )
+    technology_mode = filters.ChoiceFilter(
+        choices=technology_sets.MODES,
+        method="filter_technology_mode",
     )
     employment = filters.ModelChoiceFilter(
-        field_name="employment__code",
+        field_name="employment",
         to_field_name="code",
         queryset=EmploymentType.objects.all(),
     )
     level = filters.ModelChoiceFilter(
-        field_name="level__code",
+        field_name="level",
         to_field_name="code",
         queryset=SpecialistLevel.objects.all(),
     )
     min_rating = filters.NumberFilter(field_name="rating", lookup_expr="gte")
     min_experience = filters.NumberFilter(field_name="experience", lookup_expr="gte")
+    experience_technology = filters.ModelChoiceFilter(
+        to_field_name="code",
+        queryset=Technology.objects.all(),
+        method="filter_experience_technology",
+    )
+    min_experience_years = filters.NumberFilter(
+        min_value=0,
+        method="filter_min_experience_years",
+    )
 
     class Meta:
         model = Profile
-        fields = ["technology", "employment", "level", "min_rating", "min_experience"]
+        form = ProfileFilterForm
+        fields = [
+            "technology",
+            "technology_mode",
+            "employment",
+            "level",
+            "min_rating",
+            "min_experience",
+            "experience_technology",
+            "min_experience_years",
+        ]
+
+    def filter_queryset(self, queryset):
+        # Ordering by experience needs the annotation, filtered or not.
+        technology = self.form.cleaned_data.get("experience_technology")
+        queryset = experience.annotate_days(
+            queryset,
+            technology.pk if technology else None,
+        )
+        return super().filter_queryset(queryset)
+
+    def filter_technology(self, queryset, name, value):
+        return technology_sets.filter_profiles(
+            queryset,
+            [technology.pk for technology in value],
+            self.form.cleaned_data.get("technology_mode") or technology_sets.ANY,
+        )
+
+    def filter_technology_mode(self, queryset, name, value):
+        # Applied by filter_technology.
+        return queryset
+
+    def filter_experience_technology(self, queryset, name, value):
+        years = self.form.cleaned_data.get("min_experience_years")
+        if years is None:
+            # Only selects the experience ordered by, see ProfileFilterForm.
+            return queryset
+        return experience.filter_profiles(
+            queryset,
+            value.pk,
+            math.ceil(years * experience.DAYS_PER_YEAR),
+        )
+
+    def filter_min_experience_years(self, queryset, name, value):
+        # Applied by filter_experience_technology.
+        return queryset
 
 
-class ProfileListView(generics.ListCreateAPIView):
+class ProfileListView(TracedViewMixin, generics.ListCreateAPIView):
     """
     List and create profiles
     """
@@ -42,11 +171,47 @@ class ProfileListView(generics.ListCreateAPIView):
     serializer_class = ProfileListSerializer
     permission_classes = [IsAuthenticated]
     filterset_class = ProfileFilter
-    ordering_fields = ["rating", "review_count", "project_count", "created_at"]
+    ordering_fields = [
+        "rating",
+        "review_count",
+        "project_count",
+        "experience_days",
+        "created_at",
+    ]
     search_fields = ["first_name", "last_name", "position"]
 
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
 
-class ProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
+    def list(self, request, *args, **kwargs):
+        # Results don't depend on the user, so one entry serves every client.
+        entry = list_cache.responses.get_or_compute(
+            list_cache.cache_key(request),
+            lambda: self.compute_list(request, *args, **kwargs),
+            timeout=settings.PROFILE_LIST_CACHE_TIMEOUT,
+            is_valid=list_cache.is_current,
+        )
+        return Response(entry["data"])
+
+    def compute_list(self, request, *args, **kwargs):
+        """Return the list response data with the tag versions it depends on."""
+        filterset = filters.DjangoFilterBackend().get_filterset(
+            request,
+            self.get_queryset(),
+            self,
+        )
+        # Versions are read before querying so that changes made meanwhile
+        # leave the stored entry stale.
+        tag_versions = {}
+        if filterset.is_valid():
+            tag_versions = list_cache.versions(list_cache.filter_tags(filterset))
+        data = super().list(request, *args, **kwargs).data
+        results = data.get("results", data)
+        tag_versions.update(list_cache.versions(list_cache.content_tags(results)))
+        return {"data": data, "versions": tag_versions}
+
+
+class ProfileDetailView(TracedViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a profile
     """
@@ -62,3 +227,342 @@ class ProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
     )
     serializer_class = ProfileDetailSerializer
     permission_classes = [IsAuthenticated]
+
+    def destroy(self, request, *args, **kwargs):
+        # The profile disappears now, its rows are deleted by a background job.
+        profile = self.get_object()
+        deletion.delete_profiles([profile.pk])
+        return Response(
+            deletion.progress(profile.pk),
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ProfileDeletionView(generics.GenericAPIView):
+    """
+    Report the progress of a profile deletion
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        progress = deletion.progress(pk)
+        if progress is None:
+            raise Http404
+        return Response(progress)
+
+
+class ProfileBatchView(generics.GenericAPIView):
+    """
+    Retrieve several profiles by id in one request, in the requested order
+    """
+
+    queryset = ProfileDetailView.queryset
+    serializer_class = ProfileDetailSerializer
+    permission_classes = [IsAuthenticated]
+    max_batch_size = 50
+
+    def get_ids(self):
+        """Return the unique ids of the ``ids`` parameter in request order."""
+        values = [
+            value.strip()
+            for value in self.request.query_params.get("ids", "").split(",")
+            if value.strip()
+        ]
+        if not values:
+            raise ValidationError({"ids": "Pass a comma separated list of ids."})
+        try:
+            ids = list(dict.fromkeys(int(value) for value in values))
+        except ValueError:
+            raise ValidationError({"ids": "Ids must be integers."}) from None
+        if len(ids) > self.max_batch_size:
+            raise ValidationError(
+                {"ids": f"Pass at most {self.max_batch_size} ids."},
+            )
+        return ids
+
+    def get(self, request):
+        ids = self.get_ids()
+        # One query per prefetched relation whatever the number of profiles.
+        profiles = {
+            profile.pk: profile for profile in self.get_queryset().filter(pk__in=ids)
+        }
+        serializer = self.get_serializer(
+            [profiles[pk] for pk in ids if pk in profiles],
+            many=True,
+        )
+        return Response(
+            {
+                "results": serializer.data,
+                "missing": [pk for pk in ids if pk not in profiles],
+            },
+        )
+
+
+class LimitMixin:
+    """
+    Read the ``limit`` query parameter, clamped between 1 and ``max_limit``
+    """
+
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+
+class ProfileChangesView(LimitMixin, generics.GenericAPIView):
+    """
+    List profile changes and deletions after ``updated_since`` or a token
+    """
+
+    queryset = ProfileListView.queryset
+    serializer_class = ProfileListSerializer
+    permission_classes = [IsAuthenticated]
+    default_limit = 100
+    max_limit = 1000
+
+    def get_position(self):
+        """Return the feed position to continue from."""
+        params = self.request.query_params
+        if "token" in params:
+            try:
+                return changes.decode_token(params["token"])
+            except changes.InvalidToken:
+                raise ValidationError({"token": "Invalid token."}) from None
+        since = params.get("updated_since")
+        if not since:
+            return changes.start()
+        moment = parse_datetime(since)
+        if moment is None:
+            raise ValidationError(
+                {"updated_since": "Pass an ISO 8601 date and time."},
+            )
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return changes.start(moment)
+
+    def get(self, request):
+        limit = self.get_limit()
+        page, position = changes.page(self.get_position(), limit, self.get_queryset())
+        profiles = [profile for _, _, _, profile in page if profile is not None]
+        data = dict(
+            zip(
+                (profile.pk for profile in profiles),
+                self.get_serializer(profiles, many=True).data,
+            ),
+        )
+        return Response(
+            {
+                "results": [
+                    {
+                        "id": pk,
+                        "change": kind,
+                        "changed_at": changed_at,
+                        "profile": data[pk] if kind == changes.CHANGED else None,
+                    }
+                    for kind, changed_at, pk, profile in page
+                ],
+                "token": changes.encode_token(position),
+                "has_more": len(page) == limit,
+            },
+        )
+
+
+class PublicCacheMixin:
+    """
+    Serve anonymous requests with headers letting shared caches store them
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    # Whether responses are pages of profiles rather than a single profile.
+    listing = False
+
+    def surrogate_keys(self, data):
+        if self.listing:
+            return edge.page_keys(data.get("results", data), listing=True)
+        return edge.page_keys([data])
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.PUBLIC_CACHE_MAX_AGE,
+                s_maxage=settings.PUBLIC_CACHE_S_MAXAGE,
+            )
+            response["Surrogate-Key"] = " ".join(
+                sorted(self.surrogate_keys(response.data)),
+            )
+        return response
+
+
+class PublicProfileListView(
+    TracedViewMixin,
+    PublicCacheMixin,
+    generics.ListAPIView,
+):
+    """
+    List profiles for anonymous visitors
+    """
+
+    queryset = ProfileListView.queryset
+    serializer_class = ProfileListSerializer
+    filterset_class = ProfileFilter
+    ordering_fields = ProfileListView.ordering_fields
+    search_fields = ProfileListView.search_fields
+    listing = True
+
+
+class PublicProfileDetailView(
+    TracedViewMixin,
+    PublicCacheMixin,
+    generics.RetrieveAPIView,
+):
+    """
+    Retrieve a profile with its public contacts for anonymous visitors
+    """
+
+    queryset = Profile.objects.select_related("employment", "level").prefetch_related(
+        "technologies",
+        "social_networks",
+        Prefetch(
+            "contacts",
+            queryset=ContactInfo.objects.filter(is_public=True),
+            to_attr="public_contacts",
+        ),
+        "projects",
+        "projects__technologies",
+        "projects__reviews",
+        "reviews",
+    )
+    serializer_class = PublicProfileDetailSerializer
+
+
+class ProfileSimilarView(LimitMixin, generics.GenericAPIView):
+    """
+    List specialists with the most similar technology sets
+    """
+
+    queryset = Profile.objects.select_related("employment", "level").prefetch_related(
+        "technologies",
+    )
+    serializer_class = SimilarProfileSerializer
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request, pk):
+        scores = similarity.similar_profiles(pk, limit=self.get_limit())
+        if not scores and not Profile.objects.filter(pk=pk).exists():
+            raise Http404
+
+        profiles = self.get_queryset().in_bulk([profile_id for profile_id, _ in scores])
+        results = []
+        for profile_id, score in scores:
+            profile = profiles.get(profile_id)
+            if profile is not None:
+                profile.similarity = round(score, 3)
+                results.append(profile)
+        serializer = self.get_serializer(results, many=True)
+        return Response(serializer.data)
+
+
+class LeaderboardView(LimitMixin, generics.GenericAPIView):
+    """
+    List the top profiles of a technology, level or employment type
+    """
+
+    queryset = Profile.objects.select_related("employment", "level").prefetch_related(
+        "technologies",
+    )
+    serializer_class = ProfileListSerializer
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = leaderboards.MAX_LIMIT
+
+    def get_cards(self, profile_ids):
+        """Return serialized profiles, filling missing cards from the database."""
+        keys = {
+            profile_id: leaderboards.card_key(profile_id) for profile_id in profile_ids
+        }
+        cached = cache.get_many(keys.values())
+        cards = {
+            profile_id: cached[key] for profile_id, key in keys.items() if key in cached
+        }
+        missing = [profile_id for profile_id in profile_ids if profile_id not in cards]
+        if missing:
+            profiles = self.get_queryset().filter(pk__in=missing)
+            fresh = {
+                card["id"]: card
+                for card in self.get_serializer(profiles, many=True).data
+            }
+            cache.set_many(
+                {keys[profile_id]: card for profile_id, card in fresh.items()},
+                leaderboards.CARD_TIMEOUT,
+            )
+            cards.update(fresh)
+        return [cards[profile_id] for profile_id in profile_ids if profile_id in cards]
+
+    def get(self, request, kind, code):
+        if kind not in leaderboards.BOARD_LOOKUPS:
+            raise Http404
+        profile_ids = leaderboards.top(kind, code, self.get_limit())
+        if profile_ids is None:
+            raise Http404
+        return Response(
+            {"kind": kind, "code": code, "results": self.get_cards(profile_ids)},
+        )
+
+
+class ReviewImportView(generics.CreateAPIView):
+    """
+    Import a batch of reviews, updating profile ratings once per profile
+    """
+
+    serializer_class = ReviewImportSerializer
+    permission_classes = [IsAdminUser]
+    max_batch_size = 1000
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=self.max_batch_size,
+        )
+        serializer.is_valid(raise_exception=True)
+        created = serializer.save()
+        return Response(
+            {
+                "created": len(created),
+                "profiles": len({review.profile_id for review in created}),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class TechnologyListView(LimitMixin, generics.ListAPIView):
+    """
+    List active technologies, or autocomplete them with ``?prefix=``
+    """
+
+    queryset = Technology.objects.filter(is_active=True)
+    serializer_class = TechnologyCatalogSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = []
+    default_limit = 10
+    max_limit = 50
+
+    def list(self, request, *args, **kwargs):
+        prefix = request.query_params.get("prefix")
+        if prefix is None:
+            return super().list(request, *args, **kwargs)
+        # Answered from the in-process index, without a database query.
+        return Response(autocomplete.suggest(prefix, self.get_limit()))
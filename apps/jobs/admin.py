@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "task",
+        "queue",
+        "status",
+        "attempts",
+        "run_at",
+        "started_at",
+        "finished_at",
+    )
+    list_filter = ("status", "queue")
+    search_fields = ("task", "dedup_key")
+    readonly_fields = ("created_at", "started_at", "finished_at", "worker")
@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.metrics import queue_stats
+
+COLUMNS = (
+    "queued",
+    "due",
+    "running",
+    "succeeded",
+    "failed",
+    "throughput_per_minute",
+    "wait_avg",
+    "wait_p95",
+    "duration_avg",
+    "duration_p95",
+)
+
+
+class Command(BaseCommand):
+    help = "Show backlog, throughput and latency of every job queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--minutes",
+            type=int,
+            default=15,
+            help="Window of finished jobs to compute throughput and latency on",
+        )
+
+    def handle(self, *args, **options):
+        stats = queue_stats(timedelta(minutes=options["minutes"]))
+        if not stats:
+            self.stdout.write("No jobs")
+            return
+        for queue, values in stats.items():
+            self.stdout.write(self.style.MIGRATE_LABEL(queue))
+            for column in COLUMNS:
+                value = values[column]
+                if isinstance(value, float):
+                    value = f"{value:.3f}"
+                self.stdout.write(
+                    f"  {column:<24} {value if value is not None else '-'}",
+                )
@@ -0,0 +1,92 @@
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.jobs.worker import Worker, worker_name
+
+# Seconds between checks of the worker processes.
+SUPERVISE_INTERVAL = 1.0
+
+
+def _work(queues, index, poll_interval, stop_event):
+    # The parent handles signals and tells the workers to stop.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    Worker(queues, worker_name(index), poll_interval).run(stop_event)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run N worker processes claiming jobs from the database. Workers "
+        "finish their current job on SIGINT or SIGTERM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.JOB_WORKER_PROCESSES,
+            help="Number of worker processes",
+        )
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Queue to consume, may be repeated. Defaults to every queue.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when no job is due",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Run jobs in this process until none is due, then exit",
+        )
+
+    def handle(self, *args, **options):
+        queues = options["queues"] or list(settings.JOB_QUEUES)
+        if options["burst"]:
+            processed = Worker(queues).run(burst=True)
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs"))
+            return
+
+        # Setting the event from a handler could deadlock on its lock.
+        signals = []
+        signal.signal(signal.SIGINT, lambda signum, frame: signals.append(signum))
+        signal.signal(signal.SIGTERM, lambda signum, frame: signals.append(signum))
+        stop_event = multiprocessing.Event()
+        # Forked children must not share the parent's database connections.
+        connections.close_all()
+
+        workers = {}
+        self.stdout.write(
+            f"Starting {options['processes']} workers on {', '.join(queues)}",
+        )
+        while not signals:
+            for index in range(options["processes"]):
+                process = workers.get(index)
+                if process is not None and process.is_alive():
+                    continue
+                if process is not None:
+                    self.stderr.write(
+                        f"Worker {index} exited with {process.exitcode}, restarting",
+                    )
+                workers[index] = multiprocessing.Process(
+                    target=_work,
+                    args=(queues, index, options["poll_interval"], stop_event),
+                    daemon=True,
+                )
+                workers[index].start()
+            time.sleep(SUPERVISE_INTERVAL)
+
+        stop_event.set()
+        for process in workers.values():
+            process.join()
+        self.stdout.write(self.style.SUCCESS("Workers stopped"))
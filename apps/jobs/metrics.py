@@ -0,0 +1,103 @@
+"""Job latency and throughput per queue, computed from the jobs table.
+
+Latencies are aggregated by the database, so a scrape costs the same however
+many jobs finished in the window. Their 95th percentile is the upper bound of
+the ``JOB_LATENCY_BUCKETS`` bucket holding it, capped by the largest value.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, DurationField, F, Max, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Job
+
+PERCENTILE = 0.95
+
+
+def _latency_aggregates(name):
+    aggregates = {f"{name}_avg": Avg(name), f"{name}_max": Max(name)}
+    for index, bound in enumerate(settings.METRICS["JOB_LATENCY_BUCKETS"]):
+        aggregates[f"{name}_le_{index}"] = Count(
+            "pk",
+            filter=Q(**{f"{name}__lte": timedelta(seconds=bound)}),
+        )
+    return aggregates
+
+
+def _percentile(row, name):
+    wanted = row["total"] * PERCENTILE
+    maximum = row[f"{name}_max"].total_seconds()
+    for index, bound in enumerate(settings.METRICS["JOB_LATENCY_BUCKETS"]):
+        if row[f"{name}_le_{index}"] >= wanted:
+            return min(bound, maximum)
+    return maximum
+
+
+def queue_stats(window=timedelta(minutes=15)):
+    """Return statistics of every queue over the last ``window``.
+
+    ``wait`` is the time from a job becoming due to a worker starting it and
+    ``duration`` the time the last attempt ran, both in seconds.
+    """
+    now = timezone.now()
+    stats = defaultdict(
+        lambda: {
+            "queued": 0,
+            "due": 0,
+            "running": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "throughput_per_minute": 0.0,
+            "wait_avg": None,
+            "wait_p95": None,
+            "duration_avg": None,
+            "duration_p95": None,
+        },
+    )
+    for queue, status, total in (
+        Job.objects.filter(status__in=[Job.QUEUED, Job.RUNNING])
+        .values("queue", "status")
+        .annotate(total=Count("pk"))
+        .values_list("queue", "status", "total")
+    ):
+        stats[queue][status] = total
+    for queue, total in (
+        Job.objects.filter(status=Job.QUEUED, run_at__lte=now)
+        .values("queue")
+        .annotate(total=Count("pk"))
+        .values_list("queue", "total")
+    ):
+        stats[queue]["due"] = total
+
+    finished = (
+        Job.objects.filter(finished_at__gte=now - window)
+        .alias(
+            wait=Greatest(
+                F("started_at") - F("run_at"),
+                Value(timedelta(0), output_field=DurationField()),
+            ),
+            duration=F("finished_at") - F("started_at"),
+        )
+        .values("queue")
+        .annotate(
+            total=Count("pk"),
+            succeeded=Count("pk", filter=Q(status=Job.SUCCEEDED)),
+            failed=Count("pk", filter=Q(status=Job.FAILED)),
+            **_latency_aggregates("wait"),
+            **_latency_aggregates("duration"),
+        )
+    )
+    minutes = window.total_seconds() / 60
+    for row in finished:
+        queue = stats[row["queue"]]
+        queue["succeeded"] = row["succeeded"]
+        queue["failed"] = row["failed"]
+        queue["throughput_per_minute"] = row["total"] / minutes
+        for name in ("wait", "duration"):
+            queue[f"{name}_avg"] = row[f"{name}_avg"].total_seconds()
+            queue[f"{name}_p95"] = _percentile(row, name)
+    return dict(sorted(stats.items()))
@@ -0,0 +1,88 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Queue(models.Model):
+    """Model representing a job queue.
+
+    Workers lock the rows of their queues while claiming jobs, which keeps
+    per-queue concurrency limits exact across processes.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+
+    def __str__(self):
+        """Return string representation of the queue."""
+        return self.name
+
+
+class Job(models.Model):
+    """Model representing a unit of deferred work.
+
+    A job calls a registered task with its payload as keyword arguments.
+    Failed jobs are retried with exponential backoff until ``max_attempts``
+    is reached.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    queue = models.CharField(max_length=50, default="default")
+    task = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, blank=True)
+    dedup_key = models.CharField(
+        max_length=200,
+        null=True,
+        blank=True,
+        help_text="Only one queued job may have the same key",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    # Execution
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        """Return string representation of the job."""
+        return f"{self.task} #{self.pk} ({self.status})"
+
+    class Meta:
+        """Meta options for Job model."""
+
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["queue", "run_at"],
+                condition=Q(status="queued"),
+                name="job_queued_run_at_idx",
+            ),
+            models.Index(
+                fields=["queue", "locked_until"],
+                condition=Q(status="running"),
+                name="job_running_idx",
+            ),
+            models.Index(fields=["queue", "finished_at"], name="job_finished_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["queue", "dedup_key"],
+                condition=Q(status="queued"),
+                name="job_queued_dedup_key_unique",
+            ),
+        ]
@@ -0,0 +1,77 @@
+"""Task registry and enqueueing.
+
+Tasks are plain functions registered with the ``task`` decorator in the
+``jobs`` module of an app. Their payload is passed as keyword arguments and
+must be JSON serializable. A job may run more than once, after a failure or
+a worker crash, so tasks have to be idempotent.
+
+Enqueueing writes a row in the caller's transaction, so a job only becomes
+visible to workers if the caller commits.
+"""
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job
+
+registry = {}
+
+
+def task(name=None, *, queue="default", max_attempts=5):
+    """Register a function as a task and give it an ``enqueue`` shortcut."""
+
+    def decorator(func):
+        func.task_name = name or f"{func.__module__}.{func.__name__}"
+        func.queue = queue
+        func.max_attempts = max_attempts
+        func.enqueue = lambda dedup_key=None, delay=None, **payload: enqueue(
+            func.task_name,
+            payload,
+            dedup_key=dedup_key,
+            delay=delay,
+        )
+        registry[func.task_name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(task_name, payload=None, *, queue=None, dedup_key=None, delay=None):
+    """Queue a job for a registered task and return it.
+
+    When a queued job with the same ``dedup_key`` exists in the queue, that
+    job is returned instead of creating another one.
+    """
+    func = registry[task_name]
+    queue = queue or func.queue
+    run_at = timezone.now() + (delay or timedelta())
+    fields = {
+        "queue": queue,
+        "task": task_name,
+        "payload": payload or {},
+        "max_attempts": func.max_attempts,
+        "run_at": run_at,
+    }
+    if dedup_key is None:
+        return Job.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(dedup_key=dedup_key, **fields)
+    except IntegrityError:
+        existing = Job.objects.filter(
+            queue=queue,
+            dedup_key=dedup_key,
+            status=Job.QUEUED,
+        ).first()
+        if existing is None:
+            # The duplicate got claimed meanwhile, queue the work again.
+            return enqueue(
+                task_name,
+                payload,
+                queue=queue,
+                dedup_key=dedup_key,
+                delay=delay,
+            )
+        return existing
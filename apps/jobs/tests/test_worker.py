@@ -0,0 +1,226 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from apps.jobs import metrics
+from apps.jobs.models import Job, Queue
+from apps.jobs.tasks import enqueue, registry, task
+from apps.jobs.worker import Worker, claim, ensure_queues, execute
+
+# Constants for tests
+MAX_ATTEMPTS = 2
+LIMITED_QUEUE = "limited"
+LEASE_SECONDS = 0.3
+
+calls = []
+
+
+@task("tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task("tests.fail", max_attempts=MAX_ATTEMPTS)
+def fail():
+    raise RuntimeError("boom")
+
+
+@task("tests.limited", queue=LIMITED_QUEUE)
+def limited():
+    pass
+
+
+@task("tests.reclaimed")
+def reclaimed():
+    # Another worker claims the job while this run is still going.
+    Job.objects.filter(task="tests.reclaimed").update(worker="other", attempts=2)
+
+
+@task("tests.slow")
+def slow(seconds):
+    time.sleep(seconds)
+    calls.append(Job.objects.get(task="tests.slow").locked_until)
+
+
+@pytest.fixture(autouse=True)
+def _clear_calls():
+    calls.clear()
+
+
+@pytest.fixture
+def _limited_queue(settings):
+    settings.JOB_QUEUES = {"default": None, LIMITED_QUEUE: 1}
+
+
+@pytest.mark.django_db
+class TestEnqueue:
+    def test_task_registered(self):
+        assert registry["tests.record"] is record
+
+    def test_dedup_key(self):
+        first = record.enqueue(value=1, dedup_key="same")
+        second = record.enqueue(value=2, dedup_key="same")
+
+        assert first.pk == second.pk
+        assert Job.objects.count() == 1
+
+    def test_dedup_key_free_once_claimed(self):
+        record.enqueue(value=1, dedup_key="same")
+        claim(["default"], "test")
+
+        record.enqueue(value=2, dedup_key="same")
+
+        assert Job.objects.filter(status=Job.QUEUED).count() == 1
+
+    def test_delay(self):
+        record.enqueue(value=1, delay=timedelta(minutes=5))
+        ensure_queues(["default"])
+
+        assert claim(["default"], "test") is None
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_limited_queue")
+class TestWorker:
+    def test_burst_runs_due_jobs_in_order(self):
+        enqueue("tests.record", {"value": 1})
+        enqueue("tests.record", {"value": 2})
+
+        processed = Worker(["default"]).run(burst=True)
+
+        assert processed == len(calls)
+        assert calls == [1, 2]
+        assert not Job.objects.exclude(status=Job.SUCCEEDED).exists()
+
+    def test_retry_with_backoff_then_fail(self):
+        job = fail.enqueue()
+        ensure_queues(["default"])
+
+        execute(claim(["default"], "test"))
+        job.refresh_from_db()
+        assert job.status == Job.QUEUED
+        assert job.run_at > timezone.now()
+        assert "boom" in job.last_error
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        execute(claim(["default"], "test"))
+        job.refresh_from_db()
+        assert job.status == Job.FAILED
+        assert job.attempts == MAX_ATTEMPTS
+
+    def test_queue_concurrency_limit(self):
+        limited.enqueue()
+        limited.enqueue()
+        ensure_queues([LIMITED_QUEUE])
+
+        assert claim([LIMITED_QUEUE], "first") is not None
+        assert claim([LIMITED_QUEUE], "second") is None
+
+    def test_expired_lease_reclaimed(self):
+        limited.enqueue()
+        ensure_queues([LIMITED_QUEUE])
+        job = claim([LIMITED_QUEUE], "crashed")
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1),
+        )
+
+        reclaimed = claim([LIMITED_QUEUE], "second")
+
+        assert reclaimed.pk == job.pk
+        assert reclaimed.attempts == MAX_ATTEMPTS
+
+    def test_queue_stats(self):
+        record.enqueue(value=1)
+        record.enqueue(value=2, delay=timedelta(minutes=5))
+        Worker(["default"]).run(burst=True)
+
+        stats = metrics.queue_stats()["default"]
+
+        assert stats["succeeded"] == 1
+        assert stats["queued"] == 1
+        assert stats["due"] == 0
+        assert stats["throughput_per_minute"] > 0
+        assert stats["wait_avg"] is not None
+
+    def test_queue_stats_latencies(self, settings):
+        settings.METRICS = {**settings.METRICS, "JOB_LATENCY_BUCKETS": [1, 5, 30]}
+        now = timezone.now()
+        for seconds in (2, 2, 2, 20):
+            started_at = now - timedelta(seconds=seconds)
+            Job.objects.create(
+                task="tests.record",
+                status=Job.SUCCEEDED,
+                run_at=started_at - timedelta(seconds=seconds),
+                started_at=started_at,
+                finished_at=now,
+            )
+        Job.objects.create(
+            task="tests.record",
+            status=Job.FAILED,
+            run_at=now,
+            started_at=now - timedelta(seconds=40),
+            finished_at=now,
+        )
+
+        stats = metrics.queue_stats()["default"]
+
+        assert (stats["succeeded"], stats["failed"]) == (4, 1)
+        assert stats["wait_avg"] == pytest.approx(26 / 5)
+        assert stats["wait_p95"] == 20
+        assert stats["duration_avg"] == pytest.approx(66 / 5)
+        assert stats["duration_p95"] == 40
+
+    def test_outcome_dropped_after_losing_lease(self):
+        job = reclaimed.enqueue()
+        ensure_queues(["default"])
+
+        execute(claim(["default"], "first"))
+
+        job.refresh_from_db()
+        assert (job.status, job.worker) == (Job.RUNNING, "other")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLease:
+    def test_lease_renewed_while_running(self, settings):
+        settings.JOB_LEASE_SECONDS = LEASE_SECONDS
+        slow.enqueue(seconds=LEASE_SECONDS)
+        ensure_queues(["default"])
+        job = claim(["default"], "test")
+
+        execute(job)
+
+        assert calls[0] > job.locked_until
+        job.refresh_from_db()
+        assert job.status == Job.SUCCEEDED
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentClaims:
+    def test_claim_waits_for_queue_lock(self):
+        if connection.vendor != "postgresql":
+            pytest.skip("Needs PostgreSQL")
+        ensure_queues(["default"])
+        record.enqueue(value=1)
+        locked = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    list(Queue.objects.select_for_update().filter(name="default"))
+                    locked.set()
+                    time.sleep(LEASE_SECONDS)
+            finally:
+                connections.close_all()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait()
+        job = claim(["default"], "worker")
+        holder.join()
+
+        assert job is not None
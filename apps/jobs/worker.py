@@ -0,0 +1,246 @@
+"""Claiming and running jobs.
+
+A worker claims one job at a time. Inside a transaction it locks the rows of
+its queues with ``SELECT ... FOR UPDATE``, waiting for workers claiming at
+the same time rather than skipping their queues, skips queues already
+running their concurrency limit and marks the oldest due job, not locked by
+another claim, as running with a lease. Jobs whose lease expired, for example because their worker died,
+are claimed again.
+
+While a job runs, a background thread renews its lease every third of
+``JOB_LEASE_SECONDS``, so long jobs aren't claimed twice. The outcome is only
+recorded while the worker still owns the job; a worker that lost its lease
+leaves the job to its new owner.
+"""
+
+import logging
+import random
+import socket
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import (
+    DatabaseError,
+    IntegrityError,
+    close_old_connections,
+    connections,
+    transaction,
+)
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Job, Queue
+from .tasks import registry
+
+logger = logging.getLogger(__name__)
+
+
+def worker_name(index=0):
+    """Return an identifier of a worker process for the ``Job.worker`` field."""
+    return f"{socket.gethostname()}:{index}"
+
+
+def ensure_queues(queues):
+    """Create the lock rows of the given queues if missing."""
+    Queue.objects.bulk_create(
+        [Queue(name=name) for name in queues],
+        ignore_conflicts=True,
+    )
+
+
+def backoff(attempts):
+    """Return the delay before retrying a job that failed ``attempts`` times."""
+    base, maximum = settings.JOB_RETRY_BACKOFF
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    # Jitter spreads retries of jobs that failed together.
+    return timedelta(seconds=delay * random.uniform(0.5, 1))  # noqa: S311
+
+
+def claim(queues, worker):
+    """Claim the next due job of the given queues, or return ``None``."""
+    now = timezone.now()
+    with transaction.atomic():
+        # Claims only hold the lock for a few queries, waiting for it keeps
+        # due jobs from being skipped until the next poll.
+        locked = list(
+            Queue.objects.select_for_update()
+            .filter(name__in=queues)
+            .order_by("name")
+            .values_list("name", flat=True),
+        )
+        running = dict(
+            Job.objects.filter(
+                queue__in=locked,
+                status=Job.RUNNING,
+                locked_until__gte=now,
+            )
+            .values("queue")
+            .annotate(total=Count("pk"))
+            .values_list("queue", "total"),
+        )
+        available = [
+            name
+            for name in locked
+            if settings.JOB_QUEUES.get(name) is None
+            or running.get(name, 0) < settings.JOB_QUEUES[name]
+        ]
+        if not available:
+            return None
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Job.QUEUED, run_at__lte=now)
+                | Q(status=Job.RUNNING, locked_until__lt=now),
+                queue__in=available,
+            )
+            .order_by("run_at", "pk")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.RUNNING
+        job.attempts += 1
+        job.started_at = now
+        job.locked_until = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        job.worker = worker
+        job.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "started_at",
+                "locked_until",
+                "worker",
+            ],
+        )
+        return job
+
+
+def _owned(job):
+    """Return a queryset of ``job`` matching only while this claim owns it."""
+    return Job.objects.filter(
+        pk=job.pk,
+        status=Job.RUNNING,
+        worker=job.worker,
+        attempts=job.attempts,
+    )
+
+
+def _lease_expiry():
+    return timezone.now() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+
+@contextmanager
+def _renewing_lease(job):
+    """Renew the lease of a running job until the block exits."""
+    done = threading.Event()
+
+    def renew():
+        try:
+            while not done.wait(settings.JOB_LEASE_SECONDS / 3):
+                try:
+                    renewed = _owned(job).update(locked_until=_lease_expiry())
+                except DatabaseError:
+                    logger.exception("Renewing the lease of job %s failed", job.pk)
+                    continue
+                if not renewed:
+                    logger.warning("Job %s (%s) lost its lease", job.pk, job.task)
+                    return
+        finally:
+            # Connections are per thread, this one ends with the thread.
+            connections.close_all()
+
+    heartbeat = threading.Thread(target=renew, name=f"job-{job.pk}-lease", daemon=True)
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        done.set()
+        heartbeat.join()
+
+
+def _record(job, **fields):
+    """Save the outcome of a job unless another worker claimed it meanwhile."""
+    if not _owned(job).update(**fields):
+        logger.warning(
+            "Job %s (%s) finished after losing its lease, outcome dropped",
+            job.pk,
+            job.task,
+        )
+
+
+def execute(job):
+    """Run a claimed job and record its outcome."""
+    try:
+        func = registry[job.task]
+        with _renewing_lease(job):
+            func(**job.payload)
+    except Exception:  # noqa: BLE001
+        logger.exception("Job %s (%s) failed", job.pk, job.task)
+        _failed(job, traceback.format_exc())
+    else:
+        _record(
+            job,
+            status=Job.SUCCEEDED,
+            finished_at=timezone.now(),
+            locked_until=None,
+        )
+
+
+def _failed(job, error):
+    fields = {"last_error": error, "locked_until": None}
+    if job.attempts >= job.max_attempts:
+        fields.update(status=Job.FAILED, finished_at=timezone.now())
+    else:
+        fields.update(
+            status=Job.QUEUED,
+            run_at=timezone.now() + backoff(job.attempts),
+        )
+    try:
+        with transaction.atomic():
+            _record(job, **fields)
+    except IntegrityError:
+        # A job with the same dedup key was queued meanwhile; retry anyway.
+        _record(job, **fields, dedup_key=None)
+
+
+class Worker:
+    """Claim and run jobs of the given queues until stopped."""
+
+    def __init__(self, queues, name=None, poll_interval=1.0):
+        self.queues = list(queues)
+        self.name = name or worker_name()
+        self.poll_interval = poll_interval
+
+    def run(self, stop_event=None, burst=False):
+        """Process jobs until ``stop_event`` is set.
+
+        In ``burst`` mode the worker returns as soon as no job is due and
+        leaves the database connection alone, so it can run inside a
+        transaction. Returns the number of processed jobs.
+        """
+        ensure_queues(self.queues)
+        processed = 0
+        while stop_event is None or not stop_event.is_set():
+            if not burst:
+                close_old_connections()
+            try:
+                job = claim(self.queues, self.name)
+            except DatabaseError:
+                if burst:
+                    raise
+                logger.exception("Claiming a job failed")
+                job = None
+            if job is not None:
+                execute(job)
+                processed += 1
+            elif burst:
+                break
+            elif stop_event is not None:
+                stop_event.wait(self.poll_interval)
+            else:
+                time.sleep(self.poll_interval)
+        return processed
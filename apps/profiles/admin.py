@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
+from . import deletion
 from .models import (
     ContactInfo,
     EmploymentType,
@@ -63,16 +64,17 @@ class TechnologyAdmin(admin.ModelAdmin):
         "code",
         "is_active",
         "website_link",
-        "profiles_count",
-        "projects_count",
+        "profile_count",
+        "project_count",
     )
     list_filter = ("is_active",)
     search_fields = ("name", "code", "description")
     ordering = ("name",)
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("profile_count", "project_count", "created_at", "updated_at")
     fieldsets = (
         ("Main Information", {"fields": ("name", "code", "description")}),
         ("Additional Information", {"fields": ("website", "icon", "is_active")}),
+        ("Statistics", {"fields": ("profile_count", "project_count")}),
         (
             "Metadata",
             {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
@@ -86,16 +88,6 @@ class TechnologyAdmin(admin.ModelAdmin):
 
     website_link.short_description = "Website"
 
-    def profiles_count(self, obj):
-        return obj.profiles.count()
-
-    profiles_count.short_description = "Profiles Count"
-
-    def projects_count(self, obj):
-        return obj.projects.count()
-
-    projects_count.short_description = "Projects Count"
-
 
 @admin.register(SocialNetwork)
 class SocialNetworkAdmin(admin.ModelAdmin):
@@ -207,6 +199,14 @@ class ProfileAdmin(admin.ModelAdmin):
 
     user_email.short_description = "User Email"
 
+    def delete_model(self, request, obj):
+        """Hide the profile and delete its rows in the background."""
+        deletion.delete_profiles([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        """Hide the profiles and delete their rows in the background."""
+        deletion.delete_profiles(queryset.values_list("pk", flat=True))
+
     def get_queryset(self, request):
         return (
             super()
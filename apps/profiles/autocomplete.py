@@ -0,0 +1,94 @@
+"""In-process prefix index of active technologies for autocomplete.
+
+Every process keeps a sorted array of case-folded technology names and codes
+and answers prefix lookups with ``bisect``, without touching the database.
+The index is rebuilt when the catalog version changes, so renames and new
+technologies show up at once, and at least every
+``TECHNOLOGY_AUTOCOMPLETE_TIMEOUT`` seconds to pick up the usage counters,
+which change without bumping the version.
+"""
+
+import heapq
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import catalog
+from .models import Technology
+
+MAX_LIMIT = 50
+
+_local = {}
+
+
+class PrefixIndex:
+    """Sorted array of ``(key, rank)`` pairs over technology names and codes.
+
+    ``suggestions`` are ordered by popularity, so the rank of a technology is
+    its position there and the best matches are the smallest ranks.
+    """
+
+    def __init__(self, suggestions):
+        self.suggestions = suggestions
+        pairs = sorted(
+            {
+                (key.casefold(), rank)
+                for rank, suggestion in enumerate(suggestions)
+                for key in (suggestion["name"], suggestion["code"])
+            },
+        )
+        self.keys = [key for key, _ in pairs]
+        self.ranks = [rank for _, rank in pairs]
+
+    def search(self, prefix, limit):
+        """Return up to ``limit`` suggestions whose name or code starts with it."""
+        prefix = prefix.casefold()
+        position = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", position)
+        ranks = set(self.ranks[position:end])
+        return [self.suggestions[rank] for rank in heapq.nsmallest(limit, ranks)]
+
+
+def _load():
+    key = f"technology-autocomplete:{catalog.version()}"
+    suggestions = cache.get(key)
+    if suggestions is None:
+        suggestions = [
+            {
+                "id": pk,
+                "name": name,
+                "code": code,
+                "profiles": profiles,
+                "projects": projects,
+            }
+            for pk, name, code, profiles, projects in Technology.objects.filter(
+                is_active=True,
+            )
+            .order_by("-profile_count", "-project_count", "name")
+            .values_list("pk", "name", "code", "profile_count", "project_count")
+        ]
+        cache.set(key, suggestions, settings.TECHNOLOGY_AUTOCOMPLETE_TIMEOUT)
+    return suggestions
+
+
+def index():
+    """Return the prefix index of this process, rebuilding it when stale."""
+    current = catalog.version()
+    memo = _local.get("index")
+    now = time.monotonic()
+    if memo is not None and memo[0] == current and memo[1] > now:
+        return memo[2]
+    prefix_index = PrefixIndex(_load())
+    _local["index"] = (
+        current,
+        now + settings.TECHNOLOGY_AUTOCOMPLETE_TIMEOUT,
+        prefix_index,
+    )
+    return prefix_index
+
+
+def suggest(prefix, limit=10):
+    """Return the most popular technologies matching ``prefix``."""
+    return index().search(prefix, max(1, min(limit, MAX_LIMIT)))
@@ -0,0 +1,92 @@
+"""Cached lookups of technologies, levels and employment types by code.
+
+Reference rows change rarely, so their ``code -> (id, name)`` maps are kept
+in the shared cache and memoized per process under a catalog version. Any
+committed save or delete of a reference row bumps the version, which makes
+every process reload the maps on next use.
+"""
+
+import uuid
+
+from django.core.cache import cache
+from django.db import router, transaction
+
+VERSION_KEY = "catalog:version"
+TIMEOUT = 60 * 60 * 24
+
+_local = {}
+
+
+def version():
+    """Return the current catalog version, creating one if missing."""
+    current = cache.get(VERSION_KEY)
+    if current is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        current = cache.get(VERSION_KEY)
+    return current
+
+
+def _set_version():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def bump():
+    """Start a new catalog version once the reference row change commits.
+
+    Bumping earlier would let another process reload the maps from the rows
+    before the commit and keep them under the new version.
+    """
+    transaction.on_commit(_set_version)
+
+
+def entries(model):
+    """Return ``{code: (pk, name)}`` of every row of a reference model."""
+    current = version()
+    label = model._meta.label_lower
+    memo = _local.get(label)
+    if memo is not None and memo[0] == current:
+        return memo[1]
+
+    key = f"catalog:{label}:{current}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = {
+            code: (pk, name)
+            for pk, code, name in model.objects.values_list("pk", "code", "name")
+        }
+        cache.set(key, rows, TIMEOUT)
+    _local[label] = (current, rows)
+    return rows
+
+
+def resolve(model, codes):
+    """Return instances of ``model`` for the given codes and the unknown codes.
+
+    Instances are built from the catalog in the order of ``codes`` with only
+    id, name and code loaded, as if fetched with ``only()``.
+    """
+    rows = entries(model)
+    missing = [code for code in codes if code not in rows]
+    if missing:
+        # Rows created since the catalog was loaded, before the bump arrived.
+        rows = {
+            **rows,
+            **{
+                code: (pk, name)
+                for pk, code, name in model.objects.filter(
+                    code__in=missing,
+                ).values_list("pk", "code", "name")
+            },
+        }
+    db = router.db_for_read(model)
+    instances = []
+    unknown = []
+    for code in codes:
+        if code in rows:
+            pk, name = rows[code]
+            instances.append(
+                model.from_db(db, ["id", "name", "code"], [pk, name, code]),
+            )
+        else:
+            unknown.append(code)
+    return instances, unknown
@@ -0,0 +1,128 @@
+"""Change feed of profiles ordered by ``(updated_at, id)``.
+
+The feed merges changed profiles and deletion tombstones and pages through
+them with keyset continuation tokens, so a sync costs a query per page of
+changes whatever the size of the table. Changes of projects, reviews,
+contacts, social networks and technology links touch ``updated_at`` of
+their profile so they show up as profile changes.
+
+Rows newer than ``PROFILE_CHANGES_SETTLE_SECONDS`` are held back: a
+transaction committing late may have written an older ``updated_at`` than
+a row already returned, and would otherwise be skipped by the token.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Profile, ProfileTombstone
+
+CHANGED = "changed"
+DELETED = "deleted"
+
+
+class InvalidToken(ValueError):
+    """Raised for a continuation token that can't be decoded."""
+
+
+def touch(profile_ids):
+    """Mark the given profiles as changed now."""
+    profile_ids = {pk for pk in profile_ids if pk is not None}
+    if profile_ids:
+        Profile.objects.filter(pk__in=profile_ids).update(updated_at=timezone.now())
+
+
+def touch_on_commit(profile_ids):
+    """Mark the given profiles as changed when the transaction commits.
+
+    For long transactions, whose ``updated_at`` values may already be older
+    than the settle delay when they commit.
+    """
+    profile_ids = {pk for pk in profile_ids if pk is not None}
+    if profile_ids:
+        transaction.on_commit(partial(touch, profile_ids))
+
+
+def encode_token(position):
+    """Return the continuation token of a feed position."""
+    payload = {
+        stream: [moment and moment.isoformat(), pk]
+        for stream, (moment, pk) in position.items()
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_token(token):
+    """Return the feed position of a continuation token."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        position = {
+            stream: (moment and datetime.fromisoformat(moment), int(pk))
+            for stream, (moment, pk) in payload.items()
+        }
+    except (ValueError, TypeError, AttributeError) as error:
+        raise InvalidToken(str(error)) from error
+    if position.keys() != {CHANGED, DELETED}:
+        raise InvalidToken("Unknown streams")
+    return position
+
+
+def start(since=None):
+    """Return the feed position of changes made after ``since``, or of all."""
+    return {CHANGED: (since, 0), DELETED: (since, 0)}
+
+
+def _after(queryset, field, position):
+    moment, pk = position
+    if moment is None:
+        return queryset.order_by(field, "pk")
+    return queryset.filter(
+        Q(**{f"{field}__gt": moment}) | Q(**{field: moment, "pk__gt": pk}),
+    ).order_by(field, "pk")
+
+
+def page(position, limit, queryset=None):
+    """Return up to ``limit`` changes after ``position`` and the next position.
+
+    Changes are ``(kind, changed_at, profile_id, profile)`` tuples, where
+    ``profile`` is ``None`` for deletions. The next position equals
+    ``position`` when there are no more changes yet.
+    """
+    queryset = Profile.objects.all() if queryset is None else queryset
+    settled = timezone.now() - timedelta(
+        seconds=settings.PROFILE_CHANGES_SETTLE_SECONDS,
+    )
+    # (changed_at, stream, row pk, row) entries, merged in feed order.
+    entries = [
+        (profile.updated_at, CHANGED, profile.pk, profile)
+        for profile in _after(
+            queryset.filter(updated_at__lte=settled),
+            "updated_at",
+            position[CHANGED],
+        )[:limit]
+    ]
+    entries.extend(
+        (tombstone.deleted_at, DELETED, tombstone.pk, tombstone)
+        for tombstone in _after(
+            ProfileTombstone.objects.filter(deleted_at__lte=settled),
+            "deleted_at",
+            position[DELETED],
+        )[:limit]
+    )
+    entries = sorted(entries, key=lambda entry: entry[:3])[:limit]
+
+    position = dict(position)
+    changes = []
+    for moment, stream, pk, row in entries:
+        position[stream] = (moment, pk)
+        if stream == CHANGED:
+            changes.append((CHANGED, moment, pk, row))
+        else:
+            changes.append((DELETED, moment, row.profile_id, None))
+    return changes, position
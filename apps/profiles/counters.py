@@ -0,0 +1,82 @@
+"""Denormalized usage counters kept exact with atomic F-expression updates.
+
+``Profile.project_count`` and ``Technology.project_count`` count projects that
+are not cancelled; ``Technology.profile_count`` counts profiles listing the
+technology.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Profile, Project, Technology
+
+UNCOUNTED_STATUSES = ("cancelled",)
+
+
+def is_counted(status):
+    """Return whether a project with ``status`` is included in the counters."""
+    return status not in UNCOUNTED_STATUSES
+
+
+def adjust_profile_projects(profile_id, delta):
+    """Atomically add ``delta`` to a profile's project count."""
+    if profile_id is not None and delta:
+        Profile.objects.filter(pk=profile_id).update(
+            project_count=F("project_count") + delta,
+        )
+
+
+def adjust_technologies(field, technology_ids, sign):
+    """Atomically add ``sign`` per occurrence of each technology id to ``field``.
+
+    Technologies are grouped by their number of occurrences so that changes of
+    any size cost one UPDATE per distinct occurrence count.
+    """
+    by_delta = defaultdict(list)
+    for technology_id, occurrences in Counter(technology_ids).items():
+        by_delta[occurrences * sign].append(technology_id)
+    for delta, ids in by_delta.items():
+        Technology.objects.filter(pk__in=ids).update(**{field: F(field) + delta})
+
+
+def project_technology_ids(project_id):
+    """Return the technology ids linked to a project."""
+    return list(
+        Project.technologies.through.objects.filter(project_id=project_id).values_list(
+            "technology_id",
+            flat=True,
+        ),
+    )
+
+
+def _count_subquery(queryset, field):
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def recount_all():
+    """Recompute every counter from scratch."""
+    counted_projects = Project.objects.exclude(status__in=UNCOUNTED_STATUSES)
+    Profile.objects.update(
+        project_count=_count_subquery(counted_projects, "profile"),
+    )
+    Technology.objects.update(
+        profile_count=_count_subquery(
+            Profile.technologies.through.objects.all(),
+            "technology",
+        ),
+        project_count=_count_subquery(
+            Project.technologies.through.objects.exclude(
+                project__status__in=UNCOUNTED_STATUSES,
+            ),
+            "technology",
+        ),
+    )
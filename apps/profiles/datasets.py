@@ -0,0 +1,381 @@
+"""Deterministic synthetic datasets for scale testing.
+
+``generate`` writes users with profiles, technology links, projects, reviews,
+contacts and social networks in chunks of ``chunk_size`` profiles. Every
+chunk draws from its own random generator seeded with ``(seed, chunk)``, so
+the data only depends on the seed and the chunk size, not on how chunks are
+spread over worker processes. Chunks are written with ``bulk_create``, each
+in its own transaction, by a pool of ``workers`` processes.
+
+Distributions are skewed like real data: technology popularity follows a
+Zipf law, project and review counts have long tails, and ratings lean
+towards 4 and 5. All users share one password hashed once up front.
+
+Rows skip signal handlers. The rating statistics, project counts and
+technology ids of the profiles are computed while generating, ``recount``
+rebuilds everything else derived from the rows afterwards.
+"""
+
+import multiprocessing
+import random
+import uuid
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+
+from . import catalog, counters, experience, leaderboards, list_cache, similarity
+from .models import (
+    ContactInfo,
+    EmploymentType,
+    Profile,
+    Project,
+    Review,
+    SocialNetwork,
+    SpecialistLevel,
+    Technology,
+)
+from .reviews import HISTOGRAM_FIELDS
+
+CHUNK_SIZE = 1000
+BATCH_SIZE = 2000
+
+# Reference rows created when the catalog is empty, as (code, name).
+TECHNOLOGIES = [
+    ("python", "Python"),
+    ("javascript", "JavaScript"),
+    ("typescript", "TypeScript"),
+    ("react", "React"),
+    ("django", "Django"),
+    ("postgresql", "PostgreSQL"),
+    ("docker", "Docker"),
+    ("java", "Java"),
+    ("nodejs", "Node.js"),
+    ("go", "Go"),
+    ("kubernetes", "Kubernetes"),
+    ("aws", "AWS"),
+    ("vue", "Vue.js"),
+    ("csharp", "C#"),
+    ("dotnet", ".NET"),
+    ("spring", "Spring"),
+    ("redis", "Redis"),
+    ("fastapi", "FastAPI"),
+    ("angular", "Angular"),
+    ("php", "PHP"),
+    ("laravel", "Laravel"),
+    ("kotlin", "Kotlin"),
+    ("swift", "Swift"),
+    ("rust", "Rust"),
+    ("cpp", "C++"),
+    ("mysql", "MySQL"),
+    ("mongodb", "MongoDB"),
+    ("graphql", "GraphQL"),
+    ("terraform", "Terraform"),
+    ("flutter", "Flutter"),
+    ("ruby", "Ruby"),
+    ("rails", "Ruby on Rails"),
+    ("kafka", "Kafka"),
+    ("elasticsearch", "Elasticsearch"),
+    ("scala", "Scala"),
+    ("svelte", "Svelte"),
+    ("pytorch", "PyTorch"),
+    ("pandas", "pandas"),
+    ("celery", "Celery"),
+    ("nginx", "nginx"),
+]
+EMPLOYMENT_TYPES = [
+    ("full_time", "Full-time"),
+    ("part_time", "Part-time"),
+    ("contract", "Contract"),
+    ("freelance", "Freelance"),
+]
+LEVELS = [
+    ("junior", "Junior"),
+    ("middle", "Middle"),
+    ("senior", "Senior"),
+    ("lead", "Lead"),
+]
+
+FIRST_NAMES = [
+    "Alex", "Anna", "Boris", "Daria", "Elena", "Igor", "Irina", "Ivan", "Kate",
+    "Maria", "Maxim", "Nikita", "Olga", "Pavel", "Sergey", "Sofia", "Victor",
+    "Yulia", "Dmitry", "Natalia",
+]  # fmt: skip
+LAST_NAMES = [
+    "Ivanov", "Smirnov", "Kuznetsov", "Popov", "Vasiliev", "Petrov", "Sokolov",
+    "Mikhailov", "Novikov", "Fedorov", "Morozov", "Volkov", "Alekseev",
+    "Lebedev", "Semenov", "Egorov", "Pavlov", "Kozlov", "Stepanov", "Nikolaev",
+]  # fmt: skip
+POSITIONS = [
+    "Backend Developer",
+    "Frontend Developer",
+    "Full Stack Developer",
+    "Mobile Developer",
+    "DevOps Engineer",
+    "Data Engineer",
+    "QA Engineer",
+    "Team Lead",
+]
+RATINGS = list(HISTOGRAM_FIELDS)
+# Weights of ratings 1 to 5.
+RATING_WEIGHTS = [3, 5, 12, 35, 45]
+PROJECT_STATUSES = ["ongoing", "completed", "cancelled"]
+PROJECT_STATUS_WEIGHTS = [25, 65, 10]
+CONTACT_TYPES = [code for code, _ in ContactInfo.CONTACT_TYPES]
+NETWORK_TYPES = [code for code, _ in SocialNetwork.NETWORK_TYPES]
+FIRST_DAY = date(2012, 1, 1)
+LAST_DAY = date(2025, 12, 31)
+
+
+def _reference(model, defaults):
+    """Return the pks of a reference model, creating ``defaults`` if empty."""
+    if not model.objects.exists():
+        model.objects.bulk_create(
+            model(code=code, name=name) for code, name in defaults
+        )
+        catalog.bump()
+    return list(model.objects.order_by("pk").values_list("pk", flat=True))
+
+
+def references():
+    """Return the technology, employment and level pks the data draws from."""
+    return {
+        "technologies": _reference(Technology, TECHNOLOGIES),
+        "employments": _reference(EmploymentType, EMPLOYMENT_TYPES),
+        "levels": _reference(SpecialistLevel, LEVELS),
+    }
+
+
+def _long_tail(rng, mean, maximum):
+    """Return a non-negative count with a long tail and the given mean."""
+    return min(int(rng.expovariate(1 / mean)), maximum)
+
+
+def _zipf_weights(count, exponent):
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def _day(rng, start, end):
+    return start + timedelta(days=rng.randint(0, max(0, (end - start).days)))
+
+
+class Chunk:
+    """The generated rows of one chunk of profiles.
+
+    Rows reference each other as unsaved instances, ``write`` inserts them
+    parents first so that ``bulk_create`` fills in the foreign keys.
+    """
+
+    def __init__(self, seed, chunk, chunk_size, total, password, refs):
+        self.rng = random.Random(f"{seed}:{chunk}")
+        self.refs = refs
+        self.technology_weights = _zipf_weights(len(refs["technologies"]), 1.1)
+        self.employment_weights = _zipf_weights(len(refs["employments"]), 1.5)
+        self.users = []
+        self.profiles = []
+        self.profile_technologies = []
+        self.projects = []
+        self.project_technologies = []
+        self.reviews = []
+        self.contacts = []
+        self.social_networks = []
+        first = chunk * chunk_size
+        for n in range(first, min(first + chunk_size, total)):
+            self.add_profile(f"dataset-{seed}-{n}@example.com", password)
+
+    def technologies(self, mean):
+        """Return distinct technology pks, popular ones more often."""
+        technologies = self.refs["technologies"]
+        count = min(1 + _long_tail(self.rng, mean, 15), len(technologies))
+        chosen = set()
+        while len(chosen) < count:
+            chosen.update(
+                self.rng.choices(
+                    technologies,
+                    self.technology_weights,
+                    k=count - len(chosen),
+                ),
+            )
+        return sorted(chosen)
+
+    def add_profile(self, email, password):
+        rng = self.rng
+        user = get_user_model()(
+            uuid=uuid.UUID(int=rng.getrandbits(128), version=4),
+            email=email,
+            password=password,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            is_active=True,
+        )
+        profile = Profile(
+            user=user,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            position=rng.choice(POSITIONS),
+            employment_id=rng.choices(
+                self.refs["employments"],
+                self.employment_weights,
+            )[0],
+            level_id=rng.choice(self.refs["levels"]),
+            experience=f"{min(int(rng.lognormvariate(1.4, 0.6)), 40)} years",
+        )
+        self.users.append(user)
+        self.profiles.append(profile)
+
+        technology_ids = self.technologies(3)
+        profile.technology_ids = technology_ids
+        self.profile_technologies.extend(
+            Profile.technologies.through(profile=profile, technology_id=pk)
+            for pk in technology_ids
+        )
+        ratings = []
+        for n in range(_long_tail(rng, 3, 40)):
+            project = self.add_project(profile, n, technology_ids, ratings)
+            profile.project_count += counters.is_counted(project.status)
+        self.add_contacts(profile)
+
+        profile.review_count = len(ratings)
+        if ratings:
+            profile.rating = (Decimal(sum(ratings)) / len(ratings)).quantize(
+                Decimal("0.1"),
+                ROUND_HALF_UP,
+            )
+        for rating, field in HISTOGRAM_FIELDS.items():
+            setattr(profile, field, ratings.count(rating))
+
+    def add_project(self, profile, n, technology_ids, ratings):
+        """Add a project with its reviews, collecting their ratings."""
+        rng = self.rng
+        status = rng.choices(PROJECT_STATUSES, PROJECT_STATUS_WEIGHTS)[0]
+        start = _day(rng, FIRST_DAY, LAST_DAY - timedelta(days=30))
+        end = None
+        if status != "ongoing":
+            days = 14 + _long_tail(rng, 240, 2000)
+            end = min(start + timedelta(days=days), LAST_DAY)
+        project = Project(
+            profile=profile,
+            title=f"Project {n + 1}",
+            description="Generated project",
+            start_date=start,
+            end_date=end,
+            status=status,
+        )
+        self.projects.append(project)
+        # Projects mostly use technologies listed on the profile.
+        project_technologies = set(
+            rng.sample(technology_ids, min(len(technology_ids), rng.randint(1, 4))),
+        )
+        if rng.random() < 0.2:
+            project_technologies.update(self.technologies(0.5))
+        self.project_technologies.extend(
+            Project.technologies.through(project=project, technology_id=pk)
+            for pk in sorted(project_technologies)
+        )
+
+        project_ratings = rng.choices(
+            RATINGS,
+            RATING_WEIGHTS,
+            k=_long_tail(rng, 1.5, 30),
+        )
+        self.reviews.extend(
+            Review(
+                profile=profile,
+                project=project,
+                rating=rating,
+                text="Generated review",
+                reviewer_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            )
+            for rating in project_ratings
+        )
+        ratings.extend(project_ratings)
+        return project
+
+    def add_contacts(self, profile):
+        rng = self.rng
+        handle = profile.user.email.split("@")[0]
+        self.contacts.extend(
+            ContactInfo(
+                profile=profile,
+                contact_type=contact_type,
+                value=f"{contact_type}-{handle}",
+                is_primary=index == 0,
+                is_public=rng.random() < 0.7,
+            )
+            for index, contact_type in enumerate(
+                rng.sample(CONTACT_TYPES, rng.randint(1, 3)),
+            )
+        )
+        self.social_networks.extend(
+            SocialNetwork(
+                profile=profile,
+                network_type=network_type,
+                url=f"https://example.com/{network_type}/{handle}",
+                is_primary=index == 0,
+            )
+            for index, network_type in enumerate(
+                rng.sample(NETWORK_TYPES, rng.randint(0, 3)),
+            )
+        )
+
+    @transaction.atomic
+    def write(self):
+        """Insert the rows, parents first, and return the number of profiles."""
+        for model, rows in (
+            (get_user_model(), self.users),
+            (Profile, self.profiles),
+            (Profile.technologies.through, self.profile_technologies),
+            (Project, self.projects),
+            (Project.technologies.through, self.project_technologies),
+            (Review, self.reviews),
+            (ContactInfo, self.contacts),
+            (SocialNetwork, self.social_networks),
+        ):
+            model.objects.bulk_create(rows, BATCH_SIZE)
+        return len(self.profiles)
+
+
+def _init_worker():
+    # Spawned workers start without Django, forked ones share the parent's
+    # connections, which must not be used by two processes.
+    django.setup()
+    connections.close_all()
+
+
+def _write_chunk(arguments):
+    written = Chunk(*arguments).write()
+    connections.close_all()
+    return written
+
+
+def generate(total, seed=0, workers=1, chunk_size=CHUNK_SIZE, password=None):
+    """Generate ``total`` profiles, yield the number written after each chunk.
+
+    Users get ``password``, or an unusable password when it is ``None``.
+    """
+    refs = references()
+    password = make_password(password)
+    chunks = [
+        (seed, chunk, chunk_size, total, password, refs)
+        for chunk in range((total + chunk_size - 1) // chunk_size)
+    ]
+    if workers <= 1:
+        for arguments in chunks:
+            yield _write_chunk(arguments)
+        return
+    connections.close_all()
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        yield from pool.imap_unordered(_write_chunk, chunks)
+
+
+def recount():
+    """Rebuild the data derived from profiles that bulk inserts skipped."""
+    counters.recount_all()
+    similarity.rebuild_index()
+    experience.rebuild_all()
+    leaderboards.rebuild_all()
+    catalog.bump()
+    list_cache.invalidate({list_cache.ALL_PROFILES})
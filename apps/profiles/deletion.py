@@ -0,0 +1,193 @@
+"""Deletion of profiles and users in bounded batches.
+
+Deleting a profile with ``Model.delete`` cascades through all of its
+projects, reviews, contacts and links in one transaction, holding locks for
+as long as that takes. ``delete_profiles`` instead hides the profiles at
+once, dropping them from every list, index and cache, and queues a job that
+removes their rows ``PROFILE_DELETION_BATCH_SIZE`` at a time, each batch in
+its own short transaction, before deleting the emptied profile.
+
+Batches are deleted without signals. The counters the signals would update
+are adjusted per batch, everything else derived from the profile is dropped
+when it is hidden.
+"""
+
+import time
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from apps.jobs.tasks import enqueue
+
+from . import counters, edge, leaderboards, list_cache
+from .models import (
+    ContactInfo,
+    Profile,
+    ProfileSignature,
+    ProfileSignatureBand,
+    ProfileTombstone,
+    Project,
+    Review,
+    SocialNetwork,
+    TechnologyExperience,
+)
+
+DELETING = "deleting"
+DELETED = "deleted"
+
+
+def _profile_rows(profile_id):
+    """Return the querysets of rows removed before a profile, in order."""
+    project_links = Project.technologies.through.objects.filter(
+        project__profile_id=profile_id,
+    )
+    return {
+        "reviews": Review.objects.filter(profile_id=profile_id),
+        "project_technologies": project_links,
+        "projects": Project.objects.filter(profile_id=profile_id),
+        "contacts": ContactInfo.objects.filter(profile_id=profile_id),
+        "social_networks": SocialNetwork.objects.filter(profile_id=profile_id),
+        "technologies": Profile.technologies.through.objects.filter(
+            profile_id=profile_id,
+        ),
+    }
+
+
+def _delete_rows(model, ids):
+    """Delete rows by primary key with one statement, without signals."""
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} "
+            f"WHERE {quote(model._meta.pk.column)} IN ({placeholders})",
+            ids,
+        )
+
+
+def _delete_batch(name, queryset, batch_size):
+    """Delete up to ``batch_size`` rows of a step, return how many were found."""
+    with transaction.atomic():
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return 0
+        if name == "project_technologies":
+            links = queryset.model.objects.filter(pk__in=ids)
+            counters.adjust_technologies(
+                "project_count",
+                [
+                    technology_id
+                    for technology_id, status in links.values_list(
+                        "technology_id",
+                        "project__status",
+                    )
+                    if counters.is_counted(status)
+                ],
+                -1,
+            )
+        elif name == "projects":
+            # Reviews of other profiles may point at these projects.
+            Review.objects.filter(project_id__in=ids).update(project=None)
+        elif name == "technologies":
+            counters.adjust_technologies(
+                "profile_count",
+                queryset.model.objects.filter(pk__in=ids).values_list(
+                    "technology_id",
+                    flat=True,
+                ),
+                -1,
+            )
+        _delete_rows(queryset.model, ids)
+        return len(ids)
+
+
+def delete_profiles(profile_ids):
+    """Hide the given profiles now and queue the removal of their rows."""
+    profiles = list(Profile.objects.filter(pk__in=profile_ids))
+    if not profiles:
+        return
+    profile_ids = [profile.pk for profile in profiles]
+    # Collected while the profiles are still visible to these helpers.
+    tags = list_cache.profile_tags(profile_ids)
+    boards = {profile.pk: leaderboards.profile_boards(profile) for profile in profiles}
+    with transaction.atomic():
+        Profile.objects.filter(pk__in=profile_ids).update(deleted_at=timezone.now())
+        ProfileSignatureBand.objects.filter(profile_id__in=profile_ids).delete()
+        ProfileSignature.objects.filter(profile_id__in=profile_ids).delete()
+        TechnologyExperience.objects.filter(profile_id__in=profile_ids).delete()
+        ProfileTombstone.objects.bulk_create(
+            [ProfileTombstone(profile_id=pk) for pk in profile_ids],
+        )
+        for pk in profile_ids:
+            enqueue(
+                "profiles.purge_profile",
+                {"profile_id": pk},
+                dedup_key=f"purge-profile:{pk}",
+            )
+        edge.profiles_changed(profile_ids, listed=True)
+        # Registered on commit, as callers may hold an outer transaction.
+        for pk, profile_boards in boards.items():
+            leaderboards.profile_deleted(pk, profile_boards)
+        list_cache.invalidate(tags)
+
+
+def delete_user(user):
+    """Deactivate a user now and queue the deletion of the user and profiles."""
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        delete_profiles(user.profiles.values_list("pk", flat=True))
+        enqueue(
+            "profiles.purge_user",
+            {"user_id": user.pk},
+            dedup_key=f"purge-user:{user.pk}",
+        )
+
+
+def purge(profile_id, batch_size=None, time_budget=None):
+    """Remove the rows of a hidden profile, then the profile itself.
+
+    Stops after ``time_budget`` seconds and returns ``False`` when rows are
+    left, so that the caller can continue in another job.
+    """
+    batch_size = batch_size or settings.PROFILE_DELETION_BATCH_SIZE
+    time_budget = time_budget or settings.PROFILE_DELETION_TIME_BUDGET
+    deadline = time.monotonic() + time_budget
+    hidden = Profile.all_objects.filter(pk=profile_id, deleted_at__isnull=False)
+    if not hidden.exists():
+        return True
+    for name, queryset in _profile_rows(profile_id).items():
+        while _delete_batch(name, queryset, batch_size) == batch_size:
+            if time.monotonic() > deadline:
+                return False
+    for profile in hidden:
+        # Only the profile row is left, so the cascade is instant.
+        profile.delete()
+    return True
+
+
+def progress(profile_id):
+    """Return the deletion status of a profile and its remaining rows.
+
+    Returns ``None`` for profiles that are not being or were never deleted.
+    """
+    deleted_at = (
+        Profile.all_objects.filter(pk=profile_id)
+        .values_list("deleted_at", flat=True)
+        .first()
+    )
+    if deleted_at is not None:
+        return {
+            "status": DELETING,
+            "remaining": {
+                name: queryset.count()
+                for name, queryset in _profile_rows(profile_id).items()
+            },
+        }
+    if ProfileTombstone.objects.filter(profile_id=profile_id).exists() and not (
+        Profile.all_objects.filter(pk=profile_id).exists()
+    ):
+        return {"status": DELETED, "remaining": {}}
+    return None
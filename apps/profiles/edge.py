@@ -0,0 +1,67 @@
+"""Surrogate keys and purges of the public profile API.
+
+Public pages are keyed by the profiles and reference rows they show, using
+the tag names of ``list_cache``. Every public list page also carries
+``list_cache.ALL_PROFILES``, purged by changes of data lists show or filter
+on, as those may reorder or extend any page.
+
+Purges for backends talking to the network are queued as jobs, which are
+only visible once the caller commits, so writes don't wait for the proxy and
+failed purges are retried.
+"""
+
+import hashlib
+
+from apps.jobs.tasks import enqueue
+from it_specialist import purging
+
+from . import list_cache
+
+
+def profile_key(pk):
+    """Return the surrogate key of a profile."""
+    return list_cache.tag("profile", pk)
+
+
+def page_keys(profiles, listing=False):
+    """Return the surrogate keys of a page showing serialized profiles."""
+    keys = list_cache.content_tags(profiles)
+    keys.update(profile_key(profile["id"]) for profile in profiles)
+    keys.update(
+        list_cache.tag("technology", technology["id"])
+        for profile in profiles
+        for project in profile.get("projects", ())
+        for technology in project["technologies"]
+    )
+    if listing:
+        keys.add(list_cache.ALL_PROFILES)
+    return keys
+
+
+def _purge(keys):
+    if not purging.queued():
+        purging.purge(keys)
+        return
+    keys = sorted(keys)
+    digest = hashlib.blake2b(" ".join(keys).encode(), digest_size=16).hexdigest()
+    # A purge of the same keys still waiting covers this change too.
+    enqueue("profiles.purge_edge", {"keys": keys}, dedup_key=f"purge-edge:{digest}")
+
+
+def profiles_changed(profile_ids, listed=False):
+    """Purge the public pages showing the given profiles.
+
+    ``listed`` tells that data shown or filtered on by lists changed, which
+    purges every list page as well.
+    """
+    profile_ids = {pk for pk in profile_ids if pk is not None}
+    if profile_ids:
+        keys = {profile_key(pk) for pk in profile_ids}
+        if listed:
+            keys.add(list_cache.ALL_PROFILES)
+        _purge(keys)
+
+
+def reference_changed(kind, pk):
+    """Purge the public pages showing a technology, level or employment type."""
+    _purge({list_cache.tag(kind, pk)})
@@ -0,0 +1,195 @@
+"""Materialized time specialists worked with each technology.
+
+``TechnologyExperience`` holds a row per profile and technology used in any
+of its projects. The date ranges of those projects are merged before
+counting, so overlapping projects count once. Projects without an end date
+run until today and make the row ongoing; cancelled projects are left out,
+like in the usage counters.
+
+Rows of a profile are recomputed whenever its projects or their
+technologies change. Ongoing rows fall a day behind every day, so
+``refresh_ongoing`` (the ``refresh_experience`` command) should run daily.
+
+Cached profile lists filtered by a technology carry its tag, so every
+function here expires the tags of the technologies whose rows changed.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import counters, list_cache
+from .models import Profile, Project, Technology, TechnologyExperience
+
+DAYS_PER_YEAR = 365
+
+
+def merged_days(ranges, today):
+    """Return the days covered by date ranges and whether any is ongoing.
+
+    Ranges are ``(start_date, end_date)`` pairs, ``end_date`` being ``None``
+    for projects still running. Time after ``today`` isn't counted yet.
+    """
+    ongoing = False
+    spans = []
+    for start, end in ranges:
+        if end is None or end > today:
+            ongoing = True
+            end = today
+        if start < end:
+            spans.append((start, end))
+
+    days = 0
+    current_start = current_end = None
+    for start, end in sorted(spans):
+        if current_end is not None and start <= current_end:
+            current_end = max(current_end, end)
+            continue
+        if current_end is not None:
+            days += (current_end - current_start).days
+        current_start, current_end = start, end
+    if current_end is not None:
+        days += (current_end - current_start).days
+    return days, ongoing
+
+
+def _ranges(profile_ids):
+    """Return the counted project date ranges per profile and technology."""
+    ranges = defaultdict(list)
+    links = (
+        Project.technologies.through.objects.filter(
+            project__profile_id__in=profile_ids,
+        )
+        .exclude(project__status__in=counters.UNCOUNTED_STATUSES)
+        .values_list(
+            "project__profile_id",
+            "technology_id",
+            "project__start_date",
+            "project__end_date",
+        )
+    )
+    for profile_id, technology_id, start, end in links.iterator():
+        ranges[profile_id, technology_id].append((start, end))
+    return ranges
+
+
+def _rows(profile_ids, today):
+    rows = []
+    for (profile_id, technology_id), ranges in _ranges(profile_ids).items():
+        days, ongoing = merged_days(ranges, today)
+        rows.append(
+            TechnologyExperience(
+                profile_id=profile_id,
+                technology_id=technology_id,
+                days=days,
+                is_ongoing=ongoing,
+                refreshed_on=today,
+            ),
+        )
+    return rows
+
+
+def _expire_lists(technology_ids):
+    list_cache.invalidate({list_cache.tag("technology", pk) for pk in technology_ids})
+
+
+def update_profiles(profile_ids):
+    """Recompute the experience rows of the given profiles.
+
+    Returns the ids of the technologies whose rows changed.
+    """
+    profile_ids = {pk for pk in profile_ids if pk is not None}
+    if not profile_ids:
+        return set()
+    with transaction.atomic():
+        # Concurrent updates of a profile wait here and then compute its rows
+        # from the committed projects, instead of inserting the same rows.
+        profile_ids = list(
+            Profile.all_objects.select_for_update()
+            .filter(pk__in=profile_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True),
+        )
+        rows = _rows(profile_ids, timezone.localdate())
+        new = {(row.profile_id, row.technology_id): row.days for row in rows}
+        existing = TechnologyExperience.objects.filter(profile_id__in=profile_ids)
+        old = {
+            (profile_id, technology_id): days
+            for profile_id, technology_id, days in existing.values_list(
+                "profile_id",
+                "technology_id",
+                "days",
+            )
+        }
+        existing.delete()
+        TechnologyExperience.objects.bulk_create(rows)
+    changed = {
+        key[1] for key in old.keys() | new.keys() if old.get(key) != new.get(key)
+    }
+    _expire_lists(changed)
+    return changed
+
+
+def refresh_ongoing(batch_size=1000):
+    """Bring ongoing rows up to date, return the number of refreshed profiles."""
+    stale = TechnologyExperience.objects.filter(
+        is_ongoing=True,
+        refreshed_on__lt=timezone.localdate(),
+    )
+    refreshed = 0
+    while True:
+        profile_ids = list(
+            stale.order_by("profile_id")
+            .values_list("profile_id", flat=True)
+            .distinct()[:batch_size],
+        )
+        if not profile_ids:
+            return refreshed
+        update_profiles(profile_ids)
+        refreshed += len(profile_ids)
+
+
+def rebuild_all(batch_size=1000):
+    """Rebuild every row from scratch, return the number of rows."""
+    TechnologyExperience.objects.all().delete()
+    today = timezone.localdate()
+    created = 0
+    last_id = 0
+    while True:
+        profile_ids = list(
+            Profile.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size],
+        )
+        if not profile_ids:
+            break
+        created += len(
+            TechnologyExperience.objects.bulk_create(_rows(profile_ids, today)),
+        )
+        last_id = profile_ids[-1]
+    _expire_lists(Technology.objects.values_list("pk", flat=True))
+    return created
+
+
+def filter_profiles(queryset, technology_id, min_days):
+    """Return profiles with at least ``min_days`` of experience with a technology."""
+    return queryset.filter(
+        pk__in=TechnologyExperience.objects.filter(
+            technology_id=technology_id,
+            days__gte=min_days,
+        ).values("profile_id"),
+    )
+
+
+def annotate_days(queryset, technology_id, name="experience_days"):
+    """Annotate profiles with their days of experience with a technology."""
+    if technology_id is None:
+        return queryset.annotate(**{name: Value(0)})
+    days = TechnologyExperience.objects.filter(
+        profile_id=OuterRef("pk"),
+        technology_id=technology_id,
+    ).values("days")
+    return queryset.annotate(**{name: Coalesce(Subquery(days), Value(0))})
@@ -0,0 +1,59 @@
+"""Background tasks of the profiles app."""
+
+from apps.jobs.tasks import task
+from apps.users.models import User
+from it_specialist import purging
+
+from . import counters, deletion, experience, leaderboards, reviews, similarity
+from .models import Profile
+
+
+@task("profiles.refresh_review_stats")
+def refresh_review_stats(profile_ids):
+    reviews.refresh_stats(profile_ids)
+
+
+@task("profiles.recount_counters", queue="maintenance")
+def recount_counters():
+    counters.recount_all()
+
+
+@task("profiles.rebuild_leaderboards", queue="maintenance")
+def rebuild_leaderboards():
+    leaderboards.rebuild_all()
+
+
+@task("profiles.rebuild_similarity_index", queue="maintenance")
+def rebuild_similarity_index():
+    similarity.rebuild_index()
+
+
+@task("profiles.refresh_experience", queue="maintenance")
+def refresh_experience():
+    experience.refresh_ongoing()
+
+
+@task("profiles.purge_edge")
+def purge_edge(keys):
+    purging.send(keys)
+
+
+@task("profiles.purge_profile", queue="deletion")
+def purge_profile(profile_id):
+    if not deletion.purge(profile_id):
+        purge_profile.enqueue(
+            dedup_key=f"purge-profile:{profile_id}",
+            profile_id=profile_id,
+        )
+
+
+@task("profiles.purge_user", queue="deletion")
+def purge_user(user_id):
+    for profile_id in Profile.all_objects.filter(user_id=user_id).values_list(
+        "pk",
+        flat=True,
+    ):
+        if not deletion.purge(profile_id):
+            purge_user.enqueue(dedup_key=f"purge-user:{user_id}", user_id=user_id)
+            return
+    User.objects.filter(pk=user_id, is_active=False).delete()
@@ -0,0 +1,274 @@
+"""Precomputed profile leaderboards kept in the shared cache.
+
+A board holds the top profiles of one technology, level or employment type as
+``(rating, review_count, profile_id)`` entries sorted like ``Profile`` itself.
+Boards are updated in place when a profile's rating or categories change and
+rebuilt from the database only when they are cold or ran short of entries.
+Boards are only built for codes found in the catalog, so unknown codes don't
+leave entries in the cache.
+
+Changes reach the boards and cards once the transaction making them commits,
+so a rollback never shows up in the cache.
+"""
+
+import time
+from bisect import insort
+from contextlib import contextmanager
+from decimal import Decimal
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+from . import catalog
+from .models import EmploymentType, Profile, SpecialistLevel, Technology
+
+BOARD_LOOKUPS = {
+    "technology": "technologies__code",
+    "level": "level__code",
+    "employment": "employment__code",
+}
+BOARD_MODELS = {
+    "technology": Technology,
+    "level": SpecialistLevel,
+    "employment": EmploymentType,
+}
+# Number of entries kept per board and the largest slice served from it.
+BOARD_SIZE = 200
+MAX_LIMIT = 100
+CARD_TIMEOUT = 60 * 60 * 24
+LOCK_TIMEOUT = 5
+LOCK_ATTEMPTS = 10
+LOCK_WAIT = 0.005
+
+TRACKED_FIELDS = ("rating", "review_count", "level_id", "employment_id")
+
+
+def board_key(kind, code):
+    """Return the cache key of a leaderboard."""
+    return f"leaderboard:{kind}:{code}"
+
+
+def card_key(profile_id):
+    """Return the cache key of a serialized profile card."""
+    return f"leaderboard:card:{profile_id}"
+
+
+def _on_commit(func, *args):
+    transaction.on_commit(partial(func, *args))
+
+
+def _sort_key(entry):
+    rating, review_count, profile_id = entry
+    return (-rating, -review_count, profile_id)
+
+
+def _entry(rating, review_count, profile_id):
+    return (Decimal(str(rating)).quantize(Decimal("0.1")), review_count, profile_id)
+
+
+def build_board(kind, code):
+    """Rebuild a leaderboard from the database and return it."""
+    rows = (
+        Profile.objects.filter(**{BOARD_LOOKUPS[kind]: code})
+        .order_by("-rating", "-review_count", "pk")
+        .values_list("rating", "review_count", "pk")[: BOARD_SIZE + 1]
+    )
+    entries = [_entry(*row) for row in rows]
+    board = {"entries": entries[:BOARD_SIZE], "complete": len(entries) <= BOARD_SIZE}
+    cache.set(board_key(kind, code), board, None)
+    return board
+
+
+def rebuild_all():
+    """Rebuild every leaderboard and return the number of boards built."""
+    built = 0
+    for kind, model in BOARD_MODELS.items():
+        for code in model.objects.values_list("code", flat=True):
+            build_board(kind, code)
+            built += 1
+    return built
+
+
+def top(kind, code, limit):
+    """Return the ids of the ``limit`` best profiles of a leaderboard.
+
+    Returns ``None`` for codes that don't exist.
+    """
+    board = cache.get(board_key(kind, code))
+    if board is None:
+        if catalog.resolve(BOARD_MODELS[kind], [code])[1]:
+            return None
+        board = build_board(kind, code)
+    return [profile_id for _, _, profile_id in board["entries"][:limit]]
+
+
+@contextmanager
+def _board_lock(key):
+    lock_key = f"{key}:lock"
+    for _ in range(LOCK_ATTEMPTS):
+        if cache.add(lock_key, 1, LOCK_TIMEOUT):
+            try:
+                yield True
+            finally:
+                cache.delete(lock_key)
+            return
+        time.sleep(LOCK_WAIT)
+    yield False
+
+
+def _update_board(kind, code, profile_id, entry=None):
+    """Remove a profile from a board and insert ``entry`` if given."""
+    if code is None:
+        return
+    key = board_key(kind, code)
+    with _board_lock(key) as locked:
+        if not locked:
+            # Let the next reader rebuild it rather than risk a lost update.
+            cache.delete(key)
+            return
+        board = cache.get(key)
+        if board is None:
+            return
+        entries = [item for item in board["entries"] if item[2] != profile_id]
+        complete = board["complete"]
+        if entry is not None and (
+            complete or not entries or _sort_key(entry) < _sort_key(entries[-1])
+        ):
+            insort(entries, entry, key=_sort_key)
+        if len(entries) > BOARD_SIZE:
+            entries = entries[:BOARD_SIZE]
+            complete = False
+        if not complete and len(entries) < MAX_LIMIT:
+            build_board(kind, code)
+            return
+        cache.set(key, {"entries": entries, "complete": complete}, None)
+
+
+def _codes(model, ids):
+    return dict(model.objects.filter(pk__in=ids).values_list("pk", "code"))
+
+
+def profile_saved(profile, loaded, created):
+    """Move a saved profile within and across its leaderboards.
+
+    ``loaded`` holds the field values the profile was loaded with, if any.
+    """
+    _on_commit(cache.delete, card_key(profile.pk))
+    current = {field: getattr(profile, field) for field in TRACKED_FIELDS}
+    previous = {field: loaded.get(field, current[field]) for field in TRACKED_FIELDS}
+    if loaded and previous == current:
+        return
+
+    levels = _codes(SpecialistLevel, {previous["level_id"], current["level_id"]})
+    employments = _codes(
+        EmploymentType,
+        {previous["employment_id"], current["employment_id"]},
+    )
+    if previous["level_id"] != current["level_id"]:
+        _on_commit(_update_board, "level", levels.get(previous["level_id"]), profile.pk)
+    if previous["employment_id"] != current["employment_id"]:
+        _on_commit(
+            _update_board,
+            "employment",
+            employments.get(previous["employment_id"]),
+            profile.pk,
+        )
+
+    entry = _entry(profile.rating, profile.review_count, profile.pk)
+    boards = [
+        ("level", levels.get(current["level_id"])),
+        ("employment", employments.get(current["employment_id"])),
+    ]
+    if not created:
+        boards.extend(
+            ("technology", code)
+            for code in profile.technologies.values_list("code", flat=True)
+        )
+    for kind, code in boards:
+        _on_commit(_update_board, kind, code, profile.pk, entry)
+
+
+def technologies_changed(pairs, added):
+    """Add profiles to or remove them from technology leaderboards."""
+    profile_ids = {profile_id for profile_id, _ in pairs}
+    codes = _codes(Technology, {technology_id for _, technology_id in pairs})
+    entries = {}
+    if added:
+        entries = {
+            pk: _entry(rating, review_count, pk)
+            for rating, review_count, pk in Profile.objects.filter(
+                pk__in=profile_ids,
+            ).values_list("rating", "review_count", "pk")
+        }
+    _on_commit(cache.delete_many, [card_key(profile_id) for profile_id in profile_ids])
+    for profile_id, technology_id in pairs:
+        _on_commit(
+            _update_board,
+            "technology",
+            codes.get(technology_id),
+            profile_id,
+            entries.get(profile_id),
+        )
+
+
+def profile_boards(profile):
+    """Return the ``(kind, code)`` of every leaderboard a profile belongs to."""
+    boards = [
+        ("level", _codes(SpecialistLevel, {profile.level_id}).get(profile.level_id)),
+        (
+            "employment",
+            _codes(EmploymentType, {profile.employment_id}).get(profile.employment_id),
+        ),
+    ]
+    boards.extend(
+        ("technology", code)
+        for code in profile.technologies.values_list("code", flat=True)
+    )
+    return boards
+
+
+def drop_cards(profile_ids):
+    """Drop the cached cards of profiles whose displayed data changed."""
+    keys = [card_key(profile_id) for profile_id in profile_ids if profile_id]
+    if keys:
+        _on_commit(cache.delete_many, keys)
+
+
+def profile_deleted(profile_id, boards):
+    """Remove a deleted profile from the given leaderboards."""
+    _on_commit(cache.delete, card_key(profile_id))
+    for kind, code in boards:
+        _on_commit(_update_board, kind, code, profile_id)
+
+
+def profiles_rated(profile_ids):
+    """Drop the boards and cards of profiles whose stats were bulk updated.
+
+    The boards are rebuilt from the database on their next read.
+    """
+    profiles = Profile.objects.filter(pk__in=profile_ids)
+    keys = [card_key(profile_id) for profile_id in profile_ids]
+    for kind, lookup in BOARD_LOOKUPS.items():
+        codes = profiles.values_list(lookup, flat=True).distinct()
+        keys.extend(board_key(kind, code) for code in codes if code is not None)
+    _on_commit(cache.delete_many, keys)
+
+
+def reference_changing(kind, reference):
+    """Drop the boards and cards showing a reference row about to change.
+
+    Called before the row is saved or deleted, so the board of its stored
+    code and the profiles linked to it can still be found.
+    """
+    model = BOARD_MODELS[kind]
+    stored = model.objects.filter(pk=reference.pk).values_list("code", flat=True)
+    field = BOARD_LOOKUPS[kind].removesuffix("__code")
+    keys = [
+        card_key(profile_id)
+        for profile_id in Profile.all_objects.filter(
+            **{field: reference.pk},
+        ).values_list("pk", flat=True)
+    ]
+    keys.extend(board_key(kind, code) for code in {*stored, reference.code})
+    _on_commit(cache.delete_many, keys)
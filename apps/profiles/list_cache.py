@@ -0,0 +1,151 @@
+"""Tag-invalidated cache of profile list responses.
+
+Entries are keyed by the normalized query string and tagged with the
+technologies, levels and employment types they filter on or contain. Every
+tag has a random version token in the shared cache; an entry remembers the
+tokens it was stored with and is stale once any of them changed or expired.
+Invalidating a tag deletes its token when the transaction commits, so no
+entry is ever flushed directly.
+
+Entries not restricted to a technology, level or employment type also carry
+``ALL_PROFILES``, which every profile change invalidates.
+
+Entries go through ``responses``, so while one worker rebuilds an expired or
+invalidated entry the others keep serving the previous one.
+"""
+
+import hashlib
+import uuid
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+from it_specialist.caching import SingleFlightCache
+
+from .models import Profile
+
+responses = SingleFlightCache("profile-list")
+
+ALL_PROFILES = "profiles"
+# Query parameters mapped to the tag kind of the filter they apply.
+FILTER_TAGS = {
+    "technology": "technology",
+    "experience_technology": "technology",
+    "level": "level",
+    "employment": "employment",
+}
+
+
+def tag(kind, pk):
+    """Return the tag of a technology, level or employment type."""
+    return f"{kind}:{pk}"
+
+
+def _version_key(name):
+    return f"profile-list:tag:{name}"
+
+
+def cache_key(request):
+    """Return the cache key of a list request.
+
+    Empty parameters are dropped and both parameters and repeated values are
+    sorted, so equivalent query strings share an entry.
+    """
+    params = sorted(
+        (name, sorted(value for value in values if value))
+        for name, values in request.query_params.lists()
+    )
+    normalized = "&".join(
+        f"{name}={value}" for name, values in params for value in values
+    )
+    digest = hashlib.blake2b(
+        f"{request.get_host()}?{normalized}".encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f"profile-list:{digest}"
+
+
+def filter_tags(filterset):
+    """Return the tags of the categories a bound filterset restricts to."""
+    tags = set()
+    cleaned = filterset.form.cleaned_data
+    for param, kind in FILTER_TAGS.items():
+        value = cleaned.get(param)
+        if not value:
+            continue
+        objects = value if hasattr(value, "__iter__") else [value]
+        tags.update(tag(kind, obj.pk) for obj in objects)
+    return tags or {ALL_PROFILES}
+
+
+def content_tags(results):
+    """Return the tags of the categories listed in serialized profiles."""
+    tags = set()
+    for profile in results:
+        tags.update(tag("technology", item["id"]) for item in profile["technologies"])
+        for kind in ("level", "employment"):
+            if profile.get(kind):
+                tags.add(tag(kind, profile[kind]["id"]))
+    return tags
+
+
+def versions(tags):
+    """Return the current version token of every tag, creating missing ones."""
+    keys = {_version_key(name): name for name in tags}
+    found = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys.keys() - found.keys()}
+    for key, token in missing.items():
+        if not cache.add(key, token, None):
+            token = cache.get(key, token)
+        found[key] = token
+    return {keys[key]: token for key, token in found.items()}
+
+
+def is_current(entry):
+    """Return whether none of the tags of a stored entry changed since."""
+    current = cache.get_many([_version_key(name) for name in entry["versions"]])
+    return all(
+        current.get(_version_key(name)) == token
+        for name, token in entry["versions"].items()
+    )
+
+
+def invalidate(tags):
+    """Expire every entry carrying any of ``tags`` once the transaction commits.
+
+    Expiring earlier would let a concurrent request cache the rows it still
+    reads from before the commit under the new tag versions.
+    """
+    if tags:
+        keys = [_version_key(name) for name in tags]
+        transaction.on_commit(partial(cache.delete_many, keys))
+
+
+def profile_tags(profile_ids, extra=()):
+    """Return the tags of every list the given profiles may appear in.
+
+    ``extra`` holds ``(kind, pk)`` pairs to include as well, such as the
+    categories a profile was moved out of.
+    """
+    tags = {ALL_PROFILES}
+    tags.update(tag(kind, pk) for kind, pk in extra if pk is not None)
+    for level_id, employment_id in Profile.objects.filter(
+        pk__in=profile_ids,
+    ).values_list("level_id", "employment_id"):
+        tags.add(tag("level", level_id))
+        tags.add(tag("employment", employment_id))
+    tags.update(
+        tag("technology", technology_id)
+        for technology_id in Profile.technologies.through.objects.filter(
+            profile_id__in=profile_ids,
+        ).values_list("technology_id", flat=True)
+    )
+    return tags
+
+
+def profiles_changed(profile_ids, extra=()):
+    """Invalidate every list the given profiles may appear in."""
+    profile_ids = {pk for pk in profile_ids if pk is not None}
+    if profile_ids or extra:
+        invalidate(profile_tags(profile_ids, extra))
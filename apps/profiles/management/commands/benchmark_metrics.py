@@ -0,0 +1,62 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from it_specialist import metrics
+from it_specialist.middleware import MetricsMiddleware
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request overhead of MetricsMiddleware on a request "
+        "running a given number of queries, and the time to render /metrics."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=10,
+            help="Number of queries run by the benchmarked request",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=2000,
+            help="Number of requests timed per variant",
+        )
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        match = resolve(reverse("api:profiles:profile-list"))
+
+        def view(request):
+            with connection.cursor() as cursor:
+                for _ in range(options["queries"]):
+                    cursor.execute("SELECT 1")
+            request.resolver_match = match
+            return HttpResponse()
+
+        variants = {"bare": view, "metrics": MetricsMiddleware(view)}
+        timings = {}
+        for name, handler in variants.items():
+            seconds = timeit.timeit(
+                lambda handler=handler: handler(factory.get("/")),
+                number=options["repeat"],
+            )
+            timings[name] = seconds / options["repeat"] * 1_000_000
+            self.stdout.write(f"{name:<10} {timings[name]:>10.1f} us/request")
+        self.stdout.write(
+            f"{'overhead':<10} {timings['metrics'] - timings['bare']:>10.1f} "
+            "us/request",
+        )
+
+        seconds = timeit.timeit(
+            lambda: metrics.render(metrics.REQUEST_METRICS),
+            number=100,
+        )
+        self.stdout.write(f"{'render':<10} {seconds * 10_000:>10.1f} us/scrape")
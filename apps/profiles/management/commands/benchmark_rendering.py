@@ -0,0 +1,103 @@
+import gzip
+import random
+import timeit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.renderers import ORJSONRenderer
+from api.v1.profiles.serializers import ProfileDetailSerializer, ProfileListSerializer
+from api.v1.profiles.views import ProfileDetailView, ProfileListView
+from apps.profiles.sample_data import create_sample_dataset, rolled_back
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a sample dataset and compare the encode time and response size "
+        "of the profile list and detail payloads per renderer and encoding. "
+        "All sample data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            type=int,
+            default=200,
+            help="Number of sample profiles to create",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=200,
+            help="Number of encodings timed per payload and renderer",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed for the sample dataset",
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            sample = create_sample_dataset(
+                options["profiles"],
+                random.Random(options["seed"]),
+            )
+            payloads = self.payloads(sample)
+
+        renderers = {"drf json": JSONRenderer(), "orjson": ORJSONRenderer()}
+        for name, data in payloads.items():
+            self.stdout.write(self.style.MIGRATE_LABEL(name))
+            for renderer_name, renderer in renderers.items():
+                seconds = timeit.timeit(
+                    lambda renderer=renderer, data=data: renderer.render(data),
+                    number=options["repeat"],
+                )
+                micros = seconds / options["repeat"] * 1_000_000
+                self.stdout.write(f"  {renderer_name:<10} {micros:>10.1f} us/encode")
+            for encoding, size in self.sizes(renderers["orjson"].render(data)):
+                self.stdout.write(f"  {encoding:<10} {size:>10} bytes")
+
+    def payloads(self, sample):
+        """Return the serialized list page and detail payloads."""
+        request = Request(APIRequestFactory().get("/"))
+        context = {"request": request}
+        profiles = list(
+            ProfileListView.queryset.order_by("pk")[
+                : settings.REST_FRAMEWORK["PAGE_SIZE"]
+            ],
+        )
+        detail = ProfileDetailView.queryset.get(pk=sample["profiles"][0].pk)
+        return {
+            "profile list page": {
+                "count": len(sample["profiles"]),
+                "next": None,
+                "previous": None,
+                "results": ProfileListSerializer(
+                    profiles,
+                    many=True,
+                    context=context,
+                ).data,
+            },
+            "profile detail": ProfileDetailSerializer(detail, context=context).data,
+        }
+
+    def sizes(self, content):
+        """Yield ``(encoding, size)`` of the content as sent to clients."""
+        yield "identity", len(content)
+        yield "gzip", len(
+            gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL),
+        )
+        if brotli is not None:
+            yield "br", len(
+                brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY),
+            )
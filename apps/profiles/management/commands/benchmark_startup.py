@@ -0,0 +1,63 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+# Loads an entry point like a worker would before its first request and
+# reports the time taken and the peak resident set size in KiB (Linux).
+LOADER = """
+import importlib, json, resource, sys, time
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss": rss}))
+"""
+
+ENTRY_POINTS = {
+    "full": ("it_specialist.wsgi", "it_specialist.settings"),
+    "api": ("it_specialist.wsgi_api", "it_specialist.settings_api"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the load time and peak memory of a worker process using the "
+        "full settings and the API-only settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of processes started per entry point",
+        )
+
+    def load(self, module, settings_module):
+        environment = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+        output = subprocess.run(
+            [sys.executable, "-c", LOADER, module],
+            env=environment,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        return json.loads(output.splitlines()[-1])
+
+    def handle(self, *args, **options):
+        for name, (module, settings_module) in ENTRY_POINTS.items():
+            runs = [
+                self.load(module, settings_module) for _ in range(options["repeat"])
+            ]
+            seconds = statistics.median(run["seconds"] for run in runs)
+            rss = statistics.median(run["rss"] for run in runs)
+            self.stdout.write(
+                f"{name:<6} {module:<26} {seconds * 1000:>8.1f} ms "
+                f"{rss / 1024:>8.1f} MiB",
+            )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.profiles import similarity
+
+
+class Command(BaseCommand):
+    help = "Rebuild the MinHash LSH index used for similar specialists"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of profiles indexed per batch",
+        )
+
+    def handle(self, *args, **options):
+        indexed = similarity.rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} profiles"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from it_specialist import caching
+
+
+class Command(BaseCommand):
+    help = "Show hit, miss and coalescing counts of the stampede-protected caches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counts after showing them",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            "cache".ljust(24) + "".join(event.rjust(11) for event in caching.EVENTS),
+        )
+        for name, counts in caching.metrics().items():
+            self.stdout.write(
+                name.ljust(24)
+                + "".join(str(counts[event]).rjust(11) for event in caching.EVENTS),
+            )
+        if options["reset"]:
+            for instance in caching.SingleFlightCache.instances.values():
+                instance.reset_metrics()
+            self.stdout.write(self.style.SUCCESS("Cache metrics reset"))
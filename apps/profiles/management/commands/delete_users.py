@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.profiles import deletion
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Deactivate users and hide their profiles now, deleting their rows in "
+        "background jobs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("emails", nargs="+", help="Emails of the users")
+
+    def handle(self, *args, **options):
+        users = list(User.objects.filter(email__in=options["emails"]))
+        missing = set(options["emails"]) - {user.email for user in users}
+        if missing:
+            raise CommandError(f"Unknown users: {', '.join(sorted(missing))}")
+        for user in users:
+            deletion.delete_user(user)
+        self.stdout.write(
+            self.style.SUCCESS(f"Queued the deletion of {len(users)} users"),
+        )
@@ -0,0 +1,84 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.profiles import datasets
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic dataset of users and profiles with "
+        "projects, reviews, contacts and technology links for scale testing, "
+        "then recount the data derived from them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            type=int,
+            default=10_000,
+            help="Number of profiles to generate",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed, also part of the generated emails",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes inserting chunks, 1 on SQLite",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=datasets.CHUNK_SIZE,
+            help="Number of profiles generated and inserted per transaction",
+        )
+        parser.add_argument(
+            "--password",
+            default=None,
+            help="Password of every generated user, unusable if not given",
+        )
+        parser.add_argument(
+            "--no-recount",
+            action="store_true",
+            help="Skip recounting counters and rebuilding indexes afterwards",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if connection.vendor == "sqlite" and workers > 1:
+            # SQLite locks the whole database for every write.
+            self.stdout.write("SQLite allows a single writer, using 1 worker")
+            workers = 1
+
+        started = time.monotonic()
+        written = 0
+        for count in datasets.generate(
+            options["profiles"],
+            seed=options["seed"],
+            workers=workers,
+            chunk_size=options["chunk_size"],
+            password=options["password"],
+        ):
+            written += count
+            self.stdout.write(f"{written}/{options['profiles']} profiles")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {written} profiles in {time.monotonic() - started:.1f}s",
+            ),
+        )
+
+        if not options["no_recount"]:
+            started = time.monotonic()
+            datasets.recount()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Recounted derived data in {time.monotonic() - started:.1f}s",
+                ),
+            )
@@ -0,0 +1,67 @@
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.v1.profiles.serializers import ReviewImportSerializer
+from apps.profiles import reviews
+from apps.profiles.models import Review
+
+
+class Command(BaseCommand):
+    help = (
+        "Import reviews from a CSV or JSON lines file and update the rating of "
+        "every touched profile once. The import is atomic."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path, help="CSV or .jsonl file to import")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=reviews.BATCH_SIZE,
+            help="Number of reviews validated and inserted at once",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+
+        with path.open(newline="", encoding="utf-8") as file:
+            rows = self.read_rows(path, file)
+            created, profile_ids = reviews.ingest(
+                self.validated(rows, options["batch_size"]),
+                batch_size=options["batch_size"],
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created} reviews for {len(profile_ids)} profiles",
+            ),
+        )
+
+    def read_rows(self, path, file):
+        """Yield the rows of the file as dicts without empty values."""
+        if path.suffix == ".jsonl":
+            rows = (json.loads(line) for line in file if line.strip())
+        else:
+            rows = csv.DictReader(file)
+        for row in rows:
+            yield {key: value for key, value in row.items() if value not in ("", None)}
+
+    def validated(self, rows, batch_size):
+        """Yield unsaved reviews, validating ``batch_size`` rows at a time."""
+        line = 1
+        while batch := list(islice(rows, batch_size)):
+            serializer = ReviewImportSerializer(data=batch, many=True)
+            if not serializer.is_valid():
+                errors = {
+                    line + offset: error
+                    for offset, error in enumerate(serializer.errors)
+                    if error
+                }
+                raise CommandError(f"Invalid reviews by row: {errors}")
+            yield from (Review(**item) for item in serializer.validated_data)
+            line += len(batch)
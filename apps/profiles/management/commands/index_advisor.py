@@ -0,0 +1,228 @@
+import random
+import re
+from collections import Counter
+from http import HTTPStatus
+
+from django.contrib import admin
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.profiles.models import Profile
+from apps.profiles.sample_data import create_sample_dataset, rolled_back
+
+# Keeps boards and cards built from the rolled back sample data out of the
+# shared cache.
+ISOLATED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "index-advisor",
+    },
+}
+
+# Plan nodes worth reporting per backend; ``table`` is captured when known.
+PLAN_PATTERNS = {
+    "postgresql": [
+        ("sequential scan", re.compile(r"Seq Scan on (?P<table>\w+)")),
+        ("sort", re.compile(r"(?:^|->)\s*Sort\s+\(", re.MULTILINE)),
+    ],
+    "sqlite": [
+        (
+            "sequential scan",
+            re.compile(r"\bSCAN (?:TABLE )?(?P<table>\w+)\b(?! USING)"),
+        ),
+        ("sort", re.compile(r"USE TEMP B-TREE FOR (?:ORDER BY|DISTINCT)")),
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a sample dataset, capture the SQL of every v1 endpoint and admin "
+        "changelist, EXPLAIN it and report sequential scans and sorts. "
+        "All sample data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            type=int,
+            default=2000,
+            help="Number of sample profiles to create",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed for the sample dataset",
+        )
+
+    def handle(self, *args, **options):
+        patterns = PLAN_PATTERNS.get(connection.vendor)
+        if patterns is None:
+            self.stderr.write(
+                f"EXPLAIN parsing is not supported on {connection.vendor}",
+            )
+            return
+
+        totals = Counter()
+        # Cached list responses would hide the queries being inspected.
+        with rolled_back(), override_settings(
+            ALLOWED_HOSTS=["testserver"],
+            CACHES=ISOLATED_CACHES,
+            PROFILE_LIST_CACHE_TIMEOUT=0,
+        ):
+            sample = self.seed(options["profiles"], random.Random(options["seed"]))
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+            for name, path, data in self.targets(sample):
+                status_code, findings = self.inspect(sample, path, data, patterns)
+                totals.update(findings)
+                self.report(name, path, status_code, findings)
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("Summary"))
+        if not totals:
+            self.stdout.write(self.style.SUCCESS("No sequential scans or sorts found"))
+        for (issue, table), count in totals.most_common():
+            self.stdout.write(f"  {issue:<16} {table:<32} {count} queries")
+
+    def seed(self, profiles_count, rng):
+        """Create a sample dataset and return the objects used by the targets."""
+        sample = create_sample_dataset(profiles_count, rng)
+        staff = sample["staff"]
+        api_client = APIClient(raise_request_exception=False)
+        api_client.force_authenticate(staff)
+        admin_client = Client(raise_request_exception=False)
+        admin_client.force_login(staff)
+        # A profile in the middle of its deletion, for the progress endpoint.
+        deleted = sample["profiles"][-1]
+        Profile.all_objects.filter(pk=deleted.pk).update(deleted_at=timezone.now())
+        return {
+            "client": api_client,
+            "admin_client": admin_client,
+            "profile": sample["profiles"][0],
+            "profiles": sample["profiles"][:10],
+            "deleted": deleted,
+            "technology": sample["technologies"][0],
+            "level": sample["levels"][0],
+        }
+
+    def targets(self, sample):
+        """Yield ``(name, path, data)`` of every request to inspect.
+
+        Requests with ``data`` are posted as JSON, the others are GET requests.
+        """
+        profile = sample["profile"]
+        technology = sample["technology"]
+        list_url = reverse("api:profiles:profile-list")
+        yield "profile list", list_url, None
+        yield (
+            "profile list by technology",
+            f"{list_url}?technology={technology.code}",
+            None,
+        )
+        yield "profile list by level", f"{list_url}?level={sample['level'].code}", None
+        yield "profile list by rating", f"{list_url}?ordering=-rating", None
+        yield (
+            "profile list by project count",
+            f"{list_url}?ordering=-project_count",
+            None,
+        )
+        yield (
+            "profile detail",
+            reverse("api:profiles:profile-detail", args=[profile.pk]),
+            None,
+        )
+        ids = ",".join(str(sample_profile.pk) for sample_profile in sample["profiles"])
+        yield "profile batch", f"{reverse('api:profiles:profile-batch')}?ids={ids}", None
+        yield "profile changes", reverse("api:profiles:profile-changes"), None
+        yield (
+            "profile deletion",
+            reverse("api:profiles:profile-deletion", args=[sample["deleted"].pk]),
+            None,
+        )
+        yield "public profile list", reverse("api:profiles:public-profile-list"), None
+        yield (
+            "public profile detail",
+            reverse("api:profiles:public-profile-detail", args=[profile.pk]),
+            None,
+        )
+        yield (
+            "similar profiles",
+            reverse("api:profiles:profile-similar", args=[profile.pk]),
+            None,
+        )
+        yield (
+            "technology leaderboard",
+            reverse(
+                "api:profiles:profile-leaderboard",
+                args=["technology", technology.code],
+            ),
+            None,
+        )
+        technologies_url = reverse("api:profiles:technology-list")
+        yield "technology list", technologies_url, None
+        yield "technology autocomplete", f"{technologies_url}?prefix=sample", None
+        yield (
+            "review import",
+            reverse("api:profiles:review-import"),
+            [
+                {
+                    "profile": sample_profile.pk,
+                    "rating": 5,
+                    "text": "Sample review",
+                    "reviewer_name": "Reviewer",
+                }
+                for sample_profile in sample["profiles"]
+            ],
+        )
+        for model in admin.site._registry:
+            opts = model._meta
+            yield (
+                f"admin {opts.model_name} changelist",
+                reverse(f"admin:{opts.app_label}_{opts.model_name}_changelist"),
+                None,
+            )
+
+    def inspect(self, sample, path, data, patterns):
+        """Request ``path`` and return its status code and plan findings."""
+        client = sample["client"]
+        if path.startswith(reverse("admin:index")):
+            client = sample["admin_client"]
+        with CaptureQueriesContext(connection) as context:
+            if data is None:
+                response = client.get(path)
+            else:
+                response = client.post(path, data, format="json")
+
+        findings = Counter()
+        tables = set(connection.introspection.table_names())
+        prefix = connection.ops.explain_query_prefix()
+        for query in context.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}")
+                plan = "\n".join(" ".join(map(str, row)) for row in cursor.fetchall())
+            for issue, pattern in patterns:
+                for match in pattern.finditer(plan):
+                    table = match.groupdict().get("table", "-")
+                    if table == "-" or table in tables:
+                        findings[issue, table] += 1
+        return response.status_code, findings
+
+    def report(self, name, path, status_code, findings):
+        self.stdout.write(self.style.MIGRATE_LABEL(f"{name}: {path}"))
+        if status_code >= HTTPStatus.BAD_REQUEST:
+            self.stdout.write(self.style.WARNING(f"  responded with {status_code}"))
+        if not findings:
+            self.stdout.write("  ok")
+        for (issue, table), count in sorted(findings.items()):
+            self.stdout.write(f"  {issue:<16} {table:<32} x{count}")
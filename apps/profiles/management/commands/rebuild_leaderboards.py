@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.profiles import leaderboards
+
+
+class Command(BaseCommand):
+    help = "Rebuild technology, level and employment leaderboards in the cache"
+
+    def handle(self, *args, **options):
+        built = leaderboards.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {built} leaderboards"))
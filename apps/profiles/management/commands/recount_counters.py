@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.profiles import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute project and technology usage counters from scratch"
+
+    def handle(self, *args, **options):
+        counters.recount_all()
+        self.stdout.write(self.style.SUCCESS("Counters recomputed"))
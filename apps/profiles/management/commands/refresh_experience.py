@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from apps.profiles import experience
+
+
+class Command(BaseCommand):
+    help = "Bring ongoing technology experience up to date, or rebuild all of it"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute every row from the projects instead",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of profiles processed per batch",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            created = experience.rebuild_all(batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {created} rows"))
+            return
+        refreshed = experience.refresh_ongoing(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} profiles"))
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count_subquery(queryset, field):
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def backfill_counters(apps, schema_editor):
+    Profile = apps.get_model("profiles", "Profile")
+    Project = apps.get_model("profiles", "Project")
+    Technology = apps.get_model("profiles", "Technology")
+
+    Profile.objects.update(
+        project_count=_count_subquery(
+            Project.objects.exclude(status="cancelled"),
+            "profile",
+        ),
+    )
+    Technology.objects.update(
+        profile_count=_count_subquery(
+            Profile.technologies.through.objects.all(),
+            "technology",
+        ),
+        project_count=_count_subquery(
+            Project.technologies.through.objects.exclude(project__status="cancelled"),
+            "technology",
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0002_profile_signatures"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="technology",
+            name="profile_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="technology",
+            name="project_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Number of projects using the technology, cancelled excluded",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="profile",
+            name="project_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Number of projects, cancelled excluded",
+            ),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
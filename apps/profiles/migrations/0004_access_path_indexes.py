@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+from apps.profiles.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("profiles", "0003_usage_counters"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="profile",
+            index=models.Index(
+                fields=["-rating", "-review_count"],
+                name="profile_rating_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="project",
+            index=models.Index(
+                fields=["profile", "-start_date"],
+                name="project_profile_start_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="review",
+            index=models.Index(
+                fields=["profile", "-created_at"],
+                name="review_profile_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:21
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0004_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="rating",
+            field=models.DecimalField(
+                decimal_places=1,
+                default=0,
+                max_digits=3,
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(5),
+                ],
+            ),
+        ),
+    ]
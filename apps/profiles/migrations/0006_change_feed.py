@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0005_profile_rating_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("profile_id", models.PositiveIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(fields=["updated_at", "id"], name="profile_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="profiletombstone",
+            index=models.Index(
+                fields=["deleted_at", "id"],
+                name="tombstone_deleted_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0006_change_feed"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="deleted_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Set when deletion starts, hiding the profile",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:46
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_histograms(apps, schema_editor):
+    Profile = apps.get_model("profiles", "Profile")
+    Review = apps.get_model("profiles", "Review")
+
+    counts = {}
+    for rating in range(1, 6):
+        reviews = (
+            Review.objects.filter(profile=OuterRef("pk"), rating=rating)
+            .order_by()
+            .values("profile")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        counts[f"rating_{rating}_count"] = Coalesce(Subquery(reviews), Value(0))
+    Profile._base_manager.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0007_profile_deleted_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="rating_1_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="rating_2_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="rating_3_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="rating_4_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="rating_5_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_histograms, migrations.RunPython.noop),
+    ]
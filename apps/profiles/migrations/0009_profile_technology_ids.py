@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:17
+
+from django.db import migrations, models
+
+from apps.profiles.operations import CreateGinIndexOnPostgreSQL
+
+
+def backfill_technology_ids(apps, schema_editor):
+    Profile = apps.get_model("profiles", "Profile")
+
+    technology_ids = {}
+    for profile_id, technology_id in (
+        Profile.technologies.through.objects.order_by("technology_id")
+        .values_list("profile_id", "technology_id")
+        .iterator()
+    ):
+        technology_ids.setdefault(profile_id, []).append(technology_id)
+    for profile_id, ids in technology_ids.items():
+        Profile._base_manager.filter(pk=profile_id).update(technology_ids=ids)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("profiles", "0008_rating_histogram"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="technology_ids",
+            field=models.JSONField(
+                default=list,
+                editable=False,
+                help_text="Sorted ids of the technologies, kept in sync for filtering",
+            ),
+        ),
+        migrations.RunPython(
+            backfill_technology_ids,
+            migrations.RunPython.noop,
+            atomic=True,
+        ),
+        CreateGinIndexOnPostgreSQL(
+            model_name="profile",
+            name="profile_technology_ids_gin",
+            column="technology_ids",
+            opclass="jsonb_path_ops",
+        ),
+    ]
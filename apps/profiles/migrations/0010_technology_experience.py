@@ -0,0 +1,137 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:25
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def merged_days(ranges, today):
+    """Copy of ``apps.profiles.experience.merged_days`` as of this migration."""
+    ongoing = False
+    spans = []
+    for start, end in ranges:
+        if end is None or end > today:
+            ongoing = True
+            end = today
+        if start < end:
+            spans.append((start, end))
+
+    days = 0
+    current_start = current_end = None
+    for start, end in sorted(spans):
+        if current_end is not None and start <= current_end:
+            current_end = max(current_end, end)
+            continue
+        if current_end is not None:
+            days += (current_end - current_start).days
+        current_start, current_end = start, end
+    if current_end is not None:
+        days += (current_end - current_start).days
+    return days, ongoing
+
+
+def backfill_experience(apps, schema_editor):
+    Project = apps.get_model("profiles", "Project")
+    TechnologyExperience = apps.get_model("profiles", "TechnologyExperience")
+
+    ranges = defaultdict(list)
+    for profile_id, technology_id, start, end in (
+        Project.technologies.through.objects.exclude(project__status="cancelled")
+        .values_list(
+            "project__profile_id",
+            "technology_id",
+            "project__start_date",
+            "project__end_date",
+        )
+        .iterator()
+    ):
+        ranges[profile_id, technology_id].append((start, end))
+
+    today = timezone.localdate()
+    rows = []
+    for (profile_id, technology_id), spans in ranges.items():
+        days, ongoing = merged_days(spans, today)
+        rows.append(
+            TechnologyExperience(
+                profile_id=profile_id,
+                technology_id=technology_id,
+                days=days,
+                is_ongoing=ongoing,
+                refreshed_on=today,
+            ),
+        )
+    TechnologyExperience.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0009_profile_technology_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TechnologyExperience",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "days",
+                    models.PositiveIntegerField(
+                        help_text="Days with the technology as of the refresh date",
+                    ),
+                ),
+                (
+                    "is_ongoing",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether a project with the technology is running",
+                    ),
+                ),
+                (
+                    "refreshed_on",
+                    models.DateField(help_text="Date the days were counted up to"),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="technology_experience",
+                        to="profiles.profile",
+                    ),
+                ),
+                (
+                    "technology",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="experience",
+                        to="profiles.technology",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["technology", "-days"],
+                        name="experience_technology_days_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("is_ongoing", True)),
+                        fields=["refreshed_on"],
+                        name="experience_ongoing_idx",
+                    ),
+                ],
+                "unique_together": {("profile", "technology")},
+            },
+        ),
+        migrations.RunPython(backfill_experience, migrations.RunPython.noop),
+    ]
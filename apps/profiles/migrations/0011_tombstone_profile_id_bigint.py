@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0010_technology_experience"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profiletombstone",
+            name="profile_id",
+            field=models.PositiveBigIntegerField(),
+        ),
+    ]
@@ -1,9 +1,48 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, router, transaction
 
 from apps.users.models import User
 
 
+class TrackedChangesMixin:
+    """Remember loaded values so signal handlers can detect changes.
+
+    Values of ``locked_fields`` are re-read from the stored row under a row
+    lock before every update, so an outdated instance is compared against
+    the stored row rather than the one it was loaded from, and the same
+    change isn't counted twice.
+    """
+
+    locked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        if not self.locked_fields or self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        model = type(self)
+        using = kwargs.get("using") or router.db_for_write(model, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            stored = (
+                model._base_manager.using(using)
+                .select_for_update()
+                .filter(pk=self.pk)
+                .values(*self.locked_fields)
+                .first()
+            )
+            if stored is not None:
+                self._loaded_values = {
+                    **getattr(self, "_loaded_values", {}),
+                    **stored,
+                }
+            super().save(*args, **kwargs)
+
+
 class EmploymentType(models.Model):
     """Model representing different types of employment for specialists.
 
@@ -58,6 +97,12 @@ class Technology(models.Model):
     website = models.URLField(blank=True)
     icon = models.URLField(blank=True)
     is_active = models.BooleanField(default=True)
+    # Statistics
+    profile_count = models.PositiveIntegerField(default=0)
+    project_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of projects using the technology, cancelled excluded",
+    )
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -73,7 +118,15 @@ class Technology(models.Model):
         ordering = ["name"]
 
 
-class Profile(models.Model):
+class ProfileManager(models.Manager):
+    """Manager excluding profiles hidden while they are being deleted."""
+
+    def get_queryset(self):
+        """Return profiles whose deletion hasn't started."""
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class Profile(TrackedChangesMixin, models.Model):
     """Model representing a specialist's profile.
 
     This model stores comprehensive information about a specialist including
@@ -107,22 +160,91 @@ class Profile(models.Model):
     rating = models.DecimalField(
         max_digits=3,
         decimal_places=1,
+        default=0,
         validators=[MinValueValidator(0), MaxValueValidator(5)],
     )
     review_count = models.PositiveIntegerField(default=0)
-    project_count = models.PositiveIntegerField(default=0)
+    project_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of projects, cancelled excluded",
+    )
+    # Number of reviews per rating
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    technology_ids = models.JSONField(
+        default=list,
+        editable=False,
+        help_text="Sorted ids of the technologies, kept in sync for filtering",
+    )
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Set when deletion starts, hiding the profile",
+    )
+
+    objects = ProfileManager()
+    all_objects = models.Manager()
+
+    # Maintained by atomic updates elsewhere, never written back by save().
+    DERIVED_FIELDS = frozenset(
+        {
+            "rating",
+            "review_count",
+            "project_count",
+            "rating_1_count",
+            "rating_2_count",
+            "rating_3_count",
+            "rating_4_count",
+            "rating_5_count",
+            "technology_ids",
+            "deleted_at",
+        },
+    )
 
     def __str__(self):
         """Return string representation of the profile."""
         return f"{self.first_name} {self.last_name} - {self.position}"
 
+    def save(self, *args, **kwargs):
+        """Save the profile without overwriting its derived fields.
+
+        An instance loaded before a concurrent review or project change
+        would otherwise write back outdated counters. Pass ``update_fields``
+        to write derived fields explicitly.
+        """
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DERIVED_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         """Meta options for Profile model."""
 
         ordering = ["-rating", "-review_count"]
+        indexes = [
+            models.Index(
+                fields=["-rating", "-review_count"],
+                name="profile_rating_idx",
+            ),
+            models.Index(fields=["updated_at", "id"], name="profile_updated_idx"),
+        ]
 
 
 class SocialNetwork(models.Model):
@@ -226,7 +348,7 @@ class ContactInfo(models.Model):
         unique_together = ["profile", "contact_type", "value"]
 
 
-class Project(models.Model):
+class Project(TrackedChangesMixin, models.Model):
     """Model representing projects associated with profiles.
 
     This model stores information about projects that specialists have worked on
@@ -259,6 +381,9 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fields whose changes move counters, see TrackedChangesMixin.
+    locked_fields = ("profile_id", "status", "start_date", "end_date")
+
     def __str__(self):
         """Return string representation of the project."""
         return f"{self.title} - {self.profile.first_name} {self.profile.last_name}"
@@ -267,9 +392,15 @@ class Project(models.Model):
         """Meta options for Project model."""
 
         ordering = ["-start_date"]
+        indexes = [
+            models.Index(
+                fields=["profile", "-start_date"],
+                name="project_profile_start_idx",
+            ),
+        ]
 
 
-class Review(models.Model):
+class Review(TrackedChangesMixin, models.Model):
     """Model representing reviews for profiles.
 
     This model stores reviews and ratings given to specialists, optionally
@@ -303,6 +434,9 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fields whose changes move histogram counts, see TrackedChangesMixin.
+    locked_fields = ("profile_id", "rating")
+
     def __str__(self):
         """Return string representation of the review."""
         return f"Review for {self.profile.name} by {self.reviewer_name}"
@@ -311,6 +445,12 @@ class Review(models.Model):
         """Meta options for Review model."""
 
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["profile", "-created_at"],
+                name="review_profile_created_idx",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         """Override save method to update profile statistics."""
@@ -319,5 +459,122 @@ class Review(models.Model):
             all_ratings = list(self.profile.reviews.values_list("rating", flat=True))
             all_ratings.append(self.rating)
             self.profile.rating = sum(all_ratings) / len(all_ratings)
-            self.profile.save()
+            # Other statistics are updated atomically, don't overwrite them.
+            self.profile.save(update_fields=["rating", "review_count", "updated_at"])
         super().save(*args, **kwargs)
+
+
+class ProfileTombstone(models.Model):
+    """Model recording a deleted profile for the change feed.
+
+    Tombstones let clients syncing from the feed remove profiles they
+    mirrored, as deleted rows leave no trace in the profile table.
+    """
+
+    profile_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """Return string representation of the tombstone."""
+        return f"Profile {self.profile_id} deleted at {self.deleted_at}"
+
+    class Meta:
+        """Meta options for ProfileTombstone model."""
+
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_idx"),
+        ]
+
+
+class ProfileSignature(models.Model):
+    """Model storing the MinHash signature of a profile's technology set.
+
+    The technology set includes the profile's own technologies and the
+    technologies of its projects.
+    """
+
+    profile = models.OneToOneField(
+        Profile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="signature",
+    )
+    minhash = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """Return string representation of the signature."""
+        return f"Signature for profile {self.profile_id}"
+
+
+class ProfileSignatureBand(models.Model):
+    """Model representing an LSH bucket a profile signature falls into.
+
+    Profiles sharing a bucket in any band are candidates for similarity.
+    """
+
+    profile = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name="signature_bands",
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.CharField(max_length=16)
+
+    def __str__(self):
+        """Return string representation of the band bucket."""
+        return f"{self.band}:{self.bucket} - {self.profile_id}"
+
+    class Meta:
+        """Meta options for ProfileSignatureBand model."""
+
+        indexes = [models.Index(fields=["band", "bucket"])]
+        unique_together = ["profile", "band"]
+
+
+class TechnologyExperience(models.Model):
+    """Model representing the time a specialist worked with a technology.
+
+    Rows are materialized from the dates of the profile's projects using the
+    technology, with overlapping projects counted once. Ongoing experience
+    keeps growing after ``refreshed_on`` until the row is refreshed.
+    """
+
+    profile = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name="technology_experience",
+    )
+    technology = models.ForeignKey(
+        Technology,
+        on_delete=models.CASCADE,
+        related_name="experience",
+    )
+    days = models.PositiveIntegerField(
+        help_text="Days with the technology as of the refresh date",
+    )
+    is_ongoing = models.BooleanField(
+        default=False,
+        help_text="Whether a project with the technology is running",
+    )
+    refreshed_on = models.DateField(help_text="Date the days were counted up to")
+
+    def __str__(self):
+        """Return string representation of the experience."""
+        return f"{self.days} days of {self.technology_id} - {self.profile_id}"
+
+    class Meta:
+        """Meta options for TechnologyExperience model."""
+
+        indexes = [
+            models.Index(
+                fields=["technology", "-days"],
+                name="experience_technology_days_idx",
+            ),
+            models.Index(
+                fields=["refreshed_on"],
+                name="experience_ongoing_idx",
+                condition=models.Q(is_ongoing=True),
+            ),
+        ]
+        unique_together = ["profile", "technology"]
@@ -0,0 +1,95 @@
+from django.db import migrations
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """Create an index without blocking writes on PostgreSQL.
+
+    Other backends have no concurrent index builds and fall back to a regular
+    ``CREATE INDEX``. Migrations using it must set ``atomic = False``.
+    """
+
+    def describe(self):
+        """Return a description of the operation."""
+        return f"Concurrently {super().describe().lower()}"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(
+                app_label,
+                schema_editor,
+                from_state,
+                to_state,
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+        return None
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(
+                app_label,
+                schema_editor,
+                from_state,
+                to_state,
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+        return None
+
+
+class CreateGinIndexOnPostgreSQL(migrations.operations.base.Operation):
+    """Create a GIN index on PostgreSQL only, without blocking writes.
+
+    The index exists in the database only, not in the model state, so other
+    backends never see it. Migrations using it must set ``atomic = False``.
+    """
+
+    reversible = True
+
+    def __init__(self, model_name, name, column, opclass=""):
+        self.model_name = model_name
+        self.name = name
+        self.column = column
+        self.opclass = opclass
+
+    def deconstruct(self):
+        kwargs = {
+            "model_name": self.model_name,
+            "name": self.name,
+            "column": self.column,
+        }
+        if self.opclass:
+            kwargs["opclass"] = self.opclass
+        return self.__class__.__name__, [], kwargs
+
+    def describe(self):
+        """Return a description of the operation."""
+        return f"Create GIN index {self.name} on PostgreSQL"
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if schema_editor.connection.vendor != "postgresql" or not (
+            self.allow_migrate_model(schema_editor.connection.alias, model)
+        ):
+            return
+        quote = schema_editor.quote_name
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(self.name)} "
+            f"ON {quote(model._meta.db_table)} "
+            f"USING gin ({quote(self.column)} {self.opclass})",
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if schema_editor.connection.vendor != "postgresql" or not (
+            self.allow_migrate_model(schema_editor.connection.alias, model)
+        ):
+            return
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(self.name)}",
+        )
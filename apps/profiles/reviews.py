@@ -0,0 +1,112 @@
+"""Review statistics and bulk review ingestion.
+
+Every profile stores the number of its reviews per rating, adjusted with
+atomic F-expression updates as single reviews change, so that rating
+distributions are read with the profile itself.
+
+``Review.save`` recomputes the profile rating from every prior review, which
+makes row-by-row imports quadratic. ``ingest`` inserts reviews in batches and
+then recomputes the statistics of every touched profile once, with a single
+grouped aggregate per chunk of profiles.
+"""
+
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import (
+    Avg,
+    Count,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from . import changes, edge, leaderboards, list_cache
+from .models import Profile, Review
+
+BATCH_SIZE = 5000
+# Profiles updated per statement when refreshing statistics.
+STATS_CHUNK_SIZE = 1000
+RATINGS = range(1, 6)
+# Ratings mapped to the profile field counting reviews with that rating.
+HISTOGRAM_FIELDS = {rating: f"rating_{rating}_count" for rating in RATINGS}
+
+
+def _review_aggregate(aggregate):
+    reviews = (
+        Review.objects.filter(profile=OuterRef("pk"))
+        .order_by()
+        .values("profile")
+        .annotate(value=aggregate)
+        .values("value")
+    )
+    return Subquery(reviews)
+
+
+def adjust_histogram(profile_id, rating, delta):
+    """Atomically add ``delta`` to the count of a rating of a profile."""
+    if profile_id is not None and rating in HISTOGRAM_FIELDS:
+        field = HISTOGRAM_FIELDS[rating]
+        Profile.all_objects.filter(pk=profile_id).update(**{field: F(field) + delta})
+
+
+def histogram(profile):
+    """Return ``{rating: review count}`` of a profile."""
+    return {
+        rating: getattr(profile, field) for rating, field in HISTOGRAM_FIELDS.items()
+    }
+
+
+def refresh_stats(profile_ids):
+    """Recompute the rating, review count and histogram of the given profiles."""
+    profile_ids = sorted(set(profile_ids))
+    rating = DecimalField(max_digits=3, decimal_places=1)
+    now = timezone.now()
+    for start in range(0, len(profile_ids), STATS_CHUNK_SIZE):
+        chunk = profile_ids[start : start + STATS_CHUNK_SIZE]
+        Profile.objects.filter(pk__in=chunk).update(
+            rating=Coalesce(
+                Cast(_review_aggregate(Avg("rating")), rating),
+                Value(0, output_field=rating),
+            ),
+            review_count=Coalesce(_review_aggregate(Count("pk")), Value(0)),
+            **{
+                field: Coalesce(
+                    _review_aggregate(Count("pk", filter=Q(rating=rating))),
+                    Value(0),
+                )
+                for rating, field in HISTOGRAM_FIELDS.items()
+            },
+            updated_at=now,
+        )
+        # Bulk updates bypass signals, so drop what was derived from the old
+        # stats once the new ones are committed. Imports may commit long
+        # after ``now``, past where the change feed already is.
+        changes.touch_on_commit(chunk)
+        leaderboards.profiles_rated(chunk)
+        list_cache.invalidate(list_cache.profile_tags(chunk))
+        edge.profiles_changed(chunk, listed=True)
+
+
+def ingest(reviews, batch_size=BATCH_SIZE):
+    """Insert unsaved reviews and refresh the stats of their profiles.
+
+    ``reviews`` may be any iterable, it is consumed ``batch_size`` rows at a
+    time. The import is atomic. Returns the number of created reviews and the
+    set of touched profile ids.
+    """
+    reviews = iter(reviews)
+    created = 0
+    profile_ids = set()
+    with transaction.atomic():
+        while batch := list(islice(reviews, batch_size)):
+            Review.objects.bulk_create(batch)
+            created += len(batch)
+            profile_ids.update(review.profile_id for review in batch)
+        refresh_stats(profile_ids)
+    return created, profile_ids
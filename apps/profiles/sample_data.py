@@ -0,0 +1,148 @@
+"""Small rolled-back sample datasets for diagnostics commands.
+
+Rows are written with ``bulk_create``, which skips signal handlers, so the
+counters, stored technology ids, review stats, experience rows and
+similarity index are filled in here instead; query plans then see derived
+data shaped like the real one. Emails and reference codes carry a random
+run id, so they never collide with existing rows.
+"""
+
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from . import experience, reviews, similarity
+from .models import (
+    ContactInfo,
+    EmploymentType,
+    Profile,
+    Project,
+    Review,
+    SocialNetwork,
+    SpecialistLevel,
+    Technology,
+)
+
+PROJECTS_PER_PROFILE = 3
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def create_sample_dataset(profiles_count, rng):
+    """Create a sample dataset and return its reference rows and profiles."""
+    run = uuid.uuid4().hex[:8]
+    employments = EmploymentType.objects.bulk_create(
+        EmploymentType(name=f"Sample employment {run} {n}", code=f"emp_{run}_{n}")
+        for n in range(3)
+    )
+    levels = SpecialistLevel.objects.bulk_create(
+        SpecialistLevel(name=f"Sample level {run} {n}", code=f"lvl_{run}_{n}")
+        for n in range(4)
+    )
+    technologies = Technology.objects.bulk_create(
+        Technology(name=f"Sample technology {run} {n}", code=f"tech_{run}_{n}")
+        for n in range(40)
+    )
+    User = get_user_model()
+    staff = User.objects.create_user(
+        email=f"sample-{run}-staff@example.com",
+        is_active=True,
+        is_staff=True,
+        is_superuser=True,
+    )
+    users = User.objects.bulk_create(
+        User(email=f"sample-{run}-{n}@example.com", password="!")
+        for n in range(profiles_count)
+    )
+    profile_technologies = [rng.sample(technologies, 4) for _ in users]
+    profiles = Profile.objects.bulk_create(
+        Profile(
+            user=user,
+            first_name=f"First {n}",
+            last_name=f"Last {n}",
+            position="Engineer",
+            employment=rng.choice(employments),
+            level=rng.choice(levels),
+            experience=f"{rng.randint(1, 15)} years",
+            project_count=PROJECTS_PER_PROFILE,
+            technology_ids=sorted(technology.pk for technology in chosen),
+        )
+        for n, (user, chosen) in enumerate(zip(users, profile_technologies))
+    )
+    Profile.technologies.through.objects.bulk_create(
+        Profile.technologies.through(profile=profile, technology=technology)
+        for profile, chosen in zip(profiles, profile_technologies)
+        for technology in chosen
+    )
+    start = date(2015, 1, 1)
+    projects = Project.objects.bulk_create(
+        Project(
+            profile=profile,
+            title=f"Project {n}",
+            description="Sample project",
+            start_date=start + timedelta(days=rng.randint(0, 3000)),
+        )
+        for profile in profiles
+        for n in range(PROJECTS_PER_PROFILE)
+    )
+    project_technologies = [rng.sample(technologies, 3) for _ in projects]
+    Project.technologies.through.objects.bulk_create(
+        Project.technologies.through(project=project, technology=technology)
+        for project, chosen in zip(projects, project_technologies)
+        for technology in chosen
+    )
+    profile_counts = Counter(
+        technology.pk for chosen in profile_technologies for technology in chosen
+    )
+    project_counts = Counter(
+        technology.pk for chosen in project_technologies for technology in chosen
+    )
+    for technology in technologies:
+        technology.profile_count = profile_counts[technology.pk]
+        technology.project_count = project_counts[technology.pk]
+    Technology.objects.bulk_update(technologies, ["profile_count", "project_count"])
+    Review.objects.bulk_create(
+        Review(
+            profile=project.profile,
+            project=project,
+            rating=rng.randint(1, 5),
+            text="Sample review",
+            reviewer_name="Reviewer",
+        )
+        for project in projects
+    )
+    ContactInfo.objects.bulk_create(
+        ContactInfo(profile=profile, contact_type="email", value=f"{n}@example.com")
+        for n, profile in enumerate(profiles)
+    )
+    SocialNetwork.objects.bulk_create(
+        SocialNetwork(
+            profile=profile,
+            network_type="github",
+            url=f"https://github.com/{n}",
+        )
+        for n, profile in enumerate(profiles)
+    )
+
+    profile_ids = [profile.pk for profile in profiles]
+    reviews.refresh_stats(profile_ids)
+    experience.update_profiles(profile_ids)
+    similarity.update_profiles(profile_ids)
+
+    return {
+        "staff": staff,
+        "employments": employments,
+        "levels": levels,
+        "technologies": technologies,
+        "profiles": profiles,
+    }
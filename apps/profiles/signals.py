@@ -0,0 +1,349 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import (
+    catalog,
+    changes,
+    counters,
+    edge,
+    experience,
+    leaderboards,
+    list_cache,
+    reviews,
+    similarity,
+    technology_sets,
+)
+from .models import (
+    ContactInfo,
+    EmploymentType,
+    Profile,
+    ProfileTombstone,
+    Project,
+    Review,
+    SocialNetwork,
+    SpecialistLevel,
+    Technology,
+)
+
+# Reference models mapped to the list cache tag kind they are listed under.
+REFERENCE_TAGS = {
+    Technology: "technology",
+    SpecialistLevel: "level",
+    EmploymentType: "employment",
+}
+
+
+def _changed_pairs(sender, owner_field, instance, action, reverse, pk_set):
+    """Return ``(owner_id, technology_id)`` pairs changed by an m2m signal.
+
+    Rows about to be removed or cleared are read in the ``pre_*`` step because
+    the ``post_*`` signals don't say which of the given ids actually existed.
+    Returns ``None`` for the ``pre_*`` steps.
+    """
+    if reverse:
+        lookup = {"technology_id": instance.pk}
+        if pk_set is not None:
+            lookup[f"{owner_field}__in"] = pk_set
+    else:
+        lookup = {owner_field: instance.pk}
+        if pk_set is not None:
+            lookup["technology_id__in"] = pk_set
+
+    pending = instance.__dict__.setdefault("_m2m_pending", {})
+    if action in ("pre_remove", "pre_clear"):
+        pending[sender] = list(
+            sender.objects.filter(**lookup).values_list(owner_field, "technology_id"),
+        )
+        return None
+    if action in ("post_remove", "post_clear"):
+        return pending.pop(sender, [])
+    if action == "post_add":
+        if reverse:
+            return [(owner_id, instance.pk) for owner_id in pk_set]
+        return [(instance.pk, technology_id) for technology_id in pk_set]
+    return None
+
+
+def _deleted_directly(origin, model):
+    """Return whether a deletion started from ``model`` rather than a cascade."""
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+@receiver(m2m_changed, sender=Profile.technologies.through)
+def profile_technologies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep counters, indexes and caches in sync with profile technologies."""
+    pairs = _changed_pairs(sender, "profile_id", instance, action, reverse, pk_set)
+    if not pairs:
+        return
+    sign = 1 if action == "post_add" else -1
+    counters.adjust_technologies(
+        "profile_count",
+        [technology_id for _, technology_id in pairs],
+        sign,
+    )
+    profile_ids = {profile_id for profile_id, _ in pairs}
+    technology_sets.sync(profile_ids)
+    similarity.update_profiles(profile_ids)
+    leaderboards.technologies_changed(pairs, added=action == "post_add")
+    list_cache.profiles_changed(
+        profile_ids,
+        extra=[("technology", technology_id) for _, technology_id in pairs],
+    )
+    changes.touch(profile_ids)
+    edge.profiles_changed(profile_ids, listed=True)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, created, **kwargs):
+    """Keep leaderboards and cached lists in sync with a saved profile."""
+    loaded = {} if created else getattr(instance, "_loaded_values", {})
+    leaderboards.profile_saved(instance, loaded, created)
+    list_cache.profiles_changed(
+        {instance.pk},
+        extra=[
+            ("level", loaded.get("level_id")),
+            ("employment", loaded.get("employment_id")),
+        ],
+    )
+    edge.profiles_changed({instance.pk}, listed=True)
+    instance._loaded_values = {
+        **loaded,
+        **{field: getattr(instance, field) for field in leaderboards.TRACKED_FIELDS},
+    }
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def project_technologies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep counters, the similarity index and experience in sync with projects."""
+    pairs = _changed_pairs(sender, "project_id", instance, action, reverse, pk_set)
+    if not pairs:
+        return
+    if reverse:
+        projects = dict(
+            Project.objects.filter(
+                pk__in={project_id for project_id, _ in pairs},
+            ).values_list("pk", "status"),
+        )
+        counted = {pk for pk, status in projects.items() if counters.is_counted(status)}
+        profile_ids = Project.objects.filter(pk__in=projects).values_list(
+            "profile_id",
+            flat=True,
+        )
+    else:
+        counted = {instance.pk} if counters.is_counted(instance.status) else set()
+        profile_ids = {instance.profile_id}
+
+    sign = 1 if action == "post_add" else -1
+    counters.adjust_technologies(
+        "project_count",
+        [technology_id for project_id, technology_id in pairs if project_id in counted],
+        sign,
+    )
+    similarity.update_profiles(profile_ids)
+    listed = bool(experience.update_profiles(profile_ids))
+    changes.touch(profile_ids)
+    edge.profiles_changed(profile_ids, listed=listed)
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    """Update counters and reindex profiles on project status, owner or dates."""
+    loaded = {} if created else getattr(instance, "_loaded_values", {})
+    old_profile_id = None if created else loaded.get("profile_id", instance.profile_id)
+    old_counted = not created and counters.is_counted(
+        loaded.get("status", instance.status),
+    )
+    new_counted = counters.is_counted(instance.status)
+    listed = old_profile_id != instance.profile_id or old_counted != new_counted
+
+    if listed:
+        counters.adjust_profile_projects(old_profile_id, -int(old_counted))
+        counters.adjust_profile_projects(instance.profile_id, int(new_counted))
+        leaderboards.drop_cards({old_profile_id, instance.profile_id})
+        list_cache.profiles_changed({old_profile_id, instance.profile_id})
+    if not created and old_counted != new_counted:
+        counters.adjust_technologies(
+            "project_count",
+            counters.project_technology_ids(instance.pk),
+            1 if new_counted else -1,
+        )
+    if not created and old_profile_id != instance.profile_id:
+        similarity.update_profiles({old_profile_id, instance.profile_id})
+    if not created and (
+        old_profile_id != instance.profile_id
+        or old_counted != new_counted
+        or loaded.get("start_date", instance.start_date) != instance.start_date
+        or loaded.get("end_date", instance.end_date) != instance.end_date
+    ):
+        listed |= bool(
+            experience.update_profiles({old_profile_id, instance.profile_id}),
+        )
+    changes.touch({old_profile_id, instance.profile_id})
+    edge.profiles_changed({old_profile_id, instance.profile_id}, listed=listed)
+
+    instance._loaded_values = {
+        **loaded,
+        "profile_id": instance.profile_id,
+        "status": instance.status,
+        "start_date": instance.start_date,
+        "end_date": instance.end_date,
+    }
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleting(sender, instance, origin=None, **kwargs):
+    """Release the counters held by a project before its links are removed."""
+    if counters.is_counted(instance.status):
+        counters.adjust_profile_projects(instance.profile_id, -1)
+        leaderboards.drop_cards({instance.profile_id})
+        counters.adjust_technologies(
+            "project_count",
+            counters.project_technology_ids(instance.pk),
+            -1,
+        )
+        if _deleted_directly(origin, Project):
+            list_cache.profiles_changed({instance.profile_id})
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, origin=None, **kwargs):
+    """Drop the technologies of a deleted project from its signature and experience."""
+    if _deleted_directly(origin, Project):
+        similarity.update_profiles({instance.profile_id})
+        changed = experience.update_profiles({instance.profile_id})
+        changes.touch({instance.profile_id})
+        edge.profiles_changed(
+            {instance.profile_id},
+            listed=bool(changed) or counters.is_counted(instance.status),
+        )
+
+
+@receiver(pre_delete, sender=Profile)
+def profile_deleting(sender, instance, **kwargs):
+    """Release the technology counters held by a profile before deletion."""
+    counters.adjust_technologies(
+        "profile_count",
+        instance.technologies.values_list("pk", flat=True),
+        -1,
+    )
+    # Technology links are gone by post_delete, so collect the boards now.
+    instance._leaderboards = leaderboards.profile_boards(instance)
+    instance._list_cache_tags = list_cache.profile_tags({instance.pk})
+
+
+@receiver(post_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    """Drop a deleted profile from leaderboards and caches, leave a tombstone."""
+    leaderboards.profile_deleted(
+        instance.pk,
+        instance.__dict__.pop("_leaderboards", []),
+    )
+    list_cache.invalidate(instance.__dict__.pop("_list_cache_tags", ()))
+    edge.profiles_changed({instance.pk}, listed=True)
+    if instance.deleted_at is None:
+        # Profiles deleted in batches got their tombstone when hidden.
+        ProfileTombstone.objects.create(profile_id=instance.pk)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Update the rating histogram and expire caches of the reviewed profile."""
+    loaded = {} if created else getattr(instance, "_loaded_values", {})
+    old = (
+        loaded.get("profile_id", instance.profile_id),
+        loaded.get("rating", instance.rating),
+    )
+    new = (instance.profile_id, instance.rating)
+    if created:
+        reviews.adjust_histogram(*new, 1)
+    elif old != new:
+        reviews.adjust_histogram(*old, -1)
+        reviews.adjust_histogram(*new, 1)
+    instance._loaded_values = {
+        **loaded,
+        "profile_id": instance.profile_id,
+        "rating": instance.rating,
+    }
+
+    profile_ids = {old[0], new[0]}
+    leaderboards.drop_cards(profile_ids)
+    list_cache.profiles_changed(profile_ids)
+    changes.touch(profile_ids)
+    edge.profiles_changed(profile_ids, listed=created or old != new)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, origin=None, **kwargs):
+    """Update the rating histogram and expire caches of the reviewed profile."""
+    if _deleted_directly(origin, Review):
+        reviews.adjust_histogram(instance.profile_id, instance.rating, -1)
+        leaderboards.drop_cards({instance.profile_id})
+        list_cache.profiles_changed({instance.profile_id})
+        changes.touch({instance.profile_id})
+        edge.profiles_changed({instance.profile_id}, listed=True)
+
+
+@receiver([post_save, post_delete], sender=ContactInfo)
+@receiver([post_save, post_delete], sender=SocialNetwork)
+def profile_detail_changed(sender, instance, origin=None, **kwargs):
+    """Report a contact or social network change as a change of its profile."""
+    if origin is None or _deleted_directly(origin, sender):
+        changes.touch({instance.profile_id})
+        edge.profiles_changed({instance.profile_id})
+
+
+@receiver([pre_save, pre_delete], sender=Technology)
+@receiver([pre_save, pre_delete], sender=SpecialistLevel)
+@receiver([pre_save, pre_delete], sender=EmploymentType)
+def reference_changing(sender, instance, **kwargs):
+    """Drop the leaderboards and cards showing a reference row about to change."""
+    if instance.pk is not None:
+        leaderboards.reference_changing(REFERENCE_TAGS[sender], instance)
+
+
+@receiver(pre_delete, sender=Technology)
+def technology_deleting(sender, instance, **kwargs):
+    """Remember the profiles using a technology before its links cascade."""
+    instance._linked_profile_ids = {
+        *Profile.technologies.through.objects.filter(
+            technology_id=instance.pk,
+        ).values_list("profile_id", flat=True),
+        *Project.technologies.through.objects.filter(
+            technology_id=instance.pk,
+        ).values_list("project__profile_id", flat=True),
+    }
+
+
+def _reindex_profiles(profile_ids):
+    similarity.update_profiles(profile_ids)
+    technology_sets.sync(profile_ids)
+
+
+@receiver(post_delete, sender=Technology)
+def technology_deleted(sender, instance, **kwargs):
+    """Reindex the profiles whose links were cascaded without m2m signals."""
+    profile_ids = instance.__dict__.pop("_linked_profile_ids", set())
+    if profile_ids:
+        transaction.on_commit(partial(_reindex_profiles, profile_ids))
+
+
+@receiver([post_save, post_delete], sender=Technology)
+@receiver([post_save, post_delete], sender=SpecialistLevel)
+@receiver([post_save, post_delete], sender=EmploymentType)
+def reference_changed(sender, instance, **kwargs):
+    """Expire the catalog and the cached lists using a changed reference row."""
+    catalog.bump()
+    list_cache.invalidate({list_cache.tag(REFERENCE_TAGS[sender], instance.pk)})
+    edge.reference_changed(REFERENCE_TAGS[sender], instance.pk)
@@ -0,0 +1,157 @@
+"""MinHash LSH index over profile technology sets.
+
+Every profile gets a MinHash signature of the technologies it lists plus the
+technologies of its projects. Signatures are split into bands and each band is
+hashed into a bucket; profiles sharing at least one bucket are candidates, and
+candidates are ranked by the estimated Jaccard similarity of their signatures.
+"""
+
+import hashlib
+import random
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Profile, ProfileSignature, ProfileSignatureBand, Project
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# Upper bound of candidates scored per query, keeps lookups bounded for
+# very common technology stacks.
+MAX_CANDIDATES = 500
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# A fixed seed keeps signatures comparable across processes and rebuilds.
+_rng = random.Random(20241207)  # noqa: S311
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+
+
+def minhash(technology_ids):
+    """Return the MinHash signature of a set of technology ids."""
+    return [
+        min(((a * tech_id + b) % _PRIME) & _MAX_HASH for tech_id in technology_ids)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_buckets(signature):
+    """Return the bucket key of every band of a signature."""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS]
+        digest = hashlib.blake2b(
+            ",".join(map(str, rows)).encode(),
+            digest_size=8,
+        )
+        buckets.append(digest.hexdigest())
+    return buckets
+
+
+def estimate_similarity(left, right):
+    """Return the estimated Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(left, right)) / NUM_PERM
+
+
+def technology_sets(profile_ids):
+    """Return a mapping of profile id to its full technology id set."""
+    sets = {profile_id: set() for profile_id in profile_ids}
+    own = Profile.technologies.through.objects.filter(
+        profile_id__in=profile_ids,
+    ).values_list("profile_id", "technology_id")
+    from_projects = Project.technologies.through.objects.filter(
+        project__profile_id__in=profile_ids,
+    ).values_list("project__profile_id", "technology_id")
+    for profile_id, technology_id in [*own, *from_projects]:
+        sets[profile_id].add(technology_id)
+    return sets
+
+
+def _index_rows(technology_sets_by_profile):
+    signatures = []
+    bands = []
+    for profile_id, technology_ids in technology_sets_by_profile.items():
+        if not technology_ids:
+            continue
+        signature = minhash(technology_ids)
+        signatures.append(ProfileSignature(profile_id=profile_id, minhash=signature))
+        bands.extend(
+            ProfileSignatureBand(profile_id=profile_id, band=band, bucket=bucket)
+            for band, bucket in enumerate(band_buckets(signature))
+        )
+    return signatures, bands
+
+
+def update_profiles(profile_ids):
+    """Recompute the signatures and buckets of the given profiles."""
+    profile_ids = set(profile_ids)
+    if not profile_ids:
+        return
+    signatures, bands = _index_rows(technology_sets(profile_ids))
+    with transaction.atomic():
+        ProfileSignature.objects.filter(profile_id__in=profile_ids).delete()
+        ProfileSignatureBand.objects.filter(profile_id__in=profile_ids).delete()
+        ProfileSignature.objects.bulk_create(signatures)
+        ProfileSignatureBand.objects.bulk_create(bands)
+
+
+def rebuild_index(batch_size=1000):
+    """Rebuild the whole index and return the number of indexed profiles."""
+    with transaction.atomic():
+        ProfileSignature.objects.all().delete()
+        ProfileSignatureBand.objects.all().delete()
+
+    indexed = 0
+    last_id = 0
+    while True:
+        profile_ids = list(
+            Profile.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size],
+        )
+        if not profile_ids:
+            return indexed
+        signatures, bands = _index_rows(technology_sets(profile_ids))
+        with transaction.atomic():
+            ProfileSignature.objects.bulk_create(signatures)
+            ProfileSignatureBand.objects.bulk_create(bands)
+        indexed += len(signatures)
+        last_id = profile_ids[-1]
+
+
+def similar_profiles(profile_id, limit=10):
+    """Return up to ``limit`` ``(profile_id, similarity)`` pairs, best first."""
+    signature = (
+        ProfileSignature.objects.filter(profile_id=profile_id)
+        .values_list("minhash", flat=True)
+        .first()
+    )
+    if signature is None:
+        return []
+
+    lookup = Q()
+    for band, bucket in enumerate(band_buckets(signature)):
+        lookup |= Q(band=band, bucket=bucket)
+    # A profile matches once per shared band; more shared bands make a
+    # higher similarity likely, so those are scored first.
+    candidate_ids = list(
+        ProfileSignatureBand.objects.filter(lookup)
+        .exclude(profile_id=profile_id)
+        .values("profile_id")
+        .annotate(hits=Count("pk"))
+        .order_by("-hits", "profile_id")
+        .values_list("profile_id", flat=True)[:MAX_CANDIDATES],
+    )
+    candidates = ProfileSignature.objects.filter(
+        profile_id__in=candidate_ids,
+    ).values_list("profile_id", "minhash")
+
+    scored = [
+        (candidate_id, estimate_similarity(signature, candidate_signature))
+        for candidate_id, candidate_signature in candidates
+    ]
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:limit]
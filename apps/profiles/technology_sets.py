@@ -0,0 +1,80 @@
+"""Denormalized technology ids of profiles for multi-technology filters.
+
+Filtering through the ``technologies`` join returns a profile once per
+matching technology, which needs ``DISTINCT``, and "has all of these" takes
+a join per technology. ``Profile.technology_ids`` holds the sorted ids of
+the profile technologies instead, kept in sync by the m2m signal handler.
+
+On PostgreSQL the column is ``jsonb`` with a GIN ``jsonb_path_ops`` index
+and both modes are answered by ``@>`` containment: ``all`` as one
+containment of every id, ``any`` as an ``OR`` of single-id containments
+that the index serves with a bitmap OR. Other backends can't index JSON
+containment and filter with ``EXISTS`` subqueries on the link table, which
+don't duplicate rows either.
+"""
+
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef, Q
+
+from .models import Profile
+
+ANY = "any"
+ALL = "all"
+MODES = [(ANY, "Any of the technologies"), (ALL, "All of the technologies")]
+
+
+def current(profile_ids):
+    """Return the sorted technology ids of the given profiles by profile id."""
+    sets = {profile_id: [] for profile_id in profile_ids}
+    for profile_id, technology_id in (
+        Profile.technologies.through.objects.filter(profile_id__in=sets)
+        .order_by("technology_id")
+        .values_list("profile_id", "technology_id")
+    ):
+        sets[profile_id].append(technology_id)
+    return sets
+
+
+def sync(profile_ids):
+    """Store the current technology ids of the given profiles.
+
+    The profile rows are locked before the links are read, so a concurrent
+    change of the same profile waits and then reads the committed links
+    instead of overwriting them with its own stale view.
+    """
+    profile_ids = {pk for pk in profile_ids if pk is not None}
+    with transaction.atomic():
+        # Locked in id order so syncs of overlapping profiles can't deadlock.
+        locked = list(
+            Profile.all_objects.select_for_update()
+            .filter(pk__in=profile_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True),
+        )
+        for profile_id, technology_ids in current(locked).items():
+            Profile.all_objects.filter(pk=profile_id).update(
+                technology_ids=technology_ids,
+            )
+
+
+def filter_profiles(queryset, technology_ids, mode=ANY):
+    """Return profiles with any or all of the given technologies."""
+    technology_ids = sorted(set(technology_ids))
+    if not technology_ids:
+        return queryset
+    if connections[queryset.db].vendor == "postgresql":
+        if mode == ALL:
+            return queryset.filter(technology_ids__contains=technology_ids)
+        condition = Q()
+        for technology_id in technology_ids:
+            condition |= Q(technology_ids__contains=[technology_id])
+        return queryset.filter(condition)
+
+    links = Profile.technologies.through.objects.filter(profile_id=OuterRef("pk"))
+    if mode == ALL:
+        for technology_id in technology_ids:
+            queryset = queryset.filter(
+                Exists(links.filter(technology_id=technology_id)),
+            )
+        return queryset
+    return queryset.filter(Exists(links.filter(technology_id__in=technology_ids)))
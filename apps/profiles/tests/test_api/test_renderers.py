@@ -0,0 +1,53 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+
+pytest.importorskip("orjson")
+
+
+class TestORJSONRenderer:
+    def test_matches_drf_renderer(self):
+        data = {
+            "rating": Decimal("4.5"),
+            "created_at": datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.UTC),
+            "birth_date": datetime.date(2000, 1, 2),
+            "duration": datetime.timedelta(minutes=1),
+            "tags": ["python", "django"],
+            "name": "Иван",
+        }
+
+        rendered = json.loads(ORJSONRenderer().render(data))
+
+        assert rendered == json.loads(JSONRenderer().render(data))
+        assert rendered["created_at"] == "2024-01-02T03:04:05Z"
+
+    def test_indents_on_request(self):
+        rendered = ORJSONRenderer().render(
+            {"a": 1},
+            "application/json; indent=4",
+            {},
+        )
+
+        assert rendered == b'{\n  "a": 1\n}'
+
+    def test_renders_none_as_empty_body(self):
+        assert ORJSONRenderer().render(None) == b""
+
+
+class TestORJSONParser:
+    def test_parses_json(self):
+        parsed = ORJSONParser().parse(io.BytesIO('{"name": "Иван"}'.encode()))
+
+        assert parsed == {"name": "Иван"}
+
+    def test_rejects_malformed_json(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b"{"))
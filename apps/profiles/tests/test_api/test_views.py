@@ -0,0 +1,893 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.profiles.views import TechnologyListView
+from apps.jobs.models import Job
+from apps.jobs.worker import Worker
+from apps.profiles import leaderboards, list_cache
+from apps.profiles.tests.factories import (
+    ContactInfoFactory,
+    EmploymentTypeFactory,
+    ProfileFactory,
+    ProjectFactory,
+    ReviewFactory,
+    SpecialistLevelFactory,
+    TechnologyFactory,
+)
+from apps.users.tests.factories import UserFactory
+from it_specialist.purging import MemoryBackend
+from it_specialist.tracing import MemoryExporter
+
+# Constants for tests
+LARGE_STACK = 20
+BATCH_SIZE = 3
+MAX_BATCH_SIZE = 50
+TRACING = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 1.0,
+    "EXPORTER": "it_specialist.tracing.MemoryExporter",
+    "PROFILE_PARAM": "_profile",
+}
+
+
+class TestProfileSimilarView(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(UserFactory())
+        self.technologies = TechnologyFactory.create_batch(4)
+        self.profile = ProfileFactory(technologies=self.technologies)
+        self.twin = ProfileFactory(technologies=self.technologies)
+        self.url = reverse("api:profiles:profile-similar", args=[self.profile.pk])
+
+    def test_similar_profiles(self):
+        """Test similar profiles are returned with their similarity"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["id"], self.twin.pk)
+        self.assertEqual(response.data[0]["similarity"], 1.0)
+
+    def test_profile_without_technologies(self):
+        """Test a profile without technologies has no similar profiles"""
+        url = reverse("api:profiles:profile-similar", args=[ProfileFactory().pk])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_missing_profile(self):
+        """Test similar profiles of an unknown profile"""
+        url = reverse("api:profiles:profile-similar", args=[0])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestProfileListView(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(UserFactory())
+        self.url = reverse("api:profiles:profile-list")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_ordering_by_project_count(self):
+        """Test profiles can be ordered by the maintained project count"""
+        busy = ProfileFactory()
+        ProjectFactory.create_batch(2, profile=busy)
+        idle = ProfileFactory()
+
+        response = self.client.get(self.url, {"ordering": "-project_count"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [profile["id"] for profile in response.data["results"]]
+        self.assertEqual(ids, [busy.pk, idle.pk])
+        self.assertEqual(response.data["results"][0]["project_count"], 2)
+
+    def test_technology_modes(self):
+        """Test profiles can have any or all of several technologies"""
+        python, go = TechnologyFactory.create_batch(2)
+        both = ProfileFactory(technologies=[python, go])
+        pythonista = ProfileFactory(technologies=[python])
+        ProfileFactory()
+        params = {"technology": [python.code, go.code]}
+
+        any_ids = [
+            profile["id"]
+            for profile in self.client.get(self.url, params).data["results"]
+        ]
+        all_ids = [
+            profile["id"]
+            for profile in self.client.get(
+                self.url,
+                {**params, "technology_mode": "all"},
+            ).data["results"]
+        ]
+
+        self.assertCountEqual(any_ids, [both.pk, pythonista.pk])
+        self.assertEqual(all_ids, [both.pk])
+
+    def test_experience_filter_and_ordering(self):
+        """Test profiles can be filtered and ordered by technology experience"""
+        python = TechnologyFactory()
+        senior = ProfileFactory()
+        ProjectFactory(
+            profile=senior,
+            start_date=date(2019, 1, 1),
+            end_date=date(2023, 1, 1),
+            technologies=[python],
+        )
+        junior = ProfileFactory()
+        ProjectFactory(
+            profile=junior,
+            start_date=date(2022, 1, 1),
+            end_date=date(2023, 1, 1),
+            technologies=[python],
+        )
+        ProfileFactory()
+
+        response = self.client.get(
+            self.url,
+            {"experience_technology": python.code, "min_experience_years": 3},
+        )
+        ordered = self.client.get(
+            self.url,
+            {"experience_technology": python.code, "ordering": "-experience_days"},
+        )
+
+        self.assertEqual(
+            [profile["id"] for profile in response.data["results"]],
+            [senior.pk],
+        )
+        self.assertEqual(
+            [profile["id"] for profile in ordered.data["results"]][:2],
+            [senior.pk, junior.pk],
+        )
+
+    def test_experience_filter_needs_both_params(self):
+        """Test the experience filter rejects a technology or years given alone"""
+        python = TechnologyFactory()
+
+        no_years = self.client.get(self.url, {"experience_technology": python.code})
+        no_technology = self.client.get(self.url, {"min_experience_years": 3})
+
+        self.assertEqual(no_years.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("min_experience_years", no_years.data)
+        self.assertEqual(no_technology.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("experience_technology", no_technology.data)
+
+    def test_rating_histogram(self):
+        """Test profiles are listed with their rating distribution"""
+        profile = ProfileFactory()
+        ReviewFactory(profile=profile, rating=4)
+
+        response = self.client.get(self.url)
+
+        histograms = {
+            item["id"]: item["rating_histogram"] for item in response.data["results"]
+        }
+        self.assertEqual(
+            histograms[profile.pk],
+            {"1": 0, "2": 0, "3": 0, "4": 1, "5": 0},
+        )
+
+
+class TestProfileListCache(APITransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(UserFactory())
+        self.url = reverse("api:profiles:profile-list")
+        self.python = TechnologyFactory()
+        self.go = TechnologyFactory()
+        self.pythonista = ProfileFactory(technologies=[self.python])
+        self.gopher = ProfileFactory(technologies=[self.go])
+
+    def tearDown(self):
+        cache.clear()
+
+    def get_ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [profile["id"] for profile in response.data["results"]]
+
+    def test_repeated_request_served_from_cache(self):
+        """Test an equivalent query string is answered without queries"""
+        first = self.client.get(
+            f"{self.url}?technology={self.python.code}&technology={self.go.code}",
+        )
+        with self.assertNumQueries(0):
+            second = self.client.get(
+                f"{self.url}?technology={self.go.code}&technology={self.python.code}"
+                "&search=",
+            )
+        self.assertEqual(first.data, second.data)
+
+    def test_invalidated_on_commit(self):
+        """Test lists are only expired once the change is committed"""
+        entry = {
+            "versions": list_cache.versions(
+                {list_cache.tag("technology", self.python.pk)},
+            ),
+        }
+
+        with transaction.atomic():
+            self.pythonista.position = "Architect"
+            self.pythonista.save()
+            self.assertTrue(list_cache.is_current(entry))
+        self.assertFalse(list_cache.is_current(entry))
+
+    def test_profile_change_invalidates_its_technologies(self):
+        """Test a profile change expires lists of its technologies only"""
+        python_params = {"technology": self.python.code}
+        go_params = {"technology": self.go.code}
+        self.get_ids(python_params)
+        self.get_ids(go_params)
+
+        self.pythonista.position = "Architect"
+        self.pythonista.save()
+
+        with self.assertNumQueries(0):
+            self.get_ids(go_params)
+        response = self.client.get(self.url, python_params)
+        self.assertEqual(response.data["results"][0]["position"], "Architect")
+
+    def test_new_technology_link(self):
+        """Test linking a technology adds the profile to its cached list"""
+        params = {"technology": self.python.code}
+        self.assertEqual(self.get_ids(params), [self.pythonista.pk])
+
+        self.gopher.technologies.add(self.python)
+
+        self.assertCountEqual(
+            self.get_ids(params),
+            [self.pythonista.pk, self.gopher.pk],
+        )
+
+    def test_level_change(self):
+        """Test moving a profile to another level updates both level lists"""
+        old_level = self.gopher.level
+        new_level = SpecialistLevelFactory()
+        self.get_ids({"level": old_level.code})
+        self.get_ids({"level": new_level.code})
+
+        self.gopher.level = new_level
+        self.gopher.save()
+
+        self.assertEqual(self.get_ids({"level": old_level.code}), [])
+        self.assertEqual(self.get_ids({"level": new_level.code}), [self.gopher.pk])
+
+    def test_review_updates_unfiltered_list(self):
+        """Test a new review refreshes the rating in the unfiltered list"""
+        self.get_ids({})
+
+        ReviewFactory(profile=self.gopher, rating=5)
+
+        response = self.client.get(self.url)
+        ratings = {
+            profile["id"]: profile["review_count"]
+            for profile in response.data["results"]
+        }
+        self.assertEqual(ratings[self.gopher.pk], self.gopher.review_count)
+
+    def test_reference_rename(self):
+        """Test renaming a technology refreshes lists showing it"""
+        self.get_ids({})
+
+        self.go.name = "Golang"
+        self.go.save()
+
+        response = self.client.get(self.url)
+        names = {
+            technology["name"]
+            for profile in response.data["results"]
+            for technology in profile["technologies"]
+        }
+        self.assertIn("Golang", names)
+
+    def test_deleted_profile(self):
+        """Test a deleted profile disappears from cached lists"""
+        self.get_ids({})
+
+        self.gopher.delete()
+
+        self.assertEqual(self.get_ids({}), [self.pythonista.pk])
+
+
+class TestProfileWrite(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.client.force_authenticate(self.user)
+        self.level = SpecialistLevelFactory()
+        self.employment = EmploymentTypeFactory()
+        self.technologies = TechnologyFactory.create_batch(3)
+
+    def tearDown(self):
+        cache.clear()
+
+    def codes(self, technologies):
+        return [technology.code for technology in technologies]
+
+    def test_create_with_codes(self):
+        """Test a profile is created from reference codes for the current user"""
+        response = self.client.post(
+            reverse("api:profiles:profile-list"),
+            {
+                "first_name": "Anna",
+                "last_name": "Smith",
+                "position": "Backend developer",
+                "experience": "5 years",
+                "level": self.level.code,
+                "employment": self.employment.code,
+                "technologies": self.codes(self.technologies),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["level"]["code"], self.level.code)
+        self.assertCountEqual(
+            self.codes(self.user.profiles.get().technologies.all()),
+            self.codes(self.technologies),
+        )
+
+    def test_patch_technologies(self):
+        """Test a technology update replaces only the changed links"""
+        profile = ProfileFactory(user=self.user, technologies=self.technologies[:2])
+        url = reverse("api:profiles:profile-detail", args=[profile.pk])
+
+        response = self.client.patch(
+            url,
+            {"technologies": self.codes(self.technologies[1:])},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(
+            self.codes(profile.technologies.all()),
+            self.codes(self.technologies[1:]),
+        )
+
+    def test_patch_queries_do_not_grow_with_technologies(self):
+        """Test replacing a large stack costs as many queries as a small one"""
+        many = TechnologyFactory.create_batch(LARGE_STACK)
+        small = ProfileFactory(user=self.user, technologies=self.technologies[:1])
+        large = ProfileFactory(user=self.user, technologies=many[: LARGE_STACK // 2])
+        self.client.patch(
+            reverse("api:profiles:profile-detail", args=[small.pk]),
+            {"technologies": self.codes(self.technologies[1:])},
+            format="json",
+        )
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.patch(
+                reverse("api:profiles:profile-detail", args=[small.pk]),
+                {"technologies": self.codes(self.technologies[:1])},
+                format="json",
+            )
+        with CaptureQueriesContext(connection) as large_queries:
+            self.client.patch(
+                reverse("api:profiles:profile-detail", args=[large.pk]),
+                {"technologies": self.codes(many[LARGE_STACK // 2 :])},
+                format="json",
+            )
+
+        self.assertEqual(len(large_queries), len(small_queries))
+
+    def test_unknown_codes(self):
+        """Test unknown reference codes are rejected"""
+        profile = ProfileFactory(user=self.user)
+
+        response = self.client.patch(
+            reverse("api:profiles:profile-detail", args=[profile.pk]),
+            {"technologies": ["unknown"], "level": "unknown"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("technologies", response.data)
+        self.assertIn("level", response.data)
+
+
+class TestProfileBatchView(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(UserFactory())
+        self.url = reverse("api:profiles:profile-batch")
+        self.profiles = ProfileFactory.create_batch(BATCH_SIZE)
+
+    def get(self, ids):
+        return self.client.get(self.url, {"ids": ",".join(map(str, ids))})
+
+    def test_request_order_and_missing_ids(self):
+        """Test profiles come in request order with unknown ids reported"""
+        ids = [self.profiles[2].pk, 0, self.profiles[0].pk, self.profiles[2].pk]
+
+        response = self.get(ids)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [profile["id"] for profile in response.data["results"]],
+            [self.profiles[2].pk, self.profiles[0].pk],
+        )
+        self.assertEqual(response.data["missing"], [0])
+
+    def test_queries_do_not_grow_with_batch(self):
+        """Test a batch costs as many queries as a single profile"""
+        for profile in self.profiles:
+            ProjectFactory(profile=profile)
+            ContactInfoFactory(profile=profile)
+
+        with CaptureQueriesContext(connection) as single:
+            self.get([self.profiles[0].pk])
+        with CaptureQueriesContext(connection) as batch:
+            self.get([profile.pk for profile in self.profiles])
+
+        self.assertEqual(len(batch), len(single))
+
+    def test_invalid_ids(self):
+        """Test missing, malformed or too many ids are rejected"""
+        too_many = ",".join(str(pk) for pk in range(1, MAX_BATCH_SIZE + 2))
+        for ids in ("", "1,a", too_many):
+            with self.subTest(ids=ids):
+                response = self.client.get(self.url, {"ids": ids})
+                self.assertEqual(
+                    response.status_code,
+                    status.HTTP_400_BAD_REQUEST,
+                )
+
+
+@override_settings(PROFILE_CHANGES_SETTLE_SECONDS=0)
+class TestProfileChangesView(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(UserFactory())
+        self.url = reverse("api:profiles:profile-changes")
+        self.kept, self.deleted = ProfileFactory.create_batch(2)
+        self.deleted_pk = self.deleted.pk
+        self.deleted.delete()
+
+    def test_changes_and_tombstones(self):
+        """Test the feed lists changed profiles and deletions in order"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["change"], item["id"]) for item in response.data["results"]],
+            [("changed", self.kept.pk), ("deleted", self.deleted_pk)],
+        )
+        self.assertEqual(response.data["results"][0]["profile"]["id"], self.kept.pk)
+        self.assertIsNone(response.data["results"][1]["profile"])
+        self.assertFalse(response.data["has_more"])
+
+    def test_continue_from_token(self):
+        """Test a token returns only changes made after the previous page"""
+        token = self.client.get(self.url).data["token"]
+        ContactInfoFactory(profile=self.kept)
+
+        response = self.client.get(self.url, {"token": token})
+
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [self.kept.pk],
+        )
+
+    def test_updated_since(self):
+        """Test changes before updated_since are skipped"""
+        response = self.client.get(
+            self.url,
+            {"updated_since": "2999-01-01T00:00:00Z"},
+        )
+
+        self.assertEqual(response.data["results"], [])
+
+    def test_invalid_parameters(self):
+        """Test malformed tokens and dates are rejected"""
+        for params in ({"token": "garbage"}, {"updated_since": "yesterday"}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(
+                    response.status_code,
+                    status.HTTP_400_BAD_REQUEST,
+                )
+
+
+@override_settings(TRACING=TRACING)
+class TestTracing(APITestCase):
+    def setUp(self):
+        cache.clear()
+        MemoryExporter.traces.clear()
+        ProjectFactory(profile=ProfileFactory())
+        self.url = reverse("api:profiles:profile-list")
+
+    def tearDown(self):
+        cache.clear()
+        MemoryExporter.traces.clear()
+
+    def test_request_phases(self):
+        """Test the phases of a request are recorded as spans of its trace"""
+        self.client.force_authenticate(UserFactory())
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        (trace,) = MemoryExporter.traces
+        self.assertEqual(
+            {span.name for span in trace.spans},
+            {
+                "request",
+                "auth",
+                "filter",
+                "queryset",
+                "prefetch",
+                "serializer",
+                "renderer",
+            },
+        )
+        root = trace.spans[-1]
+        self.assertEqual(root.name, "request")
+        self.assertEqual(root.attributes["status"], status.HTTP_200_OK)
+        self.assertEqual(root.attributes["view"], "api:profiles:profile-list")
+
+    def test_detail_phases(self):
+        """Test the prefetch of a retrieved profile is recorded on its own"""
+        self.client.force_authenticate(UserFactory())
+        profile = ProfileFactory()
+        ProjectFactory(profile=profile)
+
+        response = self.client.get(
+            reverse("api:profiles:profile-detail", args=[profile.pk]),
+        )
+
+        self.assertEqual(len(response.data["projects"]), 1)
+        names = [span.name for span in MemoryExporter.traces[0].spans]
+        self.assertIn("prefetch", names)
+
+    def authorize(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+        )
+
+    def test_staff_profiling(self):
+        """Test a staff user gets the profiler report of a request"""
+        self.authorize(UserFactory(is_staff=True))
+
+        for profiler in ("deterministic", "sampling"):
+            with self.subTest(profiler):
+                response = self.client.get(self.url, {"_profile": profiler})
+
+                self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+                self.assertEqual(response["X-Profiled-Status"], "200")
+                self.assertIn(b"serializer", response.content)
+
+    def test_profiling_requires_staff(self):
+        """Test the profiling parameter is ignored for other users"""
+        self.authorize(UserFactory())
+
+        response = self.client.get(self.url, {"_profile": "deterministic"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Profiled-Status", response)
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class TestProfileDeletion(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(UserFactory())
+        self.profile = ProfileFactory()
+        ProjectFactory(profile=self.profile)
+        self.url = reverse("api:profiles:profile-detail", args=[self.profile.pk])
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_delete_hides_profile(self):
+        """Test a deleted profile disappears at once and reports progress"""
+        response = self.client.delete(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "deleting")
+        self.assertEqual(response.data["remaining"]["projects"], 1)
+        self.assertEqual(
+            self.client.get(self.url).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        listed = self.client.get(reverse("api:profiles:profile-list"))
+        self.assertEqual(listed.data["results"], [])
+
+    def test_progress(self):
+        """Test the progress of a deletion can be followed"""
+        url = reverse("api:profiles:profile-deletion", args=[self.profile.pk])
+        self.assertEqual(
+            self.client.get(url).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.client.delete(self.url)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "deleting")
+
+
+class TestReviewImportView(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(UserFactory(is_staff=True))
+        self.url = reverse("api:profiles:review-import")
+        self.profile = ProfileFactory(rating=0)
+
+    def review(self, **kwargs):
+        return {
+            "profile": self.profile.pk,
+            "rating": 4,
+            "text": "Great work",
+            "reviewer_name": "Anna",
+            **kwargs,
+        }
+
+    def test_import(self):
+        """Test a batch of reviews is created and the rating updated"""
+        response = self.client.post(
+            self.url,
+            [self.review(rating=5), self.review(rating=3)],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {"created": 2, "profiles": 1})
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.rating, Decimal("4.0"))
+        self.assertEqual(self.profile.review_count, 2)
+
+    def test_unknown_profile_and_foreign_project(self):
+        """Test rows with unknown profiles or foreign projects are rejected"""
+        foreign_project = ProjectFactory()
+
+        response = self.client.post(
+            self.url,
+            [
+                self.review(),
+                self.review(profile=0),
+                self.review(project=foreign_project.pk),
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("profile", response.data[1])
+        self.assertIn("project", response.data[2])
+        self.assertFalse(self.profile.reviews.exists())
+
+    def test_staff_only(self):
+        """Test regular users can't import reviews"""
+        self.client.force_authenticate(UserFactory())
+
+        response = self.client.post(self.url, [self.review()], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestLeaderboardView(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(UserFactory())
+        self.technology = TechnologyFactory()
+        self.low = ProfileFactory(rating=Decimal("2.0"), technologies=[self.technology])
+        self.high = ProfileFactory(
+            rating=Decimal("4.5"),
+            technologies=[self.technology],
+        )
+        self.url = reverse(
+            "api:profiles:profile-leaderboard",
+            args=["technology", self.technology.code],
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_leaderboard(self):
+        """Test the leaderboard lists profiles by rating"""
+        response = self.client.get(self.url, {"limit": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [card["id"] for card in response.data["results"]],
+            [self.high.pk],
+        )
+
+    def test_warm_leaderboard_skips_database(self):
+        """Test a warm leaderboard is served without queries"""
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(
+            [card["id"] for card in response.data["results"]],
+            [self.high.pk, self.low.pk],
+        )
+
+    def test_unknown_kind(self):
+        """Test an unknown leaderboard kind"""
+        url = reverse("api:profiles:profile-leaderboard", args=["city", "kyiv"])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unknown_code(self):
+        """Test an unknown leaderboard code isn't cached"""
+        url = reverse(
+            "api:profiles:profile-leaderboard",
+            args=["technology", "unknown"],
+        )
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(cache.get(leaderboards.board_key("technology", "unknown")))
+
+
+class TestTechnologyListView(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(UserFactory())
+        self.url = reverse("api:profiles:technology-list")
+        self.python = TechnologyFactory(name="Python", code="python")
+        self.go = TechnologyFactory(name="Go", code="go")
+        ProfileFactory(technologies=[self.python])
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_list(self):
+        """Test the catalog lists technologies with their usage counters"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counters = {
+            technology["code"]: technology["profiles"]
+            for technology in response.data["results"]
+        }
+        self.assertEqual(counters, {"go": 0, "python": 1})
+
+    def test_autocomplete(self):
+        """Test a prefix returns suggestions from the in-process index"""
+        self.client.get(self.url, {"prefix": "g"})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {"prefix": "py"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "id": self.python.pk,
+                    "name": "Python",
+                    "code": "python",
+                    "profiles": 1,
+                    "projects": 0,
+                },
+            ],
+        )
+
+    def test_autocomplete_limit_clamped(self):
+        """Test the suggestion limit is kept between 1 and the maximum"""
+        with mock.patch(
+            "apps.profiles.autocomplete.suggest",
+            return_value=[],
+        ) as suggest:
+            self.client.get(self.url, {"prefix": "py", "limit": 1000})
+            self.client.get(self.url, {"prefix": "py", "limit": 0})
+
+        self.assertEqual(
+            [call.args[1] for call in suggest.call_args_list],
+            [TechnologyListView.max_limit, 1],
+        )
+
+
+@override_settings(EDGE_CACHE={"BACKEND": "it_specialist.purging.MemoryBackend"})
+class TestPublicProfileViews(APITestCase):
+    def setUp(self):
+        MemoryBackend.outbox.clear()
+        self.technology = TechnologyFactory()
+        self.profile = ProfileFactory(technologies=[self.technology])
+        self.public = ContactInfoFactory(profile=self.profile, contact_type="email")
+        self.private = ContactInfoFactory(
+            profile=self.profile,
+            contact_type="phone",
+            is_public=False,
+        )
+
+    def test_list_is_cacheable(self):
+        """Test the anonymous list is cacheable and keyed by its profiles"""
+        response = self.client.get(reverse("api:profiles:public-profile-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("s-maxage", response["Cache-Control"])
+        keys = response["Surrogate-Key"].split()
+        self.assertIn("profiles", keys)
+        self.assertIn(f"profile:{self.profile.pk}", keys)
+        self.assertIn(f"technology:{self.technology.pk}", keys)
+
+    def test_detail_shows_public_contacts_only(self):
+        """Test private contacts are left out of the public profile"""
+        url = reverse("api:profiles:public-profile-detail", args=[self.profile.pk])
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [contact["id"] for contact in response.data["contacts"]],
+            [self.public.pk],
+        )
+        self.assertNotIn("is_public", response.data["contacts"][0])
+
+    def test_credentials_ignored(self):
+        """Test an Authorization header neither fails nor changes the response"""
+        url = reverse("api:profiles:public-profile-detail", args=[self.profile.pk])
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_profile_not_cached(self):
+        """Test error responses carry no caching headers"""
+        url = reverse("api:profiles:public-profile-detail", args=[0])
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header("Surrogate-Key"))
+
+    def test_profile_change_publishes_purge(self):
+        """Test saving a profile purges its pages once committed"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.position = "Architect"
+            self.profile.save()
+
+        self.assertEqual(
+            MemoryBackend.outbox,
+            [[f"profile:{self.profile.pk}", "profiles"]],
+        )
+
+    def test_contact_change_publishes_purge(self):
+        """Test hiding a contact purges the pages of its profile"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.public.is_public = False
+            self.public.save()
+
+        self.assertEqual(MemoryBackend.outbox, [[f"profile:{self.profile.pk}"]])
+
+    def test_remote_purges_queued(self):
+        """Test purges for a caching proxy are sent by a background job"""
+        with override_settings(
+            EDGE_CACHE={
+                "BACKEND": "it_specialist.purging.HTTPBackend",
+                "OPTIONS": {"url": "http://127.0.0.1:9/"},
+            },
+        ):
+            self.profile.position = "Architect"
+            self.profile.save()
+
+        job = Job.objects.get(task="profiles.purge_edge")
+        self.assertEqual(
+            job.payload,
+            {"keys": [f"profile:{self.profile.pk}", "profiles"]},
+        )
+        Worker(["default"]).run(burst=True)
+        self.assertEqual(
+            MemoryBackend.outbox,
+            [[f"profile:{self.profile.pk}", "profiles"]],
+        )
@@ -0,0 +1,61 @@
+import pytest
+
+from apps.profiles import autocomplete
+
+from .factories import ProfileFactory, TechnologyFactory
+
+# Constants for tests
+LIMIT = 2
+
+
+@pytest.mark.django_db
+class TestSuggest:
+    def test_prefix_of_name_or_code(self):
+        python = TechnologyFactory(name="Python", code="py")
+        TechnologyFactory(name="Go", code="golang")
+        pydantic = TechnologyFactory(name="Pydantic", code="pydantic")
+
+        suggestions = autocomplete.suggest("PY")
+
+        assert {suggestion["id"] for suggestion in suggestions} == {
+            python.pk,
+            pydantic.pk,
+        }
+
+    def test_most_popular_first(self):
+        rare, popular, _ = (
+            TechnologyFactory(name=name, code=name.lower())
+            for name in ("Django", "Docker", "Dart")
+        )
+        ProfileFactory.create_batch(2, technologies=[popular])
+        ProfileFactory(technologies=[rare])
+
+        suggestions = autocomplete.suggest("d", limit=LIMIT)
+
+        assert [suggestion["id"] for suggestion in suggestions] == [
+            popular.pk,
+            rare.pk,
+        ]
+        assert suggestions[0]["profiles"] == LIMIT
+
+    def test_warm_index_skips_database(self, django_assert_num_queries):
+        TechnologyFactory(name="Rust", code="rust")
+        autocomplete.suggest("r")
+
+        with django_assert_num_queries(0):
+            assert len(autocomplete.suggest("ru")) == 1
+
+    def test_new_technology_rebuilds_index(self, django_capture_on_commit_callbacks):
+        autocomplete.suggest("k")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            kotlin = TechnologyFactory(name="Kotlin", code="kotlin")
+
+        assert [suggestion["id"] for suggestion in autocomplete.suggest("k")] == [
+            kotlin.pk,
+        ]
+
+    def test_inactive_technologies_hidden(self):
+        TechnologyFactory(name="Perl", code="perl", is_active=False)
+
+        assert autocomplete.suggest("perl") == []
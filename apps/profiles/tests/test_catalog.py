@@ -0,0 +1,43 @@
+import pytest
+
+from apps.profiles import catalog
+from apps.profiles.models import Technology
+
+from .factories import TechnologyFactory
+
+
+@pytest.mark.django_db
+class TestResolve:
+    def test_resolve_from_warm_catalog(self, django_assert_num_queries):
+        python, go = TechnologyFactory.create_batch(2)
+        catalog.entries(Technology)
+
+        with django_assert_num_queries(0):
+            instances, unknown = catalog.resolve(Technology, [go.code, python.code])
+
+        assert instances == [go, python]
+        assert instances[0].name == go.name
+        assert unknown == []
+
+    def test_unknown_codes(self):
+        python = TechnologyFactory()
+
+        instances, unknown = catalog.resolve(Technology, [python.code, "cobol"])
+
+        assert instances == [python]
+        assert unknown == ["cobol"]
+
+    def test_rename_bumps_version_on_commit(self, django_capture_on_commit_callbacks):
+        python = TechnologyFactory()
+        before = catalog.version()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            python.name = "CPython"
+            python.save()
+            assert catalog.version() == before
+        for callback in callbacks:
+            callback()
+
+        assert catalog.version() != before
+        instances, _ = catalog.resolve(Technology, [python.code])
+        assert instances[0].name == "CPython"
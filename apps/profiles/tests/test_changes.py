@@ -0,0 +1,100 @@
+import pytest
+
+from apps.profiles import changes
+from apps.profiles.models import ProfileTombstone
+
+from .factories import (
+    ContactInfoFactory,
+    ProfileFactory,
+    ProjectFactory,
+    ReviewFactory,
+    TechnologyFactory,
+)
+
+# Constants for tests
+PROFILES = 5
+PAGE_SIZE = 2
+
+
+@pytest.fixture(autouse=True)
+def _settled(settings):
+    settings.PROFILE_CHANGES_SETTLE_SECONDS = 0
+
+
+def _read_all(position, limit=PAGE_SIZE):
+    read = []
+    while True:
+        page, position = changes.page(position, limit)
+        read.extend((kind, pk) for kind, _, pk, _ in page)
+        if len(page) < limit:
+            return read, position
+
+
+@pytest.mark.django_db
+class TestTouch:
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda profile: ContactInfoFactory(profile=profile),
+            lambda profile: ProjectFactory(profile=profile),
+            lambda profile: ReviewFactory(profile=profile),
+            lambda profile: profile.technologies.add(TechnologyFactory()),
+        ],
+    )
+    def test_child_change_touches_profile(self, change):
+        profile = ProfileFactory()
+        before = profile.updated_at
+
+        change(profile)
+
+        profile.refresh_from_db()
+        assert profile.updated_at > before
+
+    def test_deletion_leaves_tombstone(self):
+        profile = ProfileFactory()
+        pk = profile.pk
+
+        profile.delete()
+
+        assert ProfileTombstone.objects.filter(profile_id=pk).exists()
+
+
+@pytest.mark.django_db
+class TestPage:
+    def test_pages_cover_every_change_once(self):
+        profiles = ProfileFactory.create_batch(PROFILES)
+        deleted_pk = profiles[0].pk
+        profiles[0].delete()
+        profiles[1].position = "Architect"
+        profiles[1].save()
+
+        read, _ = _read_all(changes.start())
+
+        assert read == [
+            *((changes.CHANGED, profile.pk) for profile in profiles[2:]),
+            (changes.DELETED, deleted_pk),
+            (changes.CHANGED, profiles[1].pk),
+        ]
+
+    def test_resume_from_token(self):
+        ProfileFactory.create_batch(PROFILES)
+        _, position = _read_all(changes.start())
+        token = changes.encode_token(position)
+
+        profile = ProfileFactory()
+        page, _ = changes.page(changes.decode_token(token), PAGE_SIZE)
+
+        assert [pk for _, _, pk, _ in page] == [profile.pk]
+
+    def test_unsettled_changes_held_back(self, settings):
+        settings.PROFILE_CHANGES_SETTLE_SECONDS = 60
+        ProfileFactory()
+
+        page, position = changes.page(changes.start(), PAGE_SIZE)
+
+        assert page == []
+        assert position == changes.start()
+
+    def test_invalid_token(self):
+        with pytest.raises(changes.InvalidToken):
+            changes.decode_token("not a token")
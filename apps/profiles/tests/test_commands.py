@@ -0,0 +1,181 @@
+import json
+import random
+import re
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.profiles import leaderboards, reviews
+from apps.profiles.models import (
+    Profile,
+    ProfileSignature,
+    Technology,
+    TechnologyExperience,
+)
+from apps.profiles.sample_data import PROJECTS_PER_PROFILE, create_sample_dataset
+
+from .factories import ProfileFactory, ProjectFactory, TechnologyFactory
+
+# Constants for tests
+IMPORTED_REVIEWS = 2
+IMPORTED_RATING = Decimal("4.0")
+GENERATED_PROFILES = 25
+
+
+@pytest.mark.django_db
+class TestIndexAdvisor:
+    def test_reports_every_target_and_rolls_back(self):
+        out = StringIO()
+        call_command("index_advisor", profiles=5, stdout=out)
+
+        output = out.getvalue()
+        assert "profile list: /api/v1/profiles/" in output
+        for name in (
+            "profile batch",
+            "profile changes",
+            "profile deletion",
+            "public profile list",
+            "technology list",
+            "review import",
+        ):
+            assert f"{name}: /api/v1/profiles/" in output
+        assert "admin profile changelist" in output
+        assert "Summary" in output
+        assert not Profile.objects.exists()
+
+    def test_leaves_shared_cache_alone(self):
+        cache.clear()
+        out = StringIO()
+
+        call_command("index_advisor", profiles=5, stdout=out)
+
+        code = re.search(r"/leaderboards/technology/(\w+)/", out.getvalue())[1]
+        assert cache.get(leaderboards.board_key("technology", code)) is None
+
+    def test_derived_data_filled(self):
+        sample = create_sample_dataset(5, random.Random(0))
+
+        profile = Profile.objects.get(pk=sample["profiles"][0].pk)
+        assert profile.technology_ids
+        assert profile.project_count == PROJECTS_PER_PROFILE
+        assert profile.review_count == PROJECTS_PER_PROFILE
+        assert TechnologyExperience.objects.filter(profile=profile).exists()
+        assert ProfileSignature.objects.filter(profile=profile).exists()
+        assert Technology.objects.filter(profile_count__gt=0).exists()
+        # Every run gets its own emails and codes.
+        create_sample_dataset(5, random.Random(0))
+
+
+@pytest.mark.django_db
+class TestBenchmarkRendering:
+    def test_reports_every_payload_and_rolls_back(self):
+        out = StringIO()
+        call_command("benchmark_rendering", profiles=5, repeat=1, stdout=out)
+
+        output = out.getvalue()
+        assert "profile list page" in output
+        assert "profile detail" in output
+        assert "orjson" in output
+        assert "gzip" in output
+        assert not Profile.objects.exists()
+
+
+@pytest.mark.django_db
+class TestGenerateDataset:
+    def test_generates_consistent_profiles(self):
+        out = StringIO()
+
+        call_command(
+            "generate_dataset",
+            profiles=GENERATED_PROFILES,
+            chunk_size=10,
+            workers=1,
+            stdout=out,
+        )
+
+        assert Profile.objects.count() == GENERATED_PROFILES
+        assert "Recounted derived data" in out.getvalue()
+        generated = {
+            profile.pk: (
+                profile.rating,
+                profile.review_count,
+                reviews.histogram(profile),
+            )
+            for profile in Profile.objects.all()
+        }
+        reviews.refresh_stats(generated)
+        recounted = {
+            profile.pk: (
+                profile.rating,
+                profile.review_count,
+                reviews.histogram(profile),
+            )
+            for profile in Profile.objects.all()
+        }
+        assert generated == recounted
+        assert sum(Technology.objects.values_list("profile_count", flat=True)) == (
+            Profile.technologies.through.objects.count()
+        )
+
+
+@pytest.mark.django_db
+class TestRefreshExperience:
+    def test_rebuild(self):
+        ProjectFactory(technologies=[TechnologyFactory()])
+        TechnologyExperience.objects.all().delete()
+        out = StringIO()
+        call_command("refresh_experience", rebuild=True, stdout=out)
+
+        assert "Rebuilt 1 rows" in out.getvalue()
+        assert TechnologyExperience.objects.count() == 1
+
+
+class TestCacheMetrics:
+    def test_lists_profile_list_cache(self):
+        out = StringIO()
+        call_command("cache_metrics", stdout=out)
+
+        assert "profile-list" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportReviews:
+    def test_imports_csv(self, tmp_path):
+        profile = ProfileFactory(rating=0)
+        path = tmp_path / "reviews.csv"
+        path.write_text(
+            "profile,project,rating,text,reviewer_name,is_verified\n"
+            f"{profile.pk},,5,Great,Anna,true\n"
+            f"{profile.pk},,3,Good,Boris,false\n",
+        )
+        out = StringIO()
+
+        call_command("import_reviews", str(path), stdout=out)
+
+        profile.refresh_from_db()
+        assert profile.review_count == IMPORTED_REVIEWS
+        assert profile.rating == IMPORTED_RATING
+        assert "Imported 2 reviews for 1 profiles" in out.getvalue()
+
+    def test_invalid_rows_roll_back(self, tmp_path):
+        profile = ProfileFactory()
+        path = tmp_path / "reviews.jsonl"
+        path.write_text(
+            json.dumps(
+                {"profile": profile.pk, "rating": 5, "text": "-", "reviewer_name": "A"},
+            )
+            + "\n"
+            + json.dumps(
+                {"profile": profile.pk, "rating": 9, "text": "-", "reviewer_name": "B"},
+            )
+            + "\n",
+        )
+
+        with pytest.raises(CommandError, match="row"):
+            call_command("import_reviews", str(path), batch_size=1)
+
+        assert not profile.reviews.exists()
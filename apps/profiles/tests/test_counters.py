@@ -0,0 +1,134 @@
+import pytest
+
+from apps.profiles import counters
+from apps.profiles.models import Profile, Project, Technology
+
+from .factories import ProfileFactory, ProjectFactory, TechnologyFactory
+
+# Constants for tests
+TECHNOLOGIES_COUNT = 3
+PROJECTS_COUNT = 2
+
+
+def _refresh(*instances):
+    for instance in instances:
+        instance.refresh_from_db()
+
+
+@pytest.mark.django_db
+class TestProjectCount:
+    def test_create_and_delete(self):
+        profile = ProfileFactory()
+        projects = ProjectFactory.create_batch(PROJECTS_COUNT, profile=profile)
+        _refresh(profile)
+        assert profile.project_count == PROJECTS_COUNT
+
+        projects[0].delete()
+        _refresh(profile)
+        assert profile.project_count == PROJECTS_COUNT - 1
+
+    def test_status_change(self):
+        project = ProjectFactory()
+        project.status = "cancelled"
+        project.save()
+        _refresh(project.profile)
+        assert project.profile.project_count == 0
+
+        project.status = "completed"
+        project.save()
+        _refresh(project.profile)
+        assert project.profile.project_count == 1
+
+    def test_outdated_instances_count_once(self):
+        project = ProjectFactory()
+        outdated = Project.objects.get(pk=project.pk)
+        for instance in (project, outdated):
+            instance.status = "cancelled"
+            instance.save()
+        _refresh(project.profile)
+        assert project.profile.project_count == 0
+
+        for instance in (project, outdated):
+            instance.status = "completed"
+            instance.save()
+        _refresh(project.profile)
+        assert project.profile.project_count == 1
+
+    def test_cancelled_project_not_counted(self):
+        project = ProjectFactory(status="cancelled")
+        _refresh(project.profile)
+        assert project.profile.project_count == 0
+
+    def test_project_moved_to_another_profile(self):
+        project = ProjectFactory()
+        old_profile = project.profile
+        project.profile = ProfileFactory()
+        project.save()
+        _refresh(old_profile, project.profile)
+        assert old_profile.project_count == 0
+        assert project.profile.project_count == 1
+
+
+@pytest.mark.django_db
+class TestTechnologyCounts:
+    def test_profile_technologies(self):
+        technologies = TechnologyFactory.create_batch(TECHNOLOGIES_COUNT)
+        profile = ProfileFactory()
+        profile.technologies.set(technologies)
+        profile.technologies.add(technologies[0])
+        _refresh(*technologies)
+        assert [tech.profile_count for tech in technologies] == [1, 1, 1]
+
+        profile.technologies.remove(technologies[0], TechnologyFactory())
+        _refresh(*technologies)
+        assert [tech.profile_count for tech in technologies] == [0, 1, 1]
+
+        profile.technologies.clear()
+        _refresh(*technologies)
+        assert [tech.profile_count for tech in technologies] == [0, 0, 0]
+
+    def test_reverse_side(self):
+        technology = TechnologyFactory()
+        technology.profiles.add(*ProfileFactory.create_batch(PROJECTS_COUNT))
+        _refresh(technology)
+        assert technology.profile_count == PROJECTS_COUNT
+
+        technology.profiles.clear()
+        _refresh(technology)
+        assert technology.profile_count == 0
+
+    def test_profile_deleted(self):
+        technology = TechnologyFactory()
+        ProfileFactory(technologies=[technology]).delete()
+        _refresh(technology)
+        assert technology.profile_count == 0
+
+    def test_project_technologies_and_status(self):
+        technology = TechnologyFactory()
+        project = ProjectFactory(technologies=[technology])
+        _refresh(technology)
+        assert technology.project_count == 1
+
+        project.status = "cancelled"
+        project.save()
+        _refresh(technology)
+        assert technology.project_count == 0
+
+        project.status = "ongoing"
+        project.save()
+        project.profile.delete()
+        _refresh(technology)
+        assert technology.project_count == 0
+
+    def test_recount_all(self):
+        technology = TechnologyFactory()
+        profile = ProfileFactory(technologies=[technology])
+        ProjectFactory(profile=profile, technologies=[technology])
+        Profile.objects.update(project_count=0)
+        Technology.objects.update(profile_count=0, project_count=0)
+
+        counters.recount_all()
+        _refresh(profile, technology)
+        assert profile.project_count == 1
+        assert technology.profile_count == 1
+        assert technology.project_count == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from apps.profiles import datasets
+
+# Constants for tests
+CHUNK_SIZE = 20
+
+
+def _rows(chunk):
+    return [
+        (
+            user.email,
+            user.uuid,
+            profile.experience,
+            profile.rating,
+            profile.project_count,
+        )
+        for user, profile in zip(chunk.users, chunk.profiles, strict=True)
+    ] + [(link.technology_id,) for link in chunk.project_technologies]
+
+
+@pytest.mark.django_db
+class TestChunk:
+    def test_deterministic(self):
+        refs = datasets.references()
+
+        first = datasets.Chunk(1, 2, CHUNK_SIZE, 100, "!", refs)
+        second = datasets.Chunk(1, 2, CHUNK_SIZE, 100, "!", refs)
+        other_seed = datasets.Chunk(2, 2, CHUNK_SIZE, 100, "!", refs)
+
+        assert _rows(first) == _rows(second)
+        assert _rows(first) != _rows(other_seed)
+        assert first.users[0].email == "dataset-1-40@example.com"
+
+    def test_last_chunk_is_partial(self):
+        chunk = datasets.Chunk(0, 4, CHUNK_SIZE, 90, "!", datasets.references())
+
+        assert len(chunk.profiles) == 90 - 4 * CHUNK_SIZE
+
+    def test_reference_rows_created_once(self):
+        refs = datasets.references()
+
+        assert len(refs["technologies"]) == len(datasets.TECHNOLOGIES)
+        assert datasets.references() == refs
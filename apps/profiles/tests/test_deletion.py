@@ -0,0 +1,134 @@
+import pytest
+from django.contrib import admin
+
+from apps.jobs.models import Job
+from apps.jobs.worker import Worker
+from apps.profiles import deletion, list_cache
+from apps.profiles.models import Profile, ProfileTombstone, Review
+from apps.users.admin import UserAdmin
+from apps.users.models import User
+
+from .factories import (
+    ContactInfoFactory,
+    ProfileFactory,
+    ProjectFactory,
+    ReviewFactory,
+    SocialNetworkFactory,
+    TechnologyFactory,
+)
+
+# Constants for tests
+PROJECTS = 3
+BATCH_SIZE = 2
+
+
+@pytest.fixture
+def profile():
+    technology = TechnologyFactory()
+    profile = ProfileFactory(technologies=[technology])
+    for project in ProjectFactory.create_batch(PROJECTS, profile=profile):
+        project.technologies.add(technology)
+        ReviewFactory(profile=profile, project=project)
+    ContactInfoFactory(profile=profile)
+    SocialNetworkFactory(profile=profile)
+    return profile
+
+
+def _run_jobs():
+    Worker(["deletion"]).run(burst=True)
+
+
+@pytest.mark.django_db
+class TestDeleteProfiles:
+    def test_profile_hidden_at_once(self, profile):
+        deletion.delete_profiles([profile.pk])
+
+        assert not Profile.objects.filter(pk=profile.pk).exists()
+        assert Profile.all_objects.filter(pk=profile.pk).exists()
+        assert ProfileTombstone.objects.filter(profile_id=profile.pk).count() == 1
+        assert Job.objects.filter(task="profiles.purge_profile").count() == 1
+        assert deletion.progress(profile.pk)["remaining"]["projects"] == PROJECTS
+
+    def test_purge_in_batches(self, profile):
+        technology = profile.technologies.get()
+        other_review = ReviewFactory(project=profile.projects.first())
+        deletion.delete_profiles([profile.pk])
+
+        assert deletion.purge(profile.pk, batch_size=BATCH_SIZE)
+
+        assert not Profile.all_objects.filter(pk=profile.pk).exists()
+        assert ProfileTombstone.objects.filter(profile_id=profile.pk).count() == 1
+        technology.refresh_from_db()
+        assert (technology.profile_count, technology.project_count) == (0, 0)
+        other_review.refresh_from_db()
+        assert other_review.project is None
+        assert not Review.objects.filter(profile_id=profile.pk).exists()
+        assert deletion.progress(profile.pk) == {
+            "status": deletion.DELETED,
+            "remaining": {},
+        }
+
+    def test_time_budget_exceeded(self, profile):
+        deletion.delete_profiles([profile.pk])
+
+        finished = deletion.purge(profile.pk, batch_size=1, time_budget=1e-9)
+
+        assert not finished
+        assert Profile.all_objects.filter(pk=profile.pk).exists()
+
+    def test_job_removes_profile(self, profile):
+        deletion.delete_profiles([profile.pk])
+
+        _run_jobs()
+
+        assert not Profile.all_objects.filter(pk=profile.pk).exists()
+
+    def test_visible_profile_has_no_progress(self, profile):
+        assert deletion.progress(profile.pk) is None
+
+
+@pytest.mark.django_db
+class TestDeleteUser:
+    def test_user_and_profiles_deleted(self, profile):
+        user = profile.user
+        ProfileFactory(user=user)
+
+        deletion.delete_user(user)
+
+        user.refresh_from_db()
+        assert not user.is_active
+        assert not Profile.objects.filter(user=user).exists()
+        _run_jobs()
+        assert not User.objects.filter(pk=user.pk).exists()
+        assert not Profile.all_objects.filter(user_id=user.pk).exists()
+
+    def test_admin_deletes_in_background(self, profile):
+        user = profile.user
+
+        UserAdmin(User, admin.site).delete_queryset(
+            None,
+            User.objects.filter(pk=user.pk),
+        )
+
+        user.refresh_from_db()
+        assert not user.is_active
+        assert Profile.all_objects.filter(pk=profile.pk).exists()
+        assert Job.objects.filter(task="profiles.purge_user", queue="deletion").exists()
+        _run_jobs()
+        assert not User.objects.filter(pk=user.pk).exists()
+
+    def test_caches_expired_on_commit(
+        self,
+        profile,
+        django_capture_on_commit_callbacks,
+    ):
+        tags = {list_cache.ALL_PROFILES}
+        before = list_cache.versions(tags)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            deletion.delete_user(profile.user)
+            assert list_cache.versions(tags) == before
+        for callback in callbacks:
+            callback()
+
+        assert list_cache.versions(tags) != before
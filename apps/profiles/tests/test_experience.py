@@ -0,0 +1,133 @@
+from datetime import date, timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.profiles import experience
+from apps.profiles.models import TechnologyExperience
+
+from .factories import ProfileFactory, ProjectFactory, TechnologyFactory
+
+# Constants for tests
+TODAY = date(2024, 6, 1)
+YEAR_START = date(2023, 1, 1)
+YEAR_END = date(2024, 1, 1)
+
+
+def _days(profile, technology):
+    row = TechnologyExperience.objects.filter(
+        profile=profile,
+        technology=technology,
+    ).first()
+    return row and row.days
+
+
+class TestMergedDays:
+    def test_overlapping_ranges_count_once(self):
+        ranges = [
+            (YEAR_START, date(2023, 7, 1)),
+            (date(2023, 3, 1), YEAR_END),
+            (date(2024, 3, 1), date(2024, 4, 1)),
+        ]
+        assert experience.merged_days(ranges, TODAY) == (365 + 31, False)
+
+    def test_ongoing_ranges_run_until_today(self):
+        ranges = [(YEAR_END, None), (date(2024, 5, 1), date(2025, 1, 1))]
+        assert experience.merged_days(ranges, TODAY) == (152, True)
+
+    def test_future_ranges_are_not_counted_yet(self):
+        assert experience.merged_days([(date(2025, 1, 1), None)], TODAY) == (0, True)
+
+
+@pytest.mark.django_db
+class TestSync:
+    def test_project_technologies(self):
+        python, go = TechnologyFactory.create_batch(2)
+        profile = ProfileFactory()
+        project = ProjectFactory(
+            profile=profile,
+            start_date=YEAR_START,
+            end_date=YEAR_END,
+            status="completed",
+            technologies=[python, go],
+        )
+        ProjectFactory(
+            profile=profile,
+            start_date=date(2023, 7, 1),
+            end_date=date(2024, 7, 1),
+            status="completed",
+            technologies=[python],
+        )
+        assert _days(profile, python) == (date(2024, 7, 1) - YEAR_START).days
+        assert _days(profile, go) == 365
+
+        project.technologies.remove(go)
+        assert _days(profile, go) is None
+
+    def test_project_dates_status_and_deletion(self):
+        python = TechnologyFactory()
+        project = ProjectFactory(
+            start_date=YEAR_START,
+            end_date=YEAR_END,
+            technologies=[python],
+        )
+        profile = project.profile
+
+        project.end_date = date(2023, 2, 1)
+        project.save()
+        assert _days(profile, python) == 31
+
+        project.status = "cancelled"
+        project.save()
+        assert _days(profile, python) is None
+
+        project.status = "completed"
+        project.save()
+        project.delete()
+        assert _days(profile, python) is None
+
+    def test_project_moved_to_another_profile(self):
+        python = TechnologyFactory()
+        project = ProjectFactory(
+            start_date=YEAR_START,
+            end_date=YEAR_END,
+            technologies=[python],
+        )
+        old_profile = project.profile
+
+        project.profile = ProfileFactory()
+        project.save()
+
+        assert _days(old_profile, python) is None
+        assert _days(project.profile, python) == 365
+
+
+@pytest.mark.django_db
+class TestRefresh:
+    def test_refresh_ongoing(self):
+        python = TechnologyFactory()
+        today = timezone.localdate()
+        project = ProjectFactory(
+            start_date=today - timedelta(days=10),
+            technologies=[python],
+        )
+        TechnologyExperience.objects.update(
+            days=5,
+            refreshed_on=today - timedelta(days=5),
+        )
+
+        assert experience.refresh_ongoing() == 1
+        assert _days(project.profile, python) == 10
+        assert experience.refresh_ongoing() == 0
+
+    def test_rebuild_all(self):
+        python = TechnologyFactory()
+        project = ProjectFactory(
+            start_date=YEAR_START,
+            end_date=YEAR_END,
+            technologies=[python],
+        )
+        TechnologyExperience.objects.all().delete()
+
+        assert experience.rebuild_all() == 1
+        assert _days(project.profile, python) == 365
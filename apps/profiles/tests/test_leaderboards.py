@@ -0,0 +1,132 @@
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.profiles import leaderboards
+
+from .factories import (
+    ProfileFactory,
+    ProjectFactory,
+    ReviewFactory,
+    SpecialistLevelFactory,
+    TechnologyFactory,
+)
+
+# Constants for tests
+LOW_RATING = Decimal("2.0")
+MID_RATING = Decimal("3.0")
+HIGH_RATING = Decimal("4.5")
+MAX_RATING = 5
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLeaderboards:
+    def test_board_built_on_first_read(self, django_assert_num_queries):
+        technology = TechnologyFactory()
+        low = ProfileFactory(rating=LOW_RATING, technologies=[technology])
+        high = ProfileFactory(rating=HIGH_RATING, technologies=[technology])
+
+        assert leaderboards.top("technology", technology.code, 10) == [high.pk, low.pk]
+        with django_assert_num_queries(0):
+            leaderboards.top("technology", technology.code, 10)
+
+    def test_rating_change_moves_profile(self):
+        technology = TechnologyFactory()
+        low = ProfileFactory(rating=LOW_RATING, technologies=[technology])
+        mid = ProfileFactory(rating=MID_RATING, technologies=[technology])
+        leaderboards.top("technology", technology.code, 10)
+
+        ReviewFactory(profile=low, rating=MAX_RATING)
+
+        assert leaderboards.top("technology", technology.code, 10) == [low.pk, mid.pk]
+
+    def test_technology_changes(self):
+        technology = TechnologyFactory()
+        profile = ProfileFactory(technologies=[technology])
+        leaderboards.top("technology", technology.code, 10)
+
+        other = ProfileFactory()
+        other.technologies.add(technology)
+        assert set(leaderboards.top("technology", technology.code, 10)) == {
+            profile.pk,
+            other.pk,
+        }
+
+        profile.technologies.remove(technology)
+        assert leaderboards.top("technology", technology.code, 10) == [other.pk]
+
+    def test_level_change(self):
+        profile = ProfileFactory()
+        old_level = profile.level
+        leaderboards.top("level", old_level.code, 10)
+        new_level = SpecialistLevelFactory()
+        leaderboards.top("level", new_level.code, 10)
+
+        profile.level = new_level
+        profile.save()
+
+        assert leaderboards.top("level", old_level.code, 10) == []
+        assert leaderboards.top("level", new_level.code, 10) == [profile.pk]
+
+    def test_deleted_profile_removed(self):
+        profile = ProfileFactory()
+        leaderboards.top("employment", profile.employment.code, 10)
+
+        profile.delete()
+
+        assert leaderboards.top("employment", profile.employment.code, 10) == []
+
+    def test_trimmed_board_rebuilt_when_short(self, monkeypatch):
+        monkeypatch.setattr(leaderboards, "BOARD_SIZE", 2)
+        monkeypatch.setattr(leaderboards, "MAX_LIMIT", 2)
+        level = SpecialistLevelFactory()
+        profiles = [
+            ProfileFactory(level=level, rating=rating)
+            for rating in (HIGH_RATING, MID_RATING, LOW_RATING)
+        ]
+        assert leaderboards.top("level", level.code, 2) == [
+            profiles[0].pk,
+            profiles[1].pk,
+        ]
+
+        profiles[0].delete()
+
+        assert leaderboards.top("level", level.code, 2) == [
+            profiles[1].pk,
+            profiles[2].pk,
+        ]
+
+    def test_rolled_back_change_not_applied(self):
+        technology = TechnologyFactory()
+        profile = ProfileFactory(technologies=[technology])
+        leaderboards.top("technology", technology.code, 10)
+
+        with pytest.raises(RuntimeError), transaction.atomic():
+            ProfileFactory(technologies=[technology])
+            raise RuntimeError
+
+        assert leaderboards.top("technology", technology.code, 10) == [profile.pk]
+
+    def test_renamed_reference_drops_boards_and_cards(self):
+        level = SpecialistLevelFactory()
+        profile = ProfileFactory(level=level)
+        old_code = level.code
+        leaderboards.top("level", old_code, 10)
+        cache.set(leaderboards.card_key(profile.pk), {"id": profile.pk})
+
+        level.code = "renamed"
+        level.save()
+
+        assert cache.get(leaderboards.board_key("level", old_code)) is None
+        assert cache.get(leaderboards.card_key(profile.pk)) is None
+        assert leaderboards.top("level", "renamed", 10) == [profile.pk]
+
+    def test_project_count_change_drops_card(self):
+        profile = ProfileFactory()
+        cache.set(leaderboards.card_key(profile.pk), {"id": profile.pk})
+
+        ProjectFactory(profile=profile)
+
+        assert cache.get(leaderboards.card_key(profile.pk)) is None
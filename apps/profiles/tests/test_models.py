@@ -121,6 +121,23 @@ class TestProfile:
         profile.technologies.set(technologies)
         assert profile.technologies.count() == TECHNOLOGIES_COUNT
 
+    def test_save_keeps_derived_fields(self):
+        profile = ProfileFactory()
+        outdated = Profile.objects.get(pk=profile.pk)
+        ReviewFactory(profile=profile, rating=MAX_RATING)
+        ProjectFactory(profile=profile)
+        profile.technologies.add(TechnologyFactory())
+
+        outdated.position = "Architect"
+        outdated.save()
+
+        profile.refresh_from_db()
+        assert profile.position == "Architect"
+        assert profile.rating_5_count == 1
+        assert profile.review_count == 1
+        assert profile.project_count == 1
+        assert len(profile.technology_ids) == 1
+
     def test_high_rating_validation(self):
         profile = ProfileFactory(rating=ABOVE_MAX_RATING)
         with pytest.raises(ValidationError):
@@ -0,0 +1,145 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from apps.profiles import leaderboards, list_cache, reviews
+from apps.profiles.models import Profile, Review
+
+from .factories import ProfileFactory, ReviewFactory
+
+# Constants for tests
+RATINGS = [5, 4, 4, 2] * 10
+AVERAGE_RATING = Decimal("3.8")
+BATCH_SIZE = 10
+# Inserts grow with batches, everything else is a fixed number of queries.
+MAX_QUERIES = 15
+
+
+def _reviews(profile, ratings):
+    return [
+        Review(profile=profile, rating=rating, text="-", reviewer_name="Anna")
+        for rating in ratings
+    ]
+
+
+@pytest.mark.django_db
+class TestIngest:
+    def test_stats_refreshed_once(self, django_assert_max_num_queries):
+        profile = ProfileFactory(rating=0)
+        other = ProfileFactory(rating=0)
+        rows = [*_reviews(profile, RATINGS), *_reviews(other, [1])]
+
+        with django_assert_max_num_queries(MAX_QUERIES):
+            created, profile_ids = reviews.ingest(rows, batch_size=BATCH_SIZE)
+
+        assert created == len(rows)
+        assert profile_ids == {profile.pk, other.pk}
+        profile.refresh_from_db()
+        assert profile.rating == AVERAGE_RATING
+        assert profile.review_count == len(RATINGS)
+        assert reviews.histogram(profile) == {
+            rating: RATINGS.count(rating) for rating in reviews.RATINGS
+        }
+
+    def test_profiles_without_reviews_reset(self):
+        profile = ProfileFactory(rating=Decimal("4.0"), review_count=1)
+
+        reviews.refresh_stats([profile.pk])
+
+        profile.refresh_from_db()
+        assert profile.rating == 0
+        assert profile.review_count == 0
+
+    def test_leaderboards_rebuilt(self, django_capture_on_commit_callbacks):
+        low = ProfileFactory(rating=Decimal("2.0"))
+        high = ProfileFactory(rating=Decimal("3.0"), level=low.level)
+        assert leaderboards.top("level", low.level.code, 10) == [high.pk, low.pk]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reviews.ingest(_reviews(low, [5]))
+
+        assert leaderboards.top("level", low.level.code, 10) == [low.pk, high.pk]
+
+    def test_caches_expired_on_commit(self, django_capture_on_commit_callbacks):
+        profile = ProfileFactory()
+        tags = {list_cache.ALL_PROFILES}
+        before = list_cache.versions(tags)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            reviews.ingest(_reviews(profile, [5]))
+            assert list_cache.versions(tags) == before
+        for callback in callbacks:
+            callback()
+
+        assert list_cache.versions(tags) != before
+
+    def test_changed_at_commit(self, django_capture_on_commit_callbacks):
+        profile = ProfileFactory()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            reviews.ingest(_reviews(profile, [5]))
+        imported_at = Profile.objects.get(pk=profile.pk).updated_at
+        committed_at = imported_at + timedelta(minutes=5)
+        with mock.patch("django.utils.timezone.now", return_value=committed_at):
+            for callback in callbacks:
+                callback()
+
+        assert Profile.objects.get(pk=profile.pk).updated_at == committed_at
+
+
+@pytest.mark.django_db
+class TestHistogram:
+    def test_created_reviews_counted(self):
+        profile = ProfileFactory()
+
+        ReviewFactory(profile=profile, rating=5)
+        ReviewFactory(profile=profile, rating=5)
+        ReviewFactory(profile=profile, rating=2)
+
+        profile.refresh_from_db()
+        assert reviews.histogram(profile) == {1: 0, 2: 1, 3: 0, 4: 0, 5: 2}
+
+    def test_rating_change_moves_count(self):
+        review = ReviewFactory(rating=5)
+
+        review.rating = 3
+        review.save()
+
+        review.profile.refresh_from_db()
+        assert review.profile.rating_5_count == 0
+        assert review.profile.rating_3_count == 1
+
+    def test_outdated_instances_move_count_once(self):
+        review = ReviewFactory(rating=5)
+        outdated = Review.objects.get(pk=review.pk)
+
+        for instance in (review, outdated):
+            instance.rating = 3
+            instance.save()
+
+        review.profile.refresh_from_db()
+        assert review.profile.rating_5_count == 0
+        assert review.profile.rating_3_count == 1
+
+    def test_moved_review(self):
+        review = ReviewFactory(rating=4)
+        old_profile = review.profile
+        new_profile = ProfileFactory()
+
+        review.profile = new_profile
+        review.save()
+
+        old_profile.refresh_from_db()
+        new_profile.refresh_from_db()
+        assert old_profile.rating_4_count == 0
+        assert new_profile.rating_4_count == 1
+
+    def test_deleted_review(self):
+        review = ReviewFactory(rating=1)
+
+        review.delete()
+
+        review.profile.refresh_from_db()
+        assert review.profile.rating_1_count == 0
@@ -0,0 +1,97 @@
+import pytest
+
+from apps.profiles import similarity
+from apps.profiles.models import ProfileSignature, ProfileSignatureBand
+
+from .factories import ProfileFactory, ProjectFactory, TechnologyFactory
+
+# Constants for tests
+TECHNOLOGIES_COUNT = 6
+PROFILES_COUNT = 3
+DISJOINT_SIMILARITY_LIMIT = 0.5
+
+
+@pytest.mark.django_db
+class TestSimilarityIndex:
+    def test_minhash_estimates_jaccard(self):
+        assert similarity.estimate_similarity(
+            similarity.minhash({1, 2, 3}),
+            similarity.minhash({1, 2, 3}),
+        ) == pytest.approx(1.0)
+        assert (
+            similarity.estimate_similarity(
+                similarity.minhash({1, 2, 3}),
+                similarity.minhash({4, 5, 6}),
+            )
+            < DISJOINT_SIMILARITY_LIMIT
+        )
+
+    def test_index_updated_on_technology_changes(self):
+        technologies = TechnologyFactory.create_batch(TECHNOLOGIES_COUNT)
+        profile = ProfileFactory()
+        assert not ProfileSignature.objects.filter(profile=profile).exists()
+
+        profile.technologies.set(technologies)
+        assert ProfileSignature.objects.filter(profile=profile).exists()
+        assert (
+            ProfileSignatureBand.objects.filter(profile=profile).count()
+            == similarity.BANDS
+        )
+
+        profile.technologies.clear()
+        assert not ProfileSignature.objects.filter(profile=profile).exists()
+
+    def test_project_technologies_are_indexed(self):
+        technology = TechnologyFactory()
+        project = ProjectFactory()
+        project.technologies.add(technology)
+        assert ProfileSignature.objects.filter(profile=project.profile).exists()
+
+        project.delete()
+        assert not ProfileSignature.objects.filter(profile=project.profile).exists()
+
+    def test_deleted_technology_reindexed(self, django_capture_on_commit_callbacks):
+        kept, deleted = TechnologyFactory.create_batch(2)
+        profile = ProfileFactory(technologies=[kept, deleted])
+        project = ProjectFactory()
+        project.technologies.add(deleted)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            deleted.delete()
+
+        signature = ProfileSignature.objects.get(profile=profile).minhash
+        assert signature == similarity.minhash({kept.pk})
+        assert not ProfileSignature.objects.filter(profile=project.profile).exists()
+
+    def test_similar_profiles_ranked_by_overlap(self):
+        technologies = TechnologyFactory.create_batch(TECHNOLOGIES_COUNT)
+        profile = ProfileFactory(technologies=technologies)
+        twin = ProfileFactory(technologies=technologies)
+        close = ProfileFactory(technologies=technologies[:-1])
+        ProfileFactory(technologies=[TechnologyFactory()])
+
+        similar = similarity.similar_profiles(profile.pk)
+        assert [profile_id for profile_id, _ in similar][:2] == [twin.pk, close.pk]
+        assert similar[0][1] == pytest.approx(1.0)
+
+    def test_candidates_ranked_by_band_hits(self, monkeypatch):
+        technologies = TechnologyFactory.create_batch(TECHNOLOGIES_COUNT)
+        profile = ProfileFactory(technologies=technologies)
+        # Shares one band with the profile and comes first in every index.
+        lucky = ProfileFactory(technologies=[TechnologyFactory()])
+        ProfileSignatureBand.objects.filter(profile=lucky, band=0).update(
+            bucket=ProfileSignatureBand.objects.get(profile=profile, band=0).bucket,
+        )
+        twin = ProfileFactory(technologies=technologies)
+        monkeypatch.setattr(similarity, "MAX_CANDIDATES", 1)
+
+        similar = similarity.similar_profiles(profile.pk)
+        assert [profile_id for profile_id, _ in similar] == [twin.pk]
+
+    def test_rebuild_index(self):
+        technologies = TechnologyFactory.create_batch(TECHNOLOGIES_COUNT)
+        ProfileFactory.create_batch(PROFILES_COUNT, technologies=technologies)
+        ProfileSignature.objects.all().delete()
+
+        assert similarity.rebuild_index(batch_size=2) == PROFILES_COUNT
+        assert ProfileSignature.objects.count() == PROFILES_COUNT
@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+from django.db import connection, connections, transaction
+
+from apps.profiles import technology_sets
+from apps.profiles.models import Profile
+
+from .factories import ProfileFactory, TechnologyFactory
+
+# Constants for tests
+COMMIT_DELAY = 0.2
+
+
+def _stored(profile):
+    profile.refresh_from_db()
+    return profile.technology_ids
+
+
+@pytest.mark.django_db
+class TestSync:
+    def test_add_remove_and_clear(self):
+        python, go = TechnologyFactory(), TechnologyFactory()
+        profile = ProfileFactory()
+
+        profile.technologies.add(go, python)
+        assert _stored(profile) == sorted([python.pk, go.pk])
+
+        profile.technologies.remove(python)
+        assert _stored(profile) == [go.pk]
+
+        profile.technologies.clear()
+        assert _stored(profile) == []
+
+    def test_reverse_changes(self):
+        python = TechnologyFactory()
+        profiles = ProfileFactory.create_batch(2)
+
+        python.profiles.add(*profiles)
+        assert [_stored(profile) for profile in profiles] == [[python.pk]] * 2
+
+        python.profiles.clear()
+        assert [_stored(profile) for profile in profiles] == [[], []]
+
+    def test_deleted_technology(self, django_capture_on_commit_callbacks):
+        python, go = TechnologyFactory.create_batch(2)
+        profile = ProfileFactory(technologies=[python, go])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            go.delete()
+
+        assert _stored(profile) == [python.pk]
+
+
+@pytest.mark.django_db
+class TestFilterProfiles:
+    def test_any_and_all(self):
+        python, go, rust = TechnologyFactory.create_batch(3)
+        both = ProfileFactory(technologies=[python, go])
+        pythonista = ProfileFactory(technologies=[python])
+        ProfileFactory(technologies=[rust])
+
+        def filtered(mode):
+            return list(
+                technology_sets.filter_profiles(
+                    Profile.objects.order_by("pk"),
+                    [python.pk, go.pk],
+                    mode,
+                ),
+            )
+
+        assert filtered(technology_sets.ANY) == [both, pythonista]
+        assert filtered(technology_sets.ALL) == [both]
+
+
+@pytest.fixture
+def postgresql():
+    if connection.vendor != "postgresql":
+        pytest.skip("Needs PostgreSQL")
+
+
+@pytest.mark.usefixtures("postgresql")
+@pytest.mark.django_db
+class TestFilterProfilesPostgreSQL:
+    def test_any_and_all(self):
+        python, go, rust = TechnologyFactory.create_batch(3)
+        both = ProfileFactory(technologies=[python, go])
+        pythonista = ProfileFactory(technologies=[python])
+        ProfileFactory(technologies=[rust])
+        queryset = Profile.objects.order_by("pk")
+
+        any_of = technology_sets.filter_profiles(
+            queryset,
+            [python.pk, go.pk],
+            technology_sets.ANY,
+        )
+        all_of = technology_sets.filter_profiles(
+            queryset,
+            [python.pk, go.pk],
+            technology_sets.ALL,
+        )
+
+        assert list(any_of) == [both, pythonista]
+        assert list(all_of) == [both]
+        # Answered from the stored ids, without joining the link table.
+        for filtered in (any_of, all_of):
+            sql = str(filtered.query)
+            assert "@>" in sql
+            assert Profile.technologies.through._meta.db_table not in sql
+
+
+@pytest.mark.usefixtures("postgresql")
+@pytest.mark.django_db(transaction=True)
+class TestSyncPostgreSQL:
+    def test_concurrent_changes_kept(self):
+        python, go = TechnologyFactory.create_batch(2)
+        profile = ProfileFactory()
+        added = threading.Event()
+
+        def add(technology, before=None, after=None):
+            try:
+                if before:
+                    before.wait()
+                with transaction.atomic():
+                    profile.technologies.add(technology)
+                    if after:
+                        after.set()
+                        time.sleep(COMMIT_DELAY)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=add, args=(python,), kwargs={"after": added}),
+            threading.Thread(target=add, args=(go,), kwargs={"before": added}),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert _stored(profile) == sorted([python.pk, go.pk])
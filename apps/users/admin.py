@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
+from apps.profiles import deletion
 from apps.users.models import User
 
 
@@ -73,6 +74,15 @@ class UserAdmin(BaseUserAdmin):
     # Empty tuple as we don't have any many-to-many fields currently
     filter_horizontal = ()
 
+    def delete_model(self, request, obj):
+        """Deactivate the user and delete it and its profiles in the background."""
+        deletion.delete_user(obj)
+
+    def delete_queryset(self, request, queryset):
+        """Deactivate the users and delete them in the background."""
+        for user in queryset:
+            deletion.delete_user(user)
+
 
 # Register the User model with its custom admin configuration
 admin.site.register(User, UserAdmin)
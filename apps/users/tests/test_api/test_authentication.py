@@ -0,0 +1,119 @@
+import base64
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authentication import (
+    BasicAuthentication,
+    SessionAuthentication,
+)
+from rest_framework.test import APITestCase
+
+from api.authentication import CachedBasicAuthentication, chain
+from apps.users.tests.factories import UserFactory
+
+# Constants for tests
+PASSWORD = "testpass123"
+
+
+class TestAuthenticationChains(APITestCase):
+    def setUp(self):
+        self.url = reverse("api:profiles:profile-list")
+
+    def test_api_routes_skip_sessions(self):
+        """Test API routes don't authenticate with the session"""
+        self.assertNotIn(SessionAuthentication, chain("api:profiles:profile-list"))
+        self.assertIn(SessionAuthentication, chain("admin:index"))
+
+        self.client.force_login(UserFactory())
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(
+        AUTHENTICATION_CHAINS={
+            "all": {
+                "routes": ["*"],
+                "classes": ["rest_framework.authentication.SessionAuthentication"],
+            },
+        },
+    )
+    def test_configured_chain(self):
+        """Test the chain is read from the settings"""
+        self.client.force_login(UserFactory())
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TestCachedBasicAuthentication(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.user.set_password(PASSWORD)
+        self.user.save()
+        self.url = reverse("api:profiles:profile-list")
+
+    def tearDown(self):
+        cache.clear()
+
+    def get(self, password=PASSWORD):
+        credentials = base64.b64encode(f"{self.user.email}:{password}".encode())
+        return self.client.get(
+            self.url,
+            HTTP_AUTHORIZATION=f"Basic {credentials.decode()}",
+        )
+
+    def verifications(self):
+        return mock.patch.object(
+            BasicAuthentication,
+            "authenticate_credentials",
+            autospec=True,
+            side_effect=BasicAuthentication.authenticate_credentials,
+        )
+
+    def test_verified_once(self):
+        """Test credentials are verified once and then served from the cache"""
+        with self.verifications() as verify:
+            for _ in range(3):
+                self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+
+        self.assertEqual(verify.call_count, 1)
+
+    def test_wrong_password_not_cached(self):
+        """Test failed attempts are verified every time"""
+        with self.verifications() as verify:
+            for _ in range(2):
+                self.assertEqual(
+                    self.get("wrong").status_code,
+                    status.HTTP_401_UNAUTHORIZED,
+                )
+
+        self.assertEqual(verify.call_count, 2)
+
+    def test_password_change(self):
+        """Test a password change invalidates the cached verification"""
+        self.get()
+        self.user.set_password("changed123")
+        self.user.save()
+
+        self.assertEqual(self.get().status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.get("changed123").status_code, status.HTTP_200_OK)
+
+    def test_deactivated_user(self):
+        """Test a deactivated user is rejected despite a cached verification"""
+        self.get()
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.get().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_key_hides_credentials(self):
+        """Test the cache key reveals neither the user nor the password"""
+        key = CachedBasicAuthentication().cache_key(self.user.email, PASSWORD)
+
+        self.assertNotIn(self.user.email, key)
+        self.assertNotIn(PASSWORD, key)
@@ -0,0 +1,135 @@
+"""Per-process admission control by route class.
+
+Routes are grouped into classes by URL name patterns. Every class tracks its
+in-flight requests and an exponentially weighted moving average of its
+latency. A request of a sheddable class is rejected when:
+
+* its class already runs ``max_in_flight`` requests, a limit that shrinks in
+  proportion while the class's average latency exceeds ``latency_budget``, or
+* the whole process runs more than its priority's share of ``MAX_IN_FLIGHT``
+  requests, so low-priority routes give way before normal ones.
+
+Classes of a priority without a share are never rejected, only tracked.
+State is kept per process, which suits threaded or async workers where
+requests of one process run concurrently.
+"""
+
+import threading
+import time
+from fnmatch import fnmatchcase
+
+from django.urls import Resolver404, resolve
+
+
+class RouteClass:
+    """Load statistics and limits of one class of routes."""
+
+    def __init__(
+        self,
+        name,
+        *,
+        routes=(),
+        priority,
+        max_in_flight=None,
+        latency_budget=None,
+    ):
+        self.name = name
+        self.routes = tuple(routes)
+        self.priority = priority
+        self.max_in_flight = max_in_flight
+        self.latency_budget = latency_budget
+        self.in_flight = 0
+        self.latency = 0.0
+        self.admitted = 0
+        self.rejected = 0
+
+    def matches(self, view_name):
+        return any(fnmatchcase(view_name, pattern) for pattern in self.routes)
+
+    def limit(self):
+        """Return the current in-flight limit, reduced while running slow."""
+        if self.max_in_flight is None:
+            return None
+        if self.latency_budget and self.latency > self.latency_budget:
+            return max(1, int(self.max_in_flight * self.latency_budget / self.latency))
+        return self.max_in_flight
+
+
+class AdmissionController:
+    """Admit or reject requests according to the ``ADMISSION_CONTROL`` setting."""
+
+    # The controller of the running middleware, read by the metrics endpoint.
+    current = None
+
+    def __init__(self, config):
+        self.max_in_flight = config["MAX_IN_FLIGHT"]
+        self.priorities = config["PRIORITIES"]
+        self.alpha = config["LATENCY_SMOOTHING"]
+        self.classes = [
+            RouteClass(name, **options) for name, options in config["CLASSES"].items()
+        ]
+        self.default = next(
+            route_class
+            for route_class in self.classes
+            if route_class.name == config["DEFAULT_CLASS"]
+        )
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._by_view_name = {}
+
+    def classify(self, path):
+        """Return the route class of a request path."""
+        try:
+            view_name = resolve(path).view_name
+        except Resolver404:
+            return self.default
+        route_class = self._by_view_name.get(view_name)
+        if route_class is None:
+            route_class = next(
+                (item for item in self.classes if item.matches(view_name)),
+                self.default,
+            )
+            self._by_view_name[view_name] = route_class
+        return route_class
+
+    def admit(self, route_class):
+        """Reserve a slot for a request and return whether it was admitted."""
+        share = self.priorities[route_class.priority]
+        with self._lock:
+            if share is not None:
+                limit = route_class.limit()
+                if (limit is not None and route_class.in_flight >= limit) or (
+                    self.in_flight >= self.max_in_flight * share
+                ):
+                    route_class.rejected += 1
+                    return False
+            route_class.in_flight += 1
+            route_class.admitted += 1
+            self.in_flight += 1
+            return True
+
+    def release(self, route_class, started):
+        """Free the slot of a finished request and record its latency."""
+        elapsed = time.monotonic() - started
+        with self._lock:
+            route_class.in_flight -= 1
+            self.in_flight -= 1
+            if route_class.latency:
+                route_class.latency += self.alpha * (elapsed - route_class.latency)
+            else:
+                route_class.latency = elapsed
+
+    def snapshot(self):
+        """Return the current statistics of every route class by name."""
+        with self._lock:
+            return {
+                route_class.name: {
+                    "priority": route_class.priority,
+                    "in_flight": route_class.in_flight,
+                    "limit": route_class.limit(),
+                    "latency": route_class.latency,
+                    "admitted": route_class.admitted,
+                    "rejected": route_class.rejected,
+                }
+                for route_class in self.classes
+            }
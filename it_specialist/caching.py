@@ -0,0 +1,149 @@
+"""Stampede-protected caching for expensive views and aggregates.
+
+``SingleFlightCache.get_or_compute`` lets a single worker recompute a missing
+or expired value while the others either serve the previous value or wait for
+the result. Values are also recomputed a little before they expire with
+probability growing as expiry nears (XFetch), scaled by how long the last
+computation took, so hot keys are usually refreshed before anyone misses.
+
+Hits, misses, early refreshes, stale reads, coalesced waits and wait timeouts
+are counted per cache in the shared cache; see ``metrics``.
+"""
+
+import math
+import random
+import time
+
+from django.core.cache import cache
+
+EVENTS = ("hit", "miss", "early", "stale", "coalesced", "timeout")
+
+
+class SingleFlightCache:
+    """A named family of cache entries sharing stampede protection settings.
+
+    ``beta`` scales early recomputation, values above 1 favour refreshing
+    earlier. Entries outlive their timeout by ``stale_ttl`` seconds so they
+    can be served while a refresh is running when ``serve_stale`` is set.
+    Workers without a previous value wait up to ``wait`` seconds for the one
+    holding the lock before computing the value themselves.
+    """
+
+    instances = {}
+
+    def __init__(
+        self,
+        name,
+        *,
+        beta=1.0,
+        serve_stale=True,
+        stale_ttl=300,
+        lock_timeout=30,
+        wait=5.0,
+        poll=0.05,
+    ):
+        self.name = name
+        self.beta = beta
+        self.serve_stale = serve_stale
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.wait = wait
+        self.poll = poll
+        SingleFlightCache.instances[name] = self
+
+    def get_or_compute(self, key, compute, timeout, is_valid=None):
+        """Return the cached value of ``key``, computing it when needed.
+
+        ``is_valid`` may reject a cached value early, for example when the
+        data it was built from changed; a rejected value is never served,
+        not even stale, so callers wait for or compute a new one.
+        A ``timeout`` of 0 disables caching.
+        """
+        if not timeout:
+            return compute()
+
+        entry = cache.get(key)
+        now = time.time()
+        usable = entry is not None and (is_valid is None or is_valid(entry["value"]))
+        fresh = usable and now < entry["expires"]
+        if fresh and not self._expires_early(entry, now):
+            self._count("hit")
+            return entry["value"]
+
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, 1, self.lock_timeout):
+            try:
+                self._count("early" if fresh else "miss")
+                return self._compute(key, compute, timeout)
+            finally:
+                cache.delete(lock_key)
+
+        if fresh:
+            # Another worker is already refreshing ahead of expiry.
+            self._count("hit")
+            return entry["value"]
+        if usable and self.serve_stale:
+            self._count("stale")
+            return entry["value"]
+        return self._wait(key, lock_key, compute, timeout, is_valid)
+
+    def _expires_early(self, entry, now):
+        # 1 - random() lies in (0, 1], so the logarithm is always defined.
+        uniform = 1 - random.random()  # noqa: S311
+        return now - entry["delta"] * self.beta * math.log(uniform) >= entry["expires"]
+
+    def _compute(self, key, compute, timeout):
+        started = time.monotonic()
+        value = compute()
+        entry = {
+            "value": value,
+            "delta": time.monotonic() - started,
+            "expires": time.time() + timeout,
+        }
+        cache.set(key, entry, timeout + self.stale_ttl)
+        return value
+
+    def _wait(self, key, lock_key, compute, timeout, is_valid):
+        deadline = time.monotonic() + self.wait
+        while time.monotonic() < deadline:
+            time.sleep(self.poll)
+            entry = cache.get(key)
+            if (
+                entry is not None
+                and time.time() < entry["expires"]
+                and (is_valid is None or is_valid(entry["value"]))
+            ):
+                self._count("coalesced")
+                return entry["value"]
+            if cache.get(lock_key) is None:
+                # The lock holder gave up without storing a value.
+                break
+        self._count("timeout")
+        return self._compute(key, compute, timeout)
+
+    def _metric_key(self, event):
+        return f"single-flight:{self.name}:{event}"
+
+    def _count(self, event):
+        key = self._metric_key(event)
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+
+    def metrics(self):
+        """Return the number of times each event happened."""
+        counts = cache.get_many([self._metric_key(event) for event in EVENTS])
+        return {event: counts.get(self._metric_key(event), 0) for event in EVENTS}
+
+    def reset_metrics(self):
+        cache.delete_many([self._metric_key(event) for event in EVENTS])
+
+
+def metrics():
+    """Return the event counts of every single-flight cache by name."""
+    return {
+        name: instance.metrics()
+        for name, instance in sorted(SingleFlightCache.instances.items())
+    }
@@ -0,0 +1,48 @@
+"""Database routing between the primary and its read replicas."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_replica = ContextVar("replica", default=None)
+
+
+@contextmanager
+def replica_reads(alias):
+    """Route reads made inside the block to replica ``alias`` until the first write.
+
+    Every read of the block uses the same replica, so the queries of a request
+    all see the same replication lag.
+    """
+    token = _replica.set(alias)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def pin_to_primary():
+    """Send every following read of the current context to the primary."""
+    _replica.set(None)
+
+
+class ReplicaRouter:
+    """Send reads inside ``replica_reads`` blocks to the replica of the block.
+
+    Writes always go to ``default`` and pin the rest of the block to it, so a
+    request reads its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,451 @@
+"""Request, database and worker metrics in the Prometheus text format.
+
+``middleware.MetricsMiddleware`` records per URL name request latency,
+status counts and the number and time of database queries.
+``metrics_view`` serves them at ``/metrics`` together with values read at
+scrape time:
+
+- event counts of the stampede-protected caches (``caching.metrics``),
+- open database connections of the process and, on PostgreSQL, of the
+  server,
+- in-flight requests and limits of the admission controller,
+- backlog and latency of the job queues (``queue_stats``).
+
+Request metrics are recorded per process. With ``METRICS["MULTIPROCESS_DIR"]``
+set, every process writes them to its own file in that directory at most
+every ``FLUSH_INTERVAL`` seconds and a scrape sums the files of all
+processes, so any worker behind a shared port serves the same totals. The
+directory has to be emptied when the server starts. Without it every worker
+process has to be scraped as its own target, on its own port. Values read at
+scrape time always describe the process serving the scrape.
+
+The endpoint is disabled unless ``METRICS["TOKEN"]`` is set and only serves
+scrapers sending it as a bearer token.
+"""
+
+import bisect
+import copy
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.http import Http404, HttpResponse
+
+from . import caching
+from .admission import AdmissionController
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNRESOLVED = "<unresolved>"
+FLUSH_INTERVAL = 1.0
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing value per set of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self.values)
+        for labels, value in sorted(values.items()):
+            yield self.name, _labels(self.labels, labels), value
+
+    def clear(self):
+        with self._lock:
+            self.values.clear()
+
+    def state(self):
+        """Return the values as JSON serializable ``[labels, value]`` pairs."""
+        with self._lock:
+            return [[list(labels), value] for labels, value in self.values.items()]
+
+    def merge(self, labels, value):
+        """Add a value of another process to the value of ``labels``."""
+        self.inc(*labels, amount=value)
+
+    def empty(self):
+        """Return a metric of the same definition without any value."""
+        metric = copy.copy(self)
+        metric.values = {}
+        metric._lock = threading.Lock()
+        return metric
+
+
+class Histogram(Counter):
+    """Observations counted into cumulative buckets per set of label values."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=()):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self.values.get(labels)
+            if state is None:
+                # Bucket counts, then the overflow count and the sum.
+                state = self.values[labels] = [0] * (len(self.buckets) + 1) + [0]
+            state[index] += 1
+            state[-1] += value
+
+    def state(self):
+        with self._lock:
+            return [
+                [list(labels), list(state)] for labels, state in self.values.items()
+            ]
+
+    def merge(self, labels, value):
+        with self._lock:
+            state = self.values.setdefault(labels, [0] * len(value))
+            for index, count in enumerate(value):
+                state[index] += count
+
+    def samples(self):
+        with self._lock:
+            values = {labels: list(state) for labels, state in self.values.items()}
+        names = (*self.labels, "le")
+        for labels, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), state, strict=False):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    _labels(names, (*labels, _number(bound))),
+                    cumulative,
+                )
+            yield f"{self.name}_count", _labels(self.labels, labels), cumulative
+            yield f"{self.name}_sum", _labels(self.labels, labels), state[-1]
+
+
+class Gauge(Counter):
+    """A value read at scrape time."""
+
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        with self._lock:
+            self.values[labels] = value
+
+
+def render(metrics):
+    """Return metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(
+            f"{name}{labels} {_number(value)}"
+            for name, labels, value in metric.samples()
+        )
+    return "\n".join(lines) + "\n"
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling requests.",
+    ["view", "method"],
+    settings.METRICS["LATENCY_BUCKETS"],
+)
+RESPONSES = Counter(
+    "http_responses_total",
+    "Responses sent by status code.",
+    ["view", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run per request.",
+    ["view"],
+    settings.METRICS["QUERY_COUNT_BUCKETS"],
+)
+QUERY_TIME = Counter(
+    "http_request_db_query_seconds_total",
+    "Time spent running database queries.",
+    ["view", "database"],
+)
+REQUEST_METRICS = (REQUEST_LATENCY, RESPONSES, REQUEST_QUERIES, QUERY_TIME)
+
+
+class QueryRecorder:
+    """Database execute wrapper counting queries and their time per alias."""
+
+    def __init__(self):
+        self.count = 0
+        self.time = {}
+
+    def wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.count += 1
+                self.time[alias] = (
+                    self.time.get(alias, 0.0) + time.perf_counter() - started
+                )
+
+        return record
+
+
+def view_name(request):
+    """Return the URL name of the view that handled a request."""
+    match = request.resolver_match
+    return match.view_name if match is not None else UNRESOLVED
+
+
+def record_request(request, response, elapsed, queries):
+    """Record the latency, status and queries of a handled request."""
+    view = view_name(request)
+    REQUEST_LATENCY.observe(elapsed, view, request.method)
+    RESPONSES.inc(view, request.method, str(response.status_code))
+    REQUEST_QUERIES.observe(queries.count, view)
+    for alias, seconds in queries.time.items():
+        QUERY_TIME.inc(view, alias, amount=seconds)
+    flush()
+
+
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+
+
+def _directory():
+    return settings.METRICS.get("MULTIPROCESS_DIR")
+
+
+def flush(force=False):
+    """Write the request metrics of this process to the multiprocess directory.
+
+    Writes at most every ``FLUSH_INTERVAL`` seconds unless ``force`` is set.
+    """
+    global _last_flush
+    directory = _directory()
+    if not directory:
+        return
+    with _flush_lock:
+        now = time.monotonic()
+        if not force and now - _last_flush < FLUSH_INTERVAL:
+            return
+        _last_flush = now
+        state = {metric.name: metric.state() for metric in REQUEST_METRICS}
+        # Replaced atomically, so scrapes never read a partial file.
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=directory,
+            suffix=".tmp",
+            delete=False,
+        ) as file:
+            json.dump(state, file)
+        os.replace(file.name, Path(directory) / f"metrics-{os.getpid()}.json")
+
+
+def request_metrics():
+    """Return the request metrics, summed over processes when configured."""
+    directory = _directory()
+    if not directory:
+        return list(REQUEST_METRICS)
+    flush(force=True)
+    totals = [metric.empty() for metric in REQUEST_METRICS]
+    for path in Path(directory).glob("metrics-*.json"):
+        try:
+            state = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for metric in totals:
+            for labels, value in state.get(metric.name, ()):
+                metric.merge(tuple(labels), value)
+    return totals
+
+
+def _cache_metrics():
+    events = Counter(
+        "single_flight_cache_events_total",
+        "Events of the stampede-protected caches, shared by all processes.",
+        ["cache", "event"],
+    )
+    hit_ratio = Gauge(
+        "single_flight_cache_hit_ratio",
+        "Share of lookups served from the cache.",
+        ["cache"],
+    )
+    for name, counts in caching.metrics().items():
+        for event, count in counts.items():
+            events.inc(name, event, amount=count)
+        lookups = counts["hit"] + counts["miss"] + counts["stale"]
+        if lookups:
+            hit_ratio.set((counts["hit"] + counts["stale"]) / lookups, name)
+    return [events, hit_ratio]
+
+
+def _server_connections(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()",
+        )
+        (used,) = cursor.fetchone()
+        cursor.execute("SHOW max_connections")
+        (limit,) = cursor.fetchone()
+    return used, int(limit)
+
+
+def _connection_metrics():
+    open_connections = Gauge(
+        "db_connections_open",
+        "Database connections held open by this process.",
+        ["database"],
+    )
+    server_used = Gauge(
+        "db_server_connections",
+        "Connections to the database server from all clients.",
+        ["database"],
+    )
+    server_limit = Gauge(
+        "db_server_max_connections",
+        "Connection limit of the database server.",
+        ["database"],
+    )
+    for alias in connections:
+        connection = connections[alias]
+        open_connections.set(int(connection.connection is not None), alias)
+        if connection.vendor != "postgresql":
+            continue
+        try:
+            used, limit = _server_connections(connection)
+        except DatabaseError:
+            continue
+        server_used.set(used, alias)
+        server_limit.set(limit, alias)
+    return [open_connections, server_used, server_limit]
+
+
+def _admission_metrics():
+    controller = AdmissionController.current
+    if controller is None:
+        return []
+    in_flight = Gauge(
+        "admission_in_flight",
+        "Requests in flight per route class.",
+        ["route_class"],
+    )
+    limit = Gauge(
+        "admission_limit",
+        "Current in-flight limit per route class.",
+        ["route_class"],
+    )
+    latency = Gauge(
+        "admission_latency_seconds",
+        "Moving average of the latency per route class.",
+        ["route_class"],
+    )
+    decisions = Counter(
+        "admission_decisions_total",
+        "Requests admitted and rejected per route class.",
+        ["route_class", "decision"],
+    )
+    saturation = Gauge(
+        "worker_saturation",
+        "Requests in flight in this process relative to MAX_IN_FLIGHT.",
+    )
+    for name, stats in controller.snapshot().items():
+        in_flight.set(stats["in_flight"], name)
+        if stats["limit"] is not None:
+            limit.set(stats["limit"], name)
+        latency.set(stats["latency"], name)
+        decisions.inc(name, "admitted", amount=stats["admitted"])
+        decisions.inc(name, "rejected", amount=stats["rejected"])
+    saturation.set(controller.in_flight / controller.max_in_flight)
+    return [in_flight, limit, latency, decisions, saturation]
+
+
+def _queue_metrics():
+    from apps.jobs.metrics import queue_stats
+
+    jobs = Gauge(
+        "job_queue_jobs",
+        "Queued, due and running jobs per queue.",
+        ["queue", "status"],
+    )
+    finished = Gauge(
+        "job_queue_finished_jobs",
+        "Jobs finished over the last 15 minutes per queue.",
+        ["queue", "status"],
+    )
+    wait = Gauge(
+        "job_queue_wait_p95_seconds",
+        "95th percentile of the time jobs waited for a worker.",
+        ["queue"],
+    )
+    duration = Gauge(
+        "job_queue_duration_p95_seconds",
+        "95th percentile of the time jobs ran.",
+        ["queue"],
+    )
+    for queue, stats in queue_stats().items():
+        for status in ("queued", "due", "running"):
+            jobs.set(stats[status], queue, status)
+        for status in ("succeeded", "failed"):
+            finished.set(stats[status], queue, status)
+        if stats["wait_p95"] is not None:
+            wait.set(stats["wait_p95"], queue)
+            duration.set(stats["duration_p95"], queue)
+    return [jobs, finished, wait, duration]
+
+
+def collect():
+    """Return every metric, reading the scrape time values now."""
+    return [
+        *request_metrics(),
+        *_cache_metrics(),
+        *_connection_metrics(),
+        *_admission_metrics(),
+        *_queue_metrics(),
+    ]
+
+
+def metrics_view(request):
+    """Serve the metrics to clients sending ``METRICS["TOKEN"]``."""
+    token = settings.METRICS["TOKEN"]
+    if not token:
+        raise Http404
+    if not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(),
+        f"Bearer {token}".encode(),
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
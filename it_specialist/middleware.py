@@ -0,0 +1,259 @@
+import gzip
+import random
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from . import metrics, profiling, tracing
+from .admission import AdmissionController
+from .db_routers import replica_reads
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class MetricsMiddleware:
+    """Record the latency, status and database queries of every request.
+
+    See ``it_specialist.metrics`` for the metrics served at ``/metrics``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = metrics.QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(queries.wrapper(alias)),
+                )
+            response = self.get_response(request)
+        metrics.record_request(
+            request,
+            response,
+            time.perf_counter() - started,
+            queries,
+        )
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Serve safe API requests from read replicas with read-your-writes.
+
+    A write request sets a short-lived cookie that keeps the client on the
+    primary while the replicas catch up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def use_replicas(self, request):
+        return (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and request.path_info.startswith(tuple(settings.REPLICA_READ_PATHS))
+            and settings.REPLICA_STICKY_COOKIE not in request.COOKIES
+        )
+
+    def __call__(self, request):
+        if not self.use_replicas(request):
+            response = self.get_response(request)
+        else:
+            # One replica per request, so its queries agree with each other.
+            replica = random.choice(settings.DATABASE_REPLICAS)  # noqa: S311
+            with replica_reads(replica):
+                response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, whichever the client prefers.
+
+    Only non-streaming responses of ``COMPRESSION_CONTENT_TYPES`` at least
+    ``COMPRESSION_MIN_SIZE`` bytes long are compressed. Brotli is used only
+    when the ``brotli`` package is installed.
+    """
+
+    accept_encoding_re = re.compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.encoders = {
+            "gzip": lambda content: gzip.compress(
+                content,
+                compresslevel=settings.COMPRESSION_GZIP_LEVEL,
+                mtime=0,
+            ),
+        }
+        if brotli is not None:
+            self.encoders["br"] = lambda content: brotli.compress(
+                content,
+                quality=settings.COMPRESSION_BROTLI_QUALITY,
+            )
+
+    def negotiate(self, accept_encoding):
+        """Return the accepted encoding with the highest quality, if any."""
+        weights = {}
+        for part in accept_encoding.split(","):
+            match = self.accept_encoding_re.match(part)
+            if match:
+                encoding, quality = match.groups()
+                try:
+                    weights[encoding.lower()] = float(quality or 1)
+                except ValueError:
+                    continue
+        candidates = [
+            (weights.get(encoding, weights.get("*", 0)), encoding == "br", encoding)
+            for encoding in self.encoders
+        ]
+        weight, _, encoding = max(candidates)
+        return encoding if weight > 0 else None
+
+    def should_compress(self, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return False
+        content_type = response.get("Content-Type", "")
+        return len(response.content) >= settings.COMPRESSION_MIN_SIZE and (
+            content_type.startswith(tuple(settings.COMPRESSION_CONTENT_TYPES))
+        )
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.should_compress(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self.negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        compressed = self.encoders[encoding](response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
+
+
+class AdmissionControlMiddleware:
+    """Reject requests with 503 while their route class is over budget.
+
+    See ``it_specialist.admission`` for how route classes are limited.
+    """
+
+    def __init__(self, get_response):
+        if not settings.ADMISSION_CONTROL["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.controller = AdmissionController(settings.ADMISSION_CONTROL)
+        AdmissionController.current = self.controller
+
+    def __call__(self, request):
+        route_class = self.controller.classify(request.path_info)
+        if not self.controller.admit(route_class):
+            response = JsonResponse(
+                {"detail": "Service is overloaded, retry later."},
+                status=503,
+            )
+            response.headers["Retry-After"] = str(
+                settings.ADMISSION_CONTROL["RETRY_AFTER"],
+            )
+            return response
+
+        started = time.monotonic()
+        try:
+            return self.get_response(request)
+        finally:
+            self.controller.release(route_class, started)
+
+
+class TracingMiddleware:
+    """Trace a sample of requests and profile single requests for staff.
+
+    A staff user adding the ``settings.TRACING["PROFILE_PARAM"]`` query
+    parameter, set to ``deterministic`` or ``sampling``, gets the profiler
+    report instead of the response. The parameter is ignored for other users,
+    who are authenticated with the API authentication classes up front.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = settings.TRACING
+
+    def is_staff(self, request):
+        authenticators = [
+            authentication()
+            for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ]
+        try:
+            user = Request(request, authenticators=authenticators).user
+        except APIException:
+            return False
+        return user.is_staff
+
+    def traced(self, request):
+        """Return the response and the trace recorded while handling it."""
+        token = tracing.start()
+        try:
+            with tracing.span("request", method=request.method, path=request.path):
+                response = self.get_response(request)
+        finally:
+            trace = tracing.finish(token)
+        root = trace.spans[-1]
+        root.attributes["status"] = response.status_code
+        if request.resolver_match is not None:
+            root.attributes["view"] = request.resolver_match.view_name
+        return response, trace
+
+    def __call__(self, request):
+        profiler = profiling.PROFILERS.get(
+            request.GET.get(self.config["PROFILE_PARAM"]),
+        )
+        if profiler is not None and self.is_staff(request):
+            return self.profiled(request, profiler)
+        sampled = random.random() < self.config["SAMPLE_RATE"]  # noqa: S311
+        if not (self.config["ENABLED"] and sampled):
+            return self.get_response(request)
+        response, trace = self.traced(request)
+        tracing.export(trace)
+        return response
+
+    def profiled(self, request, profiler):
+        (response, trace), report = profiler(lambda: self.traced(request))
+        spans = "\n".join(
+            f"{span.name:<12} {span.duration * 1000:10.3f} ms"
+            for span in sorted(trace.spans, key=lambda span: span.start)
+        )
+        return HttpResponse(
+            f"Status {response.status_code}\n\n{spans}\n\n{report}",
+            content_type="text/plain; charset=utf-8",
+            headers={"X-Profiled-Status": str(response.status_code)},
+        )
@@ -0,0 +1,74 @@
+"""Profilers run on demand around a single request.
+
+``deterministic`` uses ``cProfile`` and reports the functions with the
+highest cumulative time. ``sampling`` records the stack of the profiled
+thread every few milliseconds from a background thread and reports the
+most frequent stacks in the collapsed format read by flame graph tools;
+its overhead doesn't grow with the number of function calls.
+"""
+
+import io
+import sys
+import threading
+import time
+from collections import Counter
+
+REPORT_LIMIT = 40
+SAMPLE_INTERVAL = 0.005
+
+
+def deterministic(func):
+    """Run ``func`` under cProfile, return its result and the report."""
+    # Imported on use, API workers rarely profile.
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func)
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LIMIT)
+    return result, output.getvalue()
+
+
+def _stack(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def sampling(func, interval=SAMPLE_INTERVAL):
+    """Run ``func`` while sampling its stack, return its result and the report."""
+    thread_id = threading.get_ident()
+    stacks = Counter()
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stacks[_stack(frame)] += 1
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        result = func()
+    finally:
+        done.set()
+        sampler.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(stacks.values())
+    lines = [
+        f"{total} samples every {interval * 1000:g} ms over {elapsed * 1000:.1f} ms",
+        "",
+        *(f"{stack} {count}" for stack, count in stacks.most_common(REPORT_LIMIT)),
+    ]
+    return result, "\n".join(lines) + "\n"
+
+
+PROFILERS = {"deterministic": deterministic, "sampling": sampling}
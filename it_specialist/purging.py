@@ -0,0 +1,97 @@
+"""Purge events for edge caches keyed by surrogate keys.
+
+Public responses carry a ``Surrogate-Key`` header listing the objects they
+show. When one of those objects changes, ``purge`` publishes its keys to the
+backend configured in ``settings.EDGE_CACHE`` once the transaction commits,
+so the edge never refetches a page before the change is visible.
+
+Backends:
+
+- ``DummyBackend`` drops events, for setups without an edge cache.
+- ``MemoryBackend`` keeps them in ``MemoryBackend.outbox``, for tests.
+- ``HTTPBackend`` sends ``PURGE`` requests with the keys in a header, as
+  understood by Varnish with xkey or a Fastly-style proxy.
+
+Backends talking to the network set ``queued``. Their purges should be sent
+from a background job with ``send`` rather than from the request thread;
+``purge`` itself always sends in-process.
+"""
+
+import logging
+import urllib.request
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class DummyBackend:
+    """Discard purge events."""
+
+    queued = False
+
+    def purge(self, keys):
+        pass
+
+
+class MemoryBackend:
+    """Record purge events in ``outbox``."""
+
+    queued = False
+    outbox = []
+
+    def purge(self, keys):
+        self.outbox.append(keys)
+
+
+class HTTPBackend:
+    """Send a ``PURGE`` request listing the keys to a caching proxy."""
+
+    queued = True
+
+    def __init__(self, url, header="Surrogate-Key", timeout=2.0):
+        self.url = url
+        self.header = header
+        self.timeout = timeout
+
+    def purge(self, keys):
+        request = urllib.request.Request(  # noqa: S310
+            self.url,
+            method="PURGE",
+            headers={self.header: " ".join(keys)},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):  # noqa: S310
+            pass
+
+
+def backend():
+    """Return the configured backend instance."""
+    config = settings.EDGE_CACHE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+def queued():
+    """Return whether purges should be sent from a background job."""
+    return import_string(settings.EDGE_CACHE["BACKEND"]).queued
+
+
+def send(keys):
+    """Send a purge of ``keys`` now, raising if the backend fails."""
+    backend().purge(sorted(set(keys)))
+
+
+def _send(keys):
+    try:
+        send(keys)
+    except Exception:  # noqa: BLE001
+        # The edge serves stale pages until they expire, the request succeeds.
+        logger.exception("Purging %s failed", " ".join(keys))
+
+
+def purge(keys):
+    """Publish a purge of ``keys`` after the current transaction commits."""
+    keys = sorted(set(keys))
+    if keys:
+        transaction.on_commit(lambda: _send(keys))
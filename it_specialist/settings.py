@@ -18,7 +18,9 @@ import environ
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 env = environ.Env()
-env.read_env(str(BASE_DIR) + "/.env")
+# Deployments setting the environment themselves skip reading .env
+if env.bool("DJANGO_READ_DOT_ENV", default=True):
+    env.read_env(str(BASE_DIR) + "/.env")
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -81,31 +83,126 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "corsheaders",
     "rest_framework",
+    "django_filters",
     "apps.users",
     "apps.profiles",
+    "apps.jobs",
 ]
 
 MIDDLEWARE = [
+    "it_specialist.middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "it_specialist.middleware.AdmissionControlMiddleware",
+    "it_specialist.middleware.CompressionMiddleware",
+    "it_specialist.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "it_specialist.middleware.TracingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
+    "DEFAULT_AUTHENTICATION_CLASSES": ("api.authentication.RouteAuthentication",),
+    "DEFAULT_FILTER_BACKENDS": (
+        "django_filters.rest_framework.DjangoFilterBackend",
+        "rest_framework.filters.SearchFilter",
+        "rest_framework.filters.OrderingFilter",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 15,
 }
 
+# Authentication classes of the first chain with a URL name pattern matching
+# the view. API clients send tokens or Basic credentials, so API routes skip
+# session authentication and its session lookup
+AUTHENTICATION_CHAINS = {
+    "api": {
+        "routes": ["api:*"],
+        "classes": [
+            "rest_framework_simplejwt.authentication.JWTAuthentication",
+            "api.authentication.CachedBasicAuthentication",
+        ],
+    },
+    "default": {
+        "routes": ["*"],
+        "classes": [
+            "rest_framework_simplejwt.authentication.JWTAuthentication",
+            "rest_framework.authentication.SessionAuthentication",
+            "api.authentication.CachedBasicAuthentication",
+        ],
+    },
+}
+# Seconds a verified Basic credential is trusted without hashing it again,
+# 0 verifies every request
+BASIC_AUTH_CACHE_TIMEOUT = env.int("BASIC_AUTH_CACHE_TIMEOUT", default=60)
+
+# Response compression, brotli is used when the brotli package is installed
+COMPRESSION_MIN_SIZE = env.int("COMPRESSION_MIN_SIZE", default=1024)
+COMPRESSION_GZIP_LEVEL = env.int("COMPRESSION_GZIP_LEVEL", default=6)
+COMPRESSION_BROTLI_QUALITY = env.int("COMPRESSION_BROTLI_QUALITY", default=5)
+# HTML is left alone: it carries CSRF tokens next to reflected input (BREACH)
+COMPRESSION_CONTENT_TYPES = ["application/json"]
+
+# Load shedding per worker process. A class is rejected with 503 once it runs
+# max_in_flight requests (fewer while its average latency exceeds
+# latency_budget seconds) or once the process runs more than its priority's
+# share of MAX_IN_FLIGHT requests. Critical classes are never rejected.
+ADMISSION_CONTROL = {
+    "ENABLED": env.bool("ADMISSION_CONTROL_ENABLED", default=True),
+    "MAX_IN_FLIGHT": env.int("ADMISSION_MAX_IN_FLIGHT", default=64),
+    "RETRY_AFTER": 2,
+    "LATENCY_SMOOTHING": 0.2,
+    "PRIORITIES": {"critical": None, "normal": 1.0, "low": 0.5},
+    "DEFAULT_CLASS": "default",
+    "CLASSES": {
+        "auth": {"routes": ["api:auth:*", "api:users:signup"], "priority": "critical"},
+        "metrics": {"routes": ["metrics"], "priority": "critical"},
+        "profile-detail": {
+            "routes": ["api:profiles:profile-detail", "api:profiles:profile-similar"],
+            "priority": "low",
+            "max_in_flight": 16,
+            "latency_budget": 0.5,
+        },
+        "profile-list": {
+            "routes": ["api:profiles:profile-list", "api:profiles:profile-leaderboard"],
+            "priority": "normal",
+            "max_in_flight": 32,
+            "latency_budget": 0.3,
+        },
+        "admin": {"routes": ["admin:*"], "priority": "low", "max_in_flight": 8},
+        "default": {"priority": "normal"},
+    },
+}
+
+# Background jobs: queue name -> max jobs running at once (None = unlimited);
+# deletion purges have their own queue so rebuilds on "maintenance" don't
+# hold them up
+JOB_QUEUES = {"default": None, "maintenance": 1, "deletion": 2}
+JOB_WORKER_PROCESSES = env.int("JOB_WORKER_PROCESSES", default=2)
+# Running jobs not finished within the lease are considered abandoned
+JOB_LEASE_SECONDS = env.int("JOB_LEASE_SECONDS", default=60 * 10)
+# Retry delay in seconds: base * 2 ** (attempt - 1), capped at the maximum
+JOB_RETRY_BACKOFF = (10, 60 * 60)
+
+# Profiles are hidden at once and their rows deleted by jobs in batches of
+# PROFILE_DELETION_BATCH_SIZE, a job continuing in a new one after
+# PROFILE_DELETION_TIME_BUDGET seconds
+PROFILE_DELETION_BATCH_SIZE = env.int("PROFILE_DELETION_BATCH_SIZE", default=1000)
+PROFILE_DELETION_TIME_BUDGET = env.int("PROFILE_DELETION_TIME_BUDGET", default=60)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -147,6 +244,76 @@ WSGI_APPLICATION = "it_specialist.wsgi.application"
 
 DATABASES = {"default": env.db("DATABASE_URL")}
 
+# Read replicas, e.g. DATABASE_REPLICA_URLS=postgres://replica-1/db,postgres://...
+# Every safe API request reads from one randomly picked replica; a client that
+# wrote stays on the primary for REPLICA_STICKY_SECONDS.
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    DATABASES[f"replica_{index}"] = {
+        **env.db_url_config(url),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["it_specialist.db_routers.ReplicaRouter"]
+REPLICA_READ_PATHS = ["/api/"]
+REPLICA_STICKY_COOKIE = "db_primary"
+REPLICA_STICKY_SECONDS = env.int("REPLICA_STICKY_SECONDS", default=10)
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Leaderboards and other precomputed data need a cache shared by all workers
+# in production, e.g. CACHE_URL=redis://127.0.0.1:6379/1
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+# Lifetime of cached profile list responses, they are invalidated by tag
+PROFILE_LIST_CACHE_TIMEOUT = env.int("PROFILE_LIST_CACHE_TIMEOUT", default=60 * 10)
+# Longest time the technology autocomplete may show outdated usage counters
+TECHNOLOGY_AUTOCOMPLETE_TIMEOUT = env.int(
+    "TECHNOLOGY_AUTOCOMPLETE_TIMEOUT",
+    default=60,
+)
+
+# Age a profile change must reach before the change feed returns it, so that
+# transactions committing late are not skipped by continuation tokens
+PROFILE_CHANGES_SETTLE_SECONDS = env.int("PROFILE_CHANGES_SETTLE_SECONDS", default=5)
+
+# Prometheus metrics at /metrics, scraped with "Authorization: Bearer TOKEN"
+# and disabled while METRICS_TOKEN is unset. Processes sharing a port sum
+# their request metrics through files in METRICS_MULTIPROCESS_DIR, emptied
+# on server start; without it scrape every worker on its own port. Buckets
+# are in seconds and queries per request, JOB_LATENCY_BUCKETS bound the job
+# wait and run time percentiles
+METRICS = {
+    "TOKEN": env.str("METRICS_TOKEN", default=""),
+    "MULTIPROCESS_DIR": env.str("METRICS_MULTIPROCESS_DIR", default=""),
+    "LATENCY_BUCKETS": [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+    "QUERY_COUNT_BUCKETS": [1, 2, 5, 10, 20, 50, 100],
+    "JOB_LATENCY_BUCKETS": [0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600],
+}
+
+# Request tracing, a SAMPLE_RATE share of requests is traced when enabled and
+# staff users can profile a request with ?_profile=deterministic or sampling
+TRACING = {
+    "ENABLED": env.bool("TRACING_ENABLED", default=False),
+    "SAMPLE_RATE": env.float("TRACING_SAMPLE_RATE", default=1.0),
+    "EXPORTER": "it_specialist.tracing.JSONLinesExporter",
+    "OPTIONS": {"path": env.str("TRACING_PATH", default="traces.jsonl")},
+    "PROFILE_PARAM": "_profile",
+}
+
+# Public profile API, cached by browsers for PUBLIC_CACHE_MAX_AGE seconds and
+# by edge caches for PUBLIC_CACHE_S_MAXAGE seconds or until purged. Purges
+# are sent to a caching proxy when EDGE_PURGE_URL is set,
+# e.g. EDGE_PURGE_URL=http://127.0.0.1:6081/
+PUBLIC_CACHE_MAX_AGE = env.int("PUBLIC_CACHE_MAX_AGE", default=60)
+PUBLIC_CACHE_S_MAXAGE = env.int("PUBLIC_CACHE_S_MAXAGE", default=60 * 60 * 24)
+EDGE_CACHE = {"BACKEND": "it_specialist.purging.DummyBackend"}
+if env.str("EDGE_PURGE_URL", default=""):
+    EDGE_CACHE = {
+        "BACKEND": "it_specialist.purging.HTTPBackend",
+        "OPTIONS": {"url": env.str("EDGE_PURGE_URL")},
+    }
+
 # Auth user model
 AUTH_USER_MODEL = "users.User"
 
@@ -0,0 +1,51 @@
+"""Settings of API-only workers.
+
+Serves ``api/v1`` and ``/metrics`` without the admin, sessions, messages,
+static files and templates, which API requests never use. Clients
+authenticate with JWT or Basic credentials, so session authentication is
+dropped along with the session middleware.
+"""
+
+from .settings import *  # noqa: F403
+from .settings import (
+    AUTHENTICATION_CHAINS,
+    INSTALLED_APPS,
+    MIDDLEWARE,
+    REST_FRAMEWORK,
+)
+
+API_EXCLUDED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+]
+API_EXCLUDED_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in API_EXCLUDED_APPS]
+MIDDLEWARE = [item for item in MIDDLEWARE if item not in API_EXCLUDED_MIDDLEWARE]
+
+ROOT_URLCONF = "it_specialist.urls_api"
+WSGI_APPLICATION = "it_specialist.wsgi_api.application"
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ("api.renderers.ORJSONRenderer",),
+}
+AUTHENTICATION_CHAINS = {
+    name: {
+        **options,
+        "classes": [
+            authentication
+            for authentication in options["classes"]
+            if authentication != "rest_framework.authentication.SessionAuthentication"
+        ],
+    }
+    for name, options in AUTHENTICATION_CHAINS.items()
+}
@@ -0,0 +1,93 @@
+import threading
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from it_specialist.caching import SingleFlightCache
+
+# Constants for tests
+KEY = "test:single-flight"
+TIMEOUT = 60
+
+
+class TestSingleFlightCache(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.flight = SingleFlightCache("test", wait=1.0, poll=0.01)
+        self.calls = 0
+
+    def tearDown(self):
+        cache.clear()
+        SingleFlightCache.instances.pop("test", None)
+
+    def compute(self):
+        self.calls += 1
+        return f"value {self.calls}"
+
+    def get(self, **kwargs):
+        return self.flight.get_or_compute(KEY, self.compute, TIMEOUT, **kwargs)
+
+    def test_miss_then_hit(self):
+        """Test a value is computed once and then served from the cache"""
+        self.assertEqual(self.get(), "value 1")
+        self.assertEqual(self.get(), "value 1")
+        metrics = self.flight.metrics()
+        self.assertEqual(metrics["miss"], 1)
+        self.assertEqual(metrics["hit"], 1)
+
+    def test_zero_timeout_disables_caching(self):
+        """Test a zero timeout always computes the value"""
+        self.flight.get_or_compute(KEY, self.compute, 0)
+        self.flight.get_or_compute(KEY, self.compute, 0)
+        self.assertEqual(self.calls, 2)
+
+    def test_early_recomputation(self):
+        """Test a value close to expiry may be recomputed ahead of time"""
+        self.get()
+        self.flight.beta = 10**9
+        self.assertEqual(self.get(), "value 2")
+        self.assertEqual(self.flight.metrics()["early"], 1)
+
+    def test_expired_value_served_stale_while_refreshing(self):
+        """Test an expired value is served while another worker holds the lock"""
+        cache.set(KEY, {"value": "old", "delta": 0, "expires": 0}, TIMEOUT)
+        cache.add(f"{KEY}:lock", 1)
+
+        self.assertEqual(self.get(), "old")
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(self.flight.metrics()["stale"], 1)
+
+    def test_invalid_value_never_served(self):
+        """Test a rejected value isn't served stale while another worker refreshes"""
+        self.get()
+        cache.add(f"{KEY}:lock", 1)
+        self.flight.wait = 0.02
+
+        self.assertEqual(self.get(is_valid=lambda value: False), "value 2")
+        self.assertEqual(self.flight.metrics()["stale"], 0)
+        self.assertEqual(self.flight.metrics()["timeout"], 1)
+
+    def test_waiters_coalesce(self):
+        """Test a worker without a value waits for the lock holder's result"""
+        cache.add(f"{KEY}:lock", 1)
+
+        def refresh():
+            self.flight._compute(KEY, lambda: "shared", TIMEOUT)
+            cache.delete(f"{KEY}:lock")
+
+        timer = threading.Timer(0.05, refresh)
+        timer.start()
+        try:
+            self.assertEqual(self.get(), "shared")
+        finally:
+            timer.join()
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(self.flight.metrics()["coalesced"], 1)
+
+    def test_wait_timeout(self):
+        """Test a worker computes the value itself when waiting times out"""
+        cache.add(f"{KEY}:lock", 1)
+        self.flight.wait = 0.02
+
+        self.assertEqual(self.get(), "value 1")
+        self.assertEqual(self.flight.metrics()["timeout"], 1)
@@ -0,0 +1,83 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.profiles.models import Profile
+from it_specialist.db_routers import ReplicaRouter, replica_reads
+from it_specialist.middleware import ReplicaRoutingMiddleware
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class TestReplicaRouter(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_outside_block_use_primary(self):
+        """Test reads go to the primary by default"""
+        self.assertEqual(self.router.db_for_read(Profile), "default")
+
+    def test_reads_inside_block_use_replica(self):
+        """Test reads inside replica_reads go to a replica"""
+        with replica_reads("replica_0"):
+            self.assertEqual(self.router.db_for_read(Profile), "replica_0")
+        self.assertEqual(self.router.db_for_read(Profile), "default")
+
+    def test_write_pins_block_to_primary(self):
+        """Test a write sends the following reads to the primary"""
+        with replica_reads("replica_0"):
+            self.assertEqual(self.router.db_for_write(Profile), "default")
+            self.assertEqual(self.router.db_for_read(Profile), "default")
+
+    def test_replicas_are_not_migrated(self):
+        """Test migrations only run on the primary"""
+        self.assertTrue(self.router.allow_migrate("default", "profiles"))
+        self.assertFalse(self.router.allow_migrate("replica_0", "profiles"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class TestReplicaRoutingMiddleware(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+        self.chosen = []
+
+        def get_response(request):
+            self.chosen.append(self.router.db_for_read(Profile))
+            return HttpResponse()
+
+        self.get_response = get_response
+
+        self.middleware = ReplicaRoutingMiddleware(get_response)
+
+    def test_safe_api_request_reads_replica(self):
+        """Test safe API requests read from a replica"""
+        self.middleware(self.factory.get("/api/v1/profiles/"))
+        self.assertEqual(self.chosen, ["replica_0"])
+
+    @override_settings(DATABASE_REPLICAS=[f"replica_{index}" for index in range(8)])
+    def test_request_reads_one_replica(self):
+        """Test every read of a request goes to the same replica"""
+
+        def get_response(request):
+            for _ in range(20):
+                self.get_response(request)
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(get_response)(self.factory.get("/api/v1/profiles/"))
+        self.assertEqual(len(set(self.chosen)), 1)
+        self.assertNotEqual(self.chosen[0], "default")
+
+    def test_non_api_request_reads_primary(self):
+        """Test requests outside the API read from the primary"""
+        self.middleware(self.factory.get("/admin/"))
+        self.assertEqual(self.chosen, ["default"])
+
+    def test_write_sets_sticky_cookie(self):
+        """Test a write pins the client to the primary"""
+        response = self.middleware(self.factory.patch("/api/v1/profiles/1/"))
+        self.assertEqual(self.chosen, ["default"])
+        self.assertIn("db_primary", response.cookies)
+
+        request = self.factory.get("/api/v1/profiles/1/")
+        request.COOKIES["db_primary"] = "1"
+        self.middleware(request)
+        self.assertEqual(self.chosen, ["default", "default"])
@@ -0,0 +1,124 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from it_specialist import metrics
+
+# Constants for tests
+TOKEN = "secret"
+
+
+class TestRender(SimpleTestCase):
+    def test_histogram(self):
+        """Test observations are rendered as cumulative buckets"""
+        histogram = metrics.Histogram("latency", "Latency.", ["view"], [0.1, 1])
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, "home")
+
+        lines = metrics.render([histogram]).splitlines()
+
+        self.assertEqual(
+            lines[2:],
+            [
+                'latency_bucket{view="home",le="0.1"} 1',
+                'latency_bucket{view="home",le="1"} 2',
+                'latency_bucket{view="home",le="+Inf"} 3',
+                'latency_count{view="home"} 3',
+                'latency_sum{view="home"} 5.55',
+            ],
+        )
+
+    def test_label_escaping(self):
+        """Test quotes and backslashes in label values are escaped"""
+        counter = metrics.Counter("events", "Events.", ["name"])
+        counter.inc('say "hi"\\')
+
+        self.assertIn(
+            'events{name="say \\"hi\\"\\\\"} 1',
+            metrics.render([counter]),
+        )
+
+
+@override_settings(METRICS={**settings.METRICS, "TOKEN": TOKEN})
+class TestMetricsView(TestCase):
+    def setUp(self):
+        for metric in metrics.REQUEST_METRICS:
+            metric.clear()
+
+    def scrape(self):
+        return self.client.get(
+            reverse("metrics"),
+            headers={"Authorization": f"Bearer {TOKEN}"},
+        )
+
+    def test_request_metrics(self):
+        """Test requests are recorded per URL name with their queries"""
+        self.client.get(reverse("api:profiles:public-profile-list"))
+
+        response = self.scrape()
+
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        content = response.content.decode()
+        self.assertIn(
+            'http_responses_total{view="api:profiles:public-profile-list",'
+            'method="GET",status="200"} 1',
+            content,
+        )
+        self.assertIn(
+            'http_request_db_queries_count{view="api:profiles:public-profile-list"} 1',
+            content,
+        )
+        for name in (
+            "single_flight_cache_events_total",
+            "db_connections_open",
+            "worker_saturation",
+            "job_queue_jobs",
+        ):
+            self.assertIn(f"# TYPE {name} ", content)
+
+    def test_token(self):
+        """Test the configured token is required to read the metrics"""
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+        response = self.client.get(
+            reverse("metrics"),
+            headers={"Authorization": "Bearer wrong"},
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.scrape().status_code, 200)
+
+    def test_disabled_without_token(self):
+        """Test the metrics aren't served while no token is configured"""
+        with self.settings(METRICS={**settings.METRICS, "TOKEN": ""}):
+            response = self.client.get(
+                reverse("metrics"),
+                headers={"Authorization": "Bearer "},
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_multiprocess(self):
+        """Test request metrics are summed over the processes' files"""
+        with tempfile.TemporaryDirectory() as directory, self.settings(
+            METRICS={**settings.METRICS, "TOKEN": TOKEN, "MULTIPROCESS_DIR": directory},
+        ):
+            self.client.get(reverse("api:profiles:public-profile-list"))
+            metrics.flush(force=True)
+            # Another process, which served the same request once more.
+            (Path(directory) / "metrics-1.json").write_text(
+                (Path(directory) / f"metrics-{os.getpid()}.json").read_text(),
+            )
+
+            content = self.scrape().content.decode()
+
+        self.assertIn(
+            'http_responses_total{view="api:profiles:public-profile-list",'
+            'method="GET",status="200"} 2',
+            content,
+        )
+        self.assertIn(
+            'http_request_db_queries_count{view="api:profiles:public-profile-list"} 2',
+            content,
+        )
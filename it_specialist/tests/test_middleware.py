@@ -0,0 +1,144 @@
+import gzip
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from it_specialist.middleware import (
+    AdmissionControlMiddleware,
+    CompressionMiddleware,
+    brotli,
+)
+
+# Constants for tests
+BODY = b'{"results": [' + b'{"first_name": "Ivan"},' * 100 + b"{}]}"
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class TestCompressionMiddleware(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get_response(self, accept_encoding, body=BODY, content_type="application/json"):
+        middleware = CompressionMiddleware(
+            lambda request: HttpResponse(body, content_type=content_type),
+        )
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return middleware(request)
+
+    def test_gzip(self):
+        """Test gzip is used when it is the only accepted encoding"""
+        response = self.get_response("gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_brotli_preferred(self):
+        """Test brotli wins a tie with gzip"""
+        if brotli is None:
+            self.skipTest("brotli is not installed")
+        response = self.get_response("gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), BODY)
+
+    def test_quality_values(self):
+        """Test the encoding with the highest quality is used"""
+        response = self.get_response("br;q=0.5, gzip;q=0.9")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_refused_encodings(self):
+        """Test nothing is compressed when the client refuses every encoding"""
+        response = self.get_response("gzip;q=0, br;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, BODY)
+
+    def test_small_response(self):
+        """Test responses under the size threshold are sent as is"""
+        response = self.get_response("gzip", body=b"{}")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_html_response(self):
+        """Test content types outside the allow list are sent as is"""
+        response = self.get_response("gzip", content_type="text/html")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+ADMISSION_CONTROL = {
+    "ENABLED": True,
+    "MAX_IN_FLIGHT": 4,
+    "RETRY_AFTER": 3,
+    "LATENCY_SMOOTHING": 0.5,
+    "PRIORITIES": {"critical": None, "normal": 1.0, "low": 0.5},
+    "DEFAULT_CLASS": "default",
+    "CLASSES": {
+        "auth": {"routes": ["api:auth:*"], "priority": "critical"},
+        "detail": {
+            "routes": ["api:profiles:profile-detail"],
+            "priority": "low",
+            "max_in_flight": 1,
+            "latency_budget": 0.5,
+        },
+        "default": {"priority": "normal"},
+    },
+}
+
+
+@override_settings(ADMISSION_CONTROL=ADMISSION_CONTROL)
+class TestAdmissionControlMiddleware(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = AdmissionControlMiddleware(self.respond)
+        self.controller = self.middleware.controller
+        self.nested = None
+
+    def respond(self, request):
+        if self.nested is not None:
+            path, self.nested = self.nested, None
+            return self.middleware(self.factory.get(path))
+        return HttpResponse("ok")
+
+    def test_classify(self):
+        """Test paths are classified by URL name patterns"""
+        self.assertEqual(self.controller.classify("/api/v1/auth/token/").name, "auth")
+        self.assertEqual(
+            self.controller.classify("/api/v1/profiles/1/").name,
+            "detail",
+        )
+        self.assertEqual(self.controller.classify("/missing/").name, "default")
+
+    def test_rejects_over_class_limit(self):
+        """Test a request over its class limit gets a fast 503"""
+        self.nested = "/api/v1/profiles/2/"
+        response = self.middleware(self.factory.get("/api/v1/profiles/1/"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "3")
+        stats = self.controller.snapshot()["detail"]
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["rejected"], 1)
+
+    def test_low_priority_yields_to_process_load(self):
+        """Test low priority classes are shed first as the process fills up"""
+        detail = self.controller.classify("/api/v1/profiles/1/")
+        default = self.controller.classify("/api/v1/profiles/")
+        detail.max_in_flight = None
+        for _ in range(2):
+            self.assertTrue(self.controller.admit(default))
+
+        self.assertFalse(self.controller.admit(detail))
+        self.assertTrue(self.controller.admit(default))
+
+    def test_critical_never_rejected(self):
+        """Test critical classes are admitted over every limit"""
+        auth = self.controller.classify("/api/v1/auth/token/verify/")
+        for _ in range(ADMISSION_CONTROL["MAX_IN_FLIGHT"] * 2):
+            self.assertTrue(self.controller.admit(auth))
+
+    def test_slow_class_limit_shrinks(self):
+        """Test the class limit shrinks while latency exceeds the budget"""
+        detail = self.controller.classify("/api/v1/profiles/1/")
+        detail.max_in_flight = 10
+        detail.latency = 2.0
+
+        self.assertEqual(detail.limit(), 2)
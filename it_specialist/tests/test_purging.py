@@ -0,0 +1,56 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from it_specialist import purging
+
+# Constants for tests
+KEYS = ["profile:1", "profiles"]
+
+
+class PurgeHandler(BaseHTTPRequestHandler):
+    """Caching proxy stand-in recording the purges it receives."""
+
+    received = []
+
+    def do_PURGE(self):  # noqa: N802
+        self.received.append((self.command, self.headers["Surrogate-Key"]))
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHTTPBackend(SimpleTestCase):
+    def setUp(self):
+        PurgeHandler.received = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PurgeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_purge_request(self):
+        """Test keys are sent to the proxy in one PURGE request"""
+        purging.HTTPBackend(self.url).purge(KEYS)
+
+        self.assertEqual(PurgeHandler.received, [("PURGE", "profile:1 profiles")])
+
+    def test_unreachable_proxy(self):
+        """Test a failed purge is logged instead of raised"""
+        self.server.shutdown()
+        self.server.server_close()
+        with (
+            override_settings(
+                EDGE_CACHE={
+                    "BACKEND": "it_specialist.purging.HTTPBackend",
+                    "OPTIONS": {"url": self.url, "timeout": 0.5},
+                },
+            ),
+            self.assertLogs("it_specialist.purging", "ERROR"),
+        ):
+            purging._send(KEYS)
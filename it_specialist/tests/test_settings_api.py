@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase
+from django.urls import Resolver404, resolve
+
+from it_specialist import settings_api
+
+
+class TestSettingsAPI(SimpleTestCase):
+    def test_lean_apps_and_middleware(self):
+        """Test API workers load neither the admin nor sessions"""
+        self.assertNotIn("django.contrib.admin", settings_api.INSTALLED_APPS)
+        self.assertNotIn("django.contrib.sessions", settings_api.INSTALLED_APPS)
+        self.assertIn("apps.profiles", settings_api.INSTALLED_APPS)
+        self.assertNotIn(
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            settings_api.MIDDLEWARE,
+        )
+        for options in settings_api.AUTHENTICATION_CHAINS.values():
+            self.assertNotIn(
+                "rest_framework.authentication.SessionAuthentication",
+                options["classes"],
+            )
+
+    def test_api_urls(self):
+        """Test the API URLconf routes the API but not the admin"""
+        urlconf = settings_api.ROOT_URLCONF
+
+        self.assertEqual(
+            resolve("/api/v1/profiles/", urlconf).view_name,
+            "api:profiles:profile-list",
+        )
+        with self.assertRaises(Resolver404):
+            resolve("/admin/", urlconf)
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from it_specialist import profiling, tracing
+
+
+class TestSpans(SimpleTestCase):
+    def test_span_without_trace(self):
+        """Test spans are not recorded outside of a trace"""
+        with tracing.span("idle") as span:
+            self.assertIsNone(span)
+        self.assertFalse(tracing.active())
+
+    def test_nested_spans(self):
+        """Test spans record their parent, attributes and duration"""
+        token = tracing.start()
+        with tracing.span("outer") as outer, tracing.span("inner", rows=3):
+            pass
+        trace = tracing.finish(token)
+
+        inner, recorded_outer = trace.spans
+        self.assertIs(recorded_outer, outer)
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(inner.attributes, {"rows": 3})
+        self.assertGreaterEqual(outer.duration, inner.duration)
+        self.assertFalse(tracing.active())
+
+
+class TestExporters(SimpleTestCase):
+    def test_json_lines(self):
+        """Test every trace is appended to the file as a line of JSON"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traces.jsonl")
+            exporter = tracing.JSONLinesExporter(path)
+            for name in ("first", "second"):
+                token = tracing.start()
+                with tracing.span(name):
+                    pass
+                exporter.export(tracing.finish(token))
+
+            with open(path, encoding="utf-8") as file:
+                lines = [json.loads(line) for line in file]
+
+        self.assertEqual(
+            [line["spans"][0]["name"] for line in lines],
+            ["first", "second"],
+        )
+        self.assertIn("duration_ms", lines[0]["spans"][0])
+
+
+class TestProfilers(SimpleTestCase):
+    def test_profilers_return_result(self):
+        """Test both profilers return the result of the call and a report"""
+        for name, profiler in profiling.PROFILERS.items():
+            with self.subTest(name):
+                result, report = profiler(lambda: sum(range(1000)))
+
+                self.assertEqual(result, 499500)
+                self.assertTrue(report)
@@ -0,0 +1,128 @@
+"""Request tracing with nested spans and pluggable exporters.
+
+``TracingMiddleware`` starts a trace for a sample of requests. Code running
+within the request opens spans with ``span``, which costs nothing when no
+trace is active. Finished traces go to the exporter configured in
+``settings.TRACING``:
+
+- ``JSONLinesExporter`` appends one JSON object per trace to a file.
+- ``MemoryExporter`` keeps traces in ``MemoryExporter.traces``, for tests.
+"""
+
+import contextvars
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_current = contextvars.ContextVar("trace", default=None)
+
+
+class Span:
+    """A named, timed phase of a trace."""
+
+    __slots__ = ("attributes", "duration", "name", "parent_id", "span_id", "start")
+
+    def __init__(self, name, parent_id, attributes):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.time()
+        self.duration = None
+
+    def as_dict(self):
+        """Return the span as JSON serializable data."""
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """The spans recorded while handling one request."""
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.spans = []
+        self.stack = []
+
+    def as_dict(self):
+        """Return the trace as JSON serializable data."""
+        return {
+            "trace_id": self.trace_id,
+            "spans": [span.as_dict() for span in self.spans],
+        }
+
+
+def active():
+    """Return whether a trace is being recorded."""
+    return _current.get() is not None
+
+
+def start():
+    """Start recording a trace and return the token to finish it."""
+    return _current.set(Trace())
+
+
+def finish(token):
+    """Stop recording the trace started with ``token`` and return it."""
+    trace = _current.get()
+    _current.reset(token)
+    return trace
+
+
+@contextmanager
+def span(name, **attributes):
+    """Record the enclosed block as a span of the active trace, if any."""
+    trace = _current.get()
+    if trace is None:
+        yield None
+        return
+    current = Span(name, trace.stack[-1].span_id if trace.stack else None, attributes)
+    trace.stack.append(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.duration = time.perf_counter() - started
+        trace.stack.pop()
+        trace.spans.append(current)
+
+
+class MemoryExporter:
+    """Keep finished traces in ``traces``."""
+
+    traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+class JSONLinesExporter:
+    """Append every trace to a file as a line of JSON."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, trace):
+        line = json.dumps(trace.as_dict(), default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+def export(trace):
+    """Send a finished trace to the configured exporter."""
+    config = settings.TRACING
+    exporter = import_string(config["EXPORTER"])(**config.get("OPTIONS", {}))
+    exporter.export(trace)
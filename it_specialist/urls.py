@@ -21,9 +21,12 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from .metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include(("api.v1.urls", "api"), namespace="api")),
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,10 @@
+"""URL configuration of API-only workers, see ``settings_api``."""
+
+from django.urls import include, path
+
+from .metrics import metrics_view
+
+urlpatterns = [
+    path("api/v1/", include(("api.v1.urls", "api"), namespace="api")),
+    path("metrics", metrics_view, name="metrics"),
+]
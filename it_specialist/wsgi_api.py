@@ -0,0 +1,41 @@
+"""WSGI config of API-only workers.
+
+Uses ``it_specialist.settings_api`` and doesn't read ``.env``: the
+environment is expected to be set by the process manager.
+
+The URLconf and every view it routes to are imported while the module
+loads, instead of on the first request of each worker. Serve it with a
+server loading the application before forking its workers, such as
+``gunicorn --preload it_specialist.wsgi_api``: everything loaded is then
+frozen out of the garbage collector, whose passes would otherwise write to
+the shared pages and copy them into every worker.
+"""
+
+import gc
+import os
+
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.urls import get_resolver
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "it_specialist.settings_api")
+os.environ.setdefault("DJANGO_READ_DOT_ENV", "false")
+
+
+def preload():
+    """Load the application with the URLconf and views, ready to fork."""
+    gc.disable()
+    try:
+        wsgi_application = get_wsgi_application()
+        resolver = get_resolver()
+        resolver.url_patterns  # noqa: B018
+        resolver.reverse_dict  # noqa: B018
+        # Connections opened while loading must not be shared by workers.
+        connections.close_all()
+    finally:
+        gc.freeze()
+        gc.enable()
+    return wsgi_application
+
+
+application = preload()